@@ -0,0 +1,116 @@
+# app/api/json_provider.py
+
+import base64
+import decimal
+import json
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Union
+from flask.json.provider import DefaultJSONProvider, _default as flask_default
+
+# orjson is optional; without it responses are encoded with the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from bson import Decimal128, ObjectId
+except ImportError:
+    Decimal128 = ObjectId = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def http_date(o: date) -> str:
+    """
+    Same output as werkzeug.http.http_date, which Flask's default provider
+    uses, at about half the cost; call lists carry dozens of datetimes each.
+    """
+    if not isinstance(o, datetime):
+        o = datetime(o.year, o.month, o.day)
+    elif o.tzinfo is not None:
+        o = o.astimezone(timezone.utc)
+    return "%s, %02d %s %04d %02d:%02d:%02d GMT" % (
+        _WEEKDAYS[o.weekday()], o.day, _MONTHS[o.month - 1], o.year, o.hour, o.minute, o.second)
+
+
+def mongo_default(o: Any) -> Any:
+    """
+    JSON form of values MongoDB documents contain that JSON has no type for.
+
+    ObjectIds become their hex string, bytes base64 and Decimal128 a
+    decimal string. Dates and datetimes keep Flask's RFC 1123 HTTP-date
+    format (naive datetimes are UTC, as pymongo returns them), which
+    clients already parse. Anything else is left to Flask's default handling.
+    """
+    # Documents hold far more dates than anything else, so check them first
+    if isinstance(o, date):
+        return http_date(o)
+    if ObjectId is not None and isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(o)).decode("ascii")
+    if Decimal128 is not None and isinstance(o, Decimal128):
+        return str(o.to_decimal())
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    return flask_default(o)
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes responses with orjson and understands the
+    BSON types the repositories return (see mongo_default).
+
+    orjson encodes the large strings in training data and transcripts
+    several times faster than the json module and writes the response
+    bytes directly. Falls back to the json module, with equivalent output,
+    when orjson is not installed, when a caller passes json.dumps options,
+    or for values orjson refuses (e.g. integers over 64 bits).
+    """
+
+    default = staticmethod(mongo_default)
+
+    def _orjson_options(self, pretty: bool = False) -> int:
+        # orjson would write datetimes as ISO 8601; pass them to mongo_default instead
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _encode(self, obj: Any, pretty: bool = False) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=mongo_default, option=self._orjson_options(pretty))
+            except TypeError as e:
+                logger.warning(f"orjson could not encode response, using json: {str(e)}")
+        if pretty:
+            text = json.dumps(obj, default=mongo_default, ensure_ascii=self.ensure_ascii,
+                              sort_keys=self.sort_keys, indent=2)
+        else:
+            text = json.dumps(obj, default=mongo_default, ensure_ascii=self.ensure_ascii,
+                              sort_keys=self.sort_keys, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self._encode(obj, pretty) + b"\n", mimetype=self.mimetype)
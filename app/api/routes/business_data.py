@@ -1,12 +1,17 @@
 # ~/Desktop/clean-code/app/api/routes/business_data.py
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, redirect, request, jsonify
+import re
 import logging
-from ...business.scrapers import WebsiteScraper, GBPScraper
-from ...repositories.business_repository import BusinessRepository
-from ...repositories.training_repository import TrainingRepository
-from ...business.analytics import CallAnalytics
-from ...call_management.call_handler import CallHandler
+from ...business.analytics import window_start
+from ...business.call_rollups import BACKFILL_DAYS
+from ...business.jobs import get_job_manager, JobQueueFullError
+from ...business.places_cache import get_places_cache
+from ...business.places_fields import FIELD_TIERS, DEFAULT_TIER, get_places_request_metrics
+from ...business.photo_cache import PHOTO_CACHE_CONTROL, photo_url
+from ...business.singleflight import get_singleflight
+from ..services import get_services
+from ..http_cache import compress_response, conditional
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +20,32 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 router = Blueprint('business_data', __name__, url_prefix='/api/business')
 
+# Large JSON responses (training data, analytics) are gzip/brotli-compressed
+router.after_request(compress_response)
+
+# JSON flags sent as strings, e.g. from form-encoded clients
+FLAG_VALUES = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+def parse_flag(value, default):
+    """
+    Read a boolean request field: true/false, 1/0, or their string forms (and "yes"/"no").
+    
+    Returns:
+        bool: The flag, or default if the value is missing (None)
+        
+    Raises:
+        ValueError: If the value is not a recognizable boolean
+    """
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in FLAG_VALUES:
+        return FLAG_VALUES[value.strip().lower()]
+    raise ValueError(f"Expected a boolean, got {value!r}")
+
 def get_current_user():
     """Get the current user from the request context."""
     return {
@@ -34,9 +65,16 @@ def scrape_website():
                 "success": False,
                 "error": "Website URL is required"
             }), 400
+        
+        try:
+            crawl = parse_flag(data.get('crawl'), True)
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error": "crawl must be true or false"
+            }), 400
             
-        scraper = WebsiteScraper()
-        result = scraper.scrape_website(current_user['business_id'], website_url)
+        result = _scrape_website(current_user['business_id'], website_url, crawl)
         
         return jsonify({
             "success": True,
@@ -56,16 +94,22 @@ def scrape_gbp():
         data = request.get_json()
         business_name = data.get('business_name')
         location = data.get('location')
+        tier = data.get('tier', DEFAULT_TIER)
         
         if not business_name:
             return jsonify({
                 "success": False,
                 "error": "Business name is required"
             }), 400
+        
+        if tier not in FIELD_TIERS:
+            return jsonify({
+                "success": False,
+                "error": f"tier must be one of: {', '.join(FIELD_TIERS)}"
+            }), 400
             
-        logger.info(f"Starting GBP scrape for business name: {business_name}, location: {location}")
-        scraper = GBPScraper()
-        result = scraper.scrape_gbp(current_user['business_id'], business_name, location)
+        logger.info(f"Starting GBP scrape for business name: {business_name}, location: {location}, tier: {tier}")
+        result = _scrape_gbp(current_user['business_id'], business_name, location, tier)
         
         # The scraper already returns a dict with success/error fields
         if not result.get("success", False):
@@ -90,13 +134,271 @@ def scrape_gbp():
             "details": str(e)
         }), 500
 
+def _scrape_website(business_id, website_url, crawl=True):
+    """Scrape a website, sharing the result with an identical scrape already running"""
+    scraper = get_services().website_scraper
+    result, _ = get_singleflight().do(
+        (business_id, str(website_url), crawl),
+        lambda: scraper.scrape_website(business_id, website_url, crawl=crawl),
+        kind="scrape-website"
+    )
+    return result
+
+def _scrape_gbp(business_id, business_name, location, tier):
+    """Scrape a Google Business Profile, sharing the result with an identical scrape already running"""
+    scraper = get_services().gbp_scraper
+    result, _ = get_singleflight().do(
+        (business_id, str(business_name), str(location), tier),
+        lambda: scraper.scrape_gbp(business_id, business_name, location, tier),
+        kind="scrape-gbp"
+    )
+    return result
+
+def _run_website_job_item(item):
+    """Scrape one website for a job; returns (result, error)"""
+    # crawl was checked with parse_flag when the job was created
+    result = _scrape_website(item['business_id'], item['website_url'], item.get('crawl', True))
+    return result, result.get('error')
+
+def _run_gbp_job_item(item):
+    """Scrape one Google Business Profile for a job; returns (result, error)"""
+    result = _scrape_gbp(item['business_id'], item['business_name'], item.get('location'),
+                         item.get('tier', DEFAULT_TIER))
+    return result, None if result.get('success') else result.get('error', 'GBP scrape failed')
+
+def _run_gbp_batch(items):
+    """Scrape the Google Business Profiles of a batch job concurrently; yields (index, result, error)"""
+    for index, result in get_services().gbp_scraper.iter_gbp_batch(items):
+        yield index, result, None if result.get('success') else result.get('error', 'GBP scrape failed')
+
+# Job type -> (required item field, runner)
+SCRAPE_JOB_TYPES = {
+    'website': ('website_url', _run_website_job_item),
+    'gbp': ('business_name', _run_gbp_job_item)
+}
+
+# Job types whose multi-item jobs run as one batch, which paces itself with
+# the Places rate limiter and skips the rest once the quota runs out
+SCRAPE_BATCH_RUNNERS = {
+    'gbp': _run_gbp_batch
+}
+
+@router.route("/scrape-jobs", methods=['POST'])
+def create_scrape_job():
+    """
+    Queue a website or GBP scrape and return its job id immediately.
+    
+    Accepts a single job ({"type": "website", "website_url": ...}) or a
+    batch ({"type": "gbp", "items": [{"business_name": ..., "location": ...}, ...]}).
+    """
+    try:
+        current_user = get_current_user()
+        data = request.get_json() or {}
+        job_type = data.get('type') if isinstance(data, dict) else None
+        
+        if job_type not in SCRAPE_JOB_TYPES:
+            return jsonify({
+                "success": False,
+                "error": f"Job type must be one of: {', '.join(SCRAPE_JOB_TYPES)}"
+            }), 400
+        
+        required_field, run_item = SCRAPE_JOB_TYPES[job_type]
+        raw_items = data.get('items') or [data]
+        items = []
+        
+        if not isinstance(raw_items, list):
+            return jsonify({
+                "success": False,
+                "error": "items must be a list of objects"
+            }), 400
+        
+        for raw_item in raw_items:
+            if not isinstance(raw_item, dict):
+                return jsonify({
+                    "success": False,
+                    "error": f"Every {job_type} job item must be an object"
+                }), 400
+            if not raw_item.get(required_field):
+                return jsonify({
+                    "success": False,
+                    "error": f"{required_field} is required for every {job_type} job item"
+                }), 400
+            item = {k: v for k, v in raw_item.items() if k not in ('type', 'items')}
+            if 'crawl' in item:
+                try:
+                    item['crawl'] = parse_flag(item['crawl'], True)
+                except ValueError:
+                    return jsonify({
+                        "success": False,
+                        "error": "crawl must be true or false"
+                    }), 400
+            item['business_id'] = current_user['business_id']
+            items.append(item)
+        
+        run_batch = SCRAPE_BATCH_RUNNERS.get(job_type)
+        if run_batch is not None and len(items) > 1:
+            job, deduplicated = get_job_manager().submit_batch(job_type, items, run_batch)
+        else:
+            job, deduplicated = get_job_manager().submit(job_type, items, run_item)
+        
+        return jsonify({
+            "success": True,
+            "job_id": job.job_id,
+            "status": job.status,
+            "deduplicated": deduplicated
+        }), 202
+    except JobQueueFullError as e:
+        logger.warning(f"Rejected scrape job: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": "Too many scrape jobs queued, try again later"
+        }), 503
+    except Exception as e:
+        logger.error(f"Error creating scrape job: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@router.route("/scrape-jobs/<job_id>", methods=['GET'])
+def get_scrape_job(job_id):
+    try:
+        include_results = request.args.get('results', 'true').lower() != 'false'
+        job = get_job_manager().get_status(job_id, include_results)
+        
+        if not job:
+            return jsonify({
+                "success": False,
+                "error": "Job not found"
+            }), 404
+        
+        return jsonify({"success": True, "data": job})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@router.route("/gbp/cache-metrics", methods=['GET'])
+def get_gbp_cache_metrics():
+    try:
+        return jsonify({"success": True, "data": get_places_cache().metrics()})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@router.route("/gbp/request-metrics", methods=['GET'])
+def get_gbp_request_metrics():
+    """Places response size and latency per field tier, for text search and for photo downloads."""
+    try:
+        return jsonify({"success": True, "data": get_places_request_metrics().metrics()})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@router.route("/coalescing-metrics", methods=['GET'])
+def get_coalescing_metrics():
+    """Executed and coalesced counts of scrapes and analytics shared between identical concurrent requests."""
+    try:
+        return jsonify({"success": True, "data": get_singleflight().metrics()})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def _from_cron():
+    """
+    Whether the request came from App Engine cron. App Engine strips
+    X-Appengine-Cron from external requests, so only cron can send it.
+    """
+    return request.headers.get('X-Appengine-Cron') == 'true'
+
+@router.route("/gbp/refresh", methods=['GET', 'POST'])
+def refresh_gbp_data():
+    """
+    Refresh stored GBP data that is past its freshness policy.
+    
+    Called hourly by App Engine cron (cron.yaml); each run only refreshes
+    the businesses assigned to the current slot of the day. Requests not
+    sent by cron are refused.
+    """
+    if not _from_cron():
+        logger.warning("Refused GBP refresh request not sent by App Engine cron")
+        return jsonify({"success": False, "error": "Forbidden"}), 403
+    
+    try:
+        summary = get_services().gbp_refresh.run_once()
+        return jsonify({"success": True, "data": summary})
+    except ValueError as e:
+        logger.error(f"API key error in GBP refresh: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": "Google Maps API key not properly configured",
+            "details": str(e)
+        }), 500
+    except Exception as e:
+        logger.error(f"Error refreshing GBP data: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def _training_data_version():
+    """Cheap version of the training data a GET /training-data would return."""
+    return get_services().training_repo.get_training_version("test_business_id", request.args.get('source'))
+
+def _analytics(business_id, compute):
+    """Compute an analytics result, sharing it with an identical request already running"""
+    result, _ = get_singleflight().do((business_id, request.full_path), compute, kind="analytics")
+    return result
+
+def _analytics_version():
+    """Cheap version of every analytics metric over the requested window."""
+    days = int(request.args.get('days', 30))
+    return get_services().call_analytics.get_window_version("test_business_id", days)
+
+CONTENT_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+@router.route("/photos/<content_hash>", methods=['GET'])
+def get_cached_photo(content_hash):
+    """Serve a cached GBP photo by its sha256 digest; the bytes never change, so clients may cache them for good."""
+    try:
+        if not CONTENT_HASH_PATTERN.match(content_hash):
+            return jsonify({"success": False, "error": "Photo not found"}), 404
+        
+        etag = f'"{content_hash}"'
+        if etag in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers={"ETag": etag, "Cache-Control": PHOTO_CACHE_CONTROL})
+        
+        photo = get_services().photo_repo.get_photo(content_hash)
+        if not photo:
+            return jsonify({"success": False, "error": "Photo not found"}), 404
+        
+        data, content_type = photo
+        return Response(data, mimetype=content_type, headers={
+            "ETag": etag,
+            "Cache-Control": PHOTO_CACHE_CONTROL
+        })
+    except Exception as e:
+        logger.error(f"Error serving cached photo: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@router.route("/photos/ref/<photo_reference>", methods=['GET'])
+def get_photo_by_reference(photo_reference):
+    """
+    Redirect a stored Places photo reference to its cached photo.
+    
+    Stored GBP photo entries point here until the photo caching job rewrites
+    them to /photos/<content_hash>; a reference that is not cached yet is
+    downloaded once, with the API key kept on the server.
+    """
+    try:
+        hashes = get_services().photo_cacher.cache_reference(photo_reference)
+        if not hashes:
+            return jsonify({"success": False, "error": "Photo not found"}), 404
+        return redirect(photo_url(hashes["content_hash"]))
+    except Exception as e:
+        logger.error(f"Error resolving photo reference: {str(e)}")
+        return jsonify({"success": False, "error": "Could not load photo"}), 500
+
 @router.route("/training-data", methods=['GET'])
+@conditional(_training_data_version)
 def get_training_data():
     try:
         business_id = "test_business_id"
         source = request.args.get('source')
         
-        repo = TrainingRepository()
+        repo = get_services().training_repo
         
         if source:
             data = repo.get_training_data(business_id, source)
@@ -121,7 +423,7 @@ def add_qa_pair():
                 "error": "Question and answer are required"
             }), 400
             
-        repo = TrainingRepository()
+        repo = get_services().training_repo
         success = repo.add_qa_pair(business_id, question, answer)
         
         if success:
@@ -143,7 +445,7 @@ def delete_qa_pair():
                 "error": "Question parameter is required"
             }), 400
             
-        repo = TrainingRepository()
+        repo = get_services().training_repo
         success = repo.delete_qa_pair(business_id, question)
         
         if success:
@@ -169,7 +471,7 @@ def handle_call():
                 "error": "Caller number and Twilio SID are required"
             }), 400
             
-        call_handler = CallHandler()
+        call_handler = get_services().call_handler
         call_data = {
             "business_id": business_id,
             "caller_number": caller_number,
@@ -199,7 +501,7 @@ def process_speech(call_id):
                 "error": "Speech text is required"
             }), 400
             
-        call_handler = CallHandler()
+        call_handler = get_services().call_handler
         result = call_handler.process_user_speech(call_id, speech_text)
         return jsonify(result)
     except Exception as e:
@@ -216,9 +518,21 @@ def end_call(call_id):
         duration = data.get('duration')
         recording_url = data.get('recording_url')
         
-        call_handler = CallHandler()
-        result = call_handler.end_call(call_id, duration, recording_url)
-        return jsonify(result)
+        services = get_services()
+        try:
+            result = services.call_handler.end_call(call_id, duration, recording_url)
+        except Exception as e:
+            # The analytics rollup below does not depend on the call handler
+            logger.error(f"Call handler could not end call {call_id}: {str(e)}")
+            result = {"success": False, "error": str(e)}
+        
+        # Add the call to its day's analytics rollup; counts each call once and never raises
+        counted = services.call_rollups.record_call_end(call_id, duration)
+        if not isinstance(result, dict):
+            return jsonify(result)
+        
+        result = dict(result, counted_in_analytics=counted)
+        return jsonify(result), 200 if result.get("success", True) or counted else 500
     except Exception as e:
         logger.error(f"Error ending call: {str(e)}")
         return jsonify({
@@ -226,88 +540,177 @@ def end_call(call_id):
             "error": str(e)
         }), 500
 
+@router.route("/analytics/rollups/sweep", methods=['GET', 'POST'])
+def sweep_call_rollups():
+    """
+    Count ended calls missing from the analytics rollups.
+    
+    Called by App Engine cron (cron.yaml) for calls that were ended without
+    POST /call/<call_id>/end. Also rebuilds a few businesses whose rollups
+    were never rebuilt, until analytics no longer need to fall back to
+    aggregating their calls. Requests not sent by cron are refused.
+    """
+    if not _from_cron():
+        logger.warning("Refused call rollup sweep not sent by App Engine cron")
+        return jsonify({"success": False, "error": "Forbidden"}), 403
+    
+    try:
+        call_rollups = get_services().call_rollups
+        return jsonify({"success": True, "data": {
+            "calls": call_rollups.record_uncounted_calls(),
+            "backfill": call_rollups.backfill()
+        }})
+    except Exception as e:
+        logger.error(f"Error sweeping call rollups: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def _run_rollup_rebuild_item(item):
+    """Rebuild one business's rollups for a job; returns (result, error)"""
+    since = window_start(item['days'])
+    result = get_services().call_rollups.rebuild(item['business_id'], since)
+    return result, None
+
+@router.route("/analytics/rollups/rebuild", methods=['POST'])
+def rebuild_call_rollups():
+    """
+    Recompute the business's analytics rollups from its calls, e.g. to
+    backfill calls made before rollups existed.
+    
+    Runs as a background job ({"days": n}, default 365); poll it with
+    GET /scrape-jobs/<job_id>.
+    """
+    try:
+        current_user = get_current_user()
+        data = request.get_json(silent=True) or {}
+        days = data.get('days', BACKFILL_DAYS) if isinstance(data, dict) else None
+        
+        if isinstance(days, bool) or not isinstance(days, int) or days < 1:
+            return jsonify({
+                "success": False,
+                "error": "days must be a positive integer"
+            }), 400
+        
+        item = {"business_id": current_user['business_id'], "days": days}
+        job, deduplicated = get_job_manager().submit("call_rollups", [item], _run_rollup_rebuild_item)
+        
+        return jsonify({
+            "success": True,
+            "job_id": job.job_id,
+            "status": job.status,
+            "deduplicated": deduplicated
+        }), 202
+    except JobQueueFullError as e:
+        logger.warning(f"Rejected rollup rebuild: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": "Too many jobs queued, try again later"
+        }), 503
+    except Exception as e:
+        logger.error(f"Error queueing rollup rebuild: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @router.route("/analytics/call-volume", methods=['GET'])
+@conditional(_analytics_version)
 def get_call_volume():
     try:
         business_id = "test_business_id"
         days = int(request.args.get('days', 30))
         
-        analytics = CallAnalytics()
-        result = analytics.get_call_volume_by_day(business_id, days)
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_call_volume_by_day(business_id, days))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @router.route("/analytics/duration-stats", methods=['GET'])
+@conditional(_analytics_version)
 def get_call_duration_stats():
     try:
         business_id = "test_business_id"
         days = int(request.args.get('days', 30))
         
-        analytics = CallAnalytics()
-        result = analytics.get_call_duration_stats(business_id, days)
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_call_duration_stats(business_id, days))
+        return jsonify({"success": True, "data": result})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@router.route("/analytics/unique-callers", methods=['GET'])
+@conditional(_analytics_version)
+def get_unique_callers():
+    try:
+        business_id = "test_business_id"
+        days = int(request.args.get('days', 30))
+        
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_unique_callers(business_id, days))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @router.route("/analytics/top-intents", methods=['GET'])
+@conditional(_analytics_version)
 def get_top_intents():
     try:
         business_id = "test_business_id"
         days = int(request.args.get('days', 30))
         limit = int(request.args.get('limit', 10))
         
-        analytics = CallAnalytics()
-        result = analytics.get_top_intents(business_id, days, limit)
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_top_intents(business_id, days, limit))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @router.route("/analytics/common-entities", methods=['GET'])
+@conditional(_analytics_version)
 def get_common_entities():
     try:
         business_id = "test_business_id"
         days = int(request.args.get('days', 30))
         
-        analytics = CallAnalytics()
-        result = analytics.get_common_entities(business_id, days)
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_common_entities(business_id, days))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @router.route("/analytics/action-metrics", methods=['GET'])
+@conditional(_analytics_version)
 def get_action_metrics():
     try:
         business_id = "test_business_id"
         days = int(request.args.get('days', 30))
         
-        analytics = CallAnalytics()
-        result = analytics.get_call_action_metrics(business_id, days)
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_call_action_metrics(business_id, days))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @router.route("/analytics/keyword-frequency", methods=['GET'])
+@conditional(_analytics_version)
 def get_keyword_frequency():
     try:
         business_id = "test_business_id"
         days = int(request.args.get('days', 30))
         top_n = int(request.args.get('top_n', 10))
         
-        analytics = CallAnalytics()
-        result = analytics.get_keyword_frequency(business_id, days, top_n)
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_keyword_frequency(business_id, days, top_n))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @router.route("/analytics/dashboard", methods=['GET'])
+@conditional(_analytics_version)
 def get_dashboard():
     try:
         business_id = "test_business_id"
         days = int(request.args.get('days', 30))
         
-        analytics = CallAnalytics()
-        result = analytics.get_business_dashboard(business_id, days)
+        analytics = get_services().call_analytics
+        result = _analytics(business_id, lambda: analytics.get_business_dashboard(business_id, days))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
\ No newline at end of file
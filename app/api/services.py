@@ -0,0 +1,178 @@
+# app/api/services.py
+
+import logging
+import threading
+from typing import Any, Callable, Dict
+from flask import Flask, current_app, has_app_context
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Key of the container in app.extensions
+EXTENSION_KEY = "business_services"
+
+
+def _business_repo(services):
+    from ..repositories.business_repository import BusinessRepository
+    return BusinessRepository()
+
+
+def _training_repo(services):
+    from ..repositories.training_repository import TrainingRepository
+    return TrainingRepository()
+
+
+def _photo_repo(services):
+    from ..repositories.photo_repository import PhotoRepository
+    return PhotoRepository()
+
+
+def _call_repo(services):
+    from ..repositories.call_repository import CallRepository
+    return CallRepository()
+
+
+def _rollup_repo(services):
+    from ..repositories.call_rollup_repository import CallRollupRepository
+    return CallRollupRepository()
+
+
+def _website_scraper(services):
+    from ..business.scrapers import WebsiteScraper
+    return WebsiteScraper(business_repo=services.business_repo, training_repo=services.training_repo)
+
+
+def _gbp_scraper(services):
+    from ..business.scrapers import GBPScraper
+    return GBPScraper(business_repo=services.business_repo)
+
+
+def _photo_cacher(services):
+    from ..business.photo_cache import PhotoCacher
+    return PhotoCacher(scraper=services.gbp_scraper, photo_repo=services.photo_repo,
+                       business_repo=services.business_repo)
+
+
+def _gbp_refresh(services):
+    from ..business.gbp_refresh import GBPRefreshScheduler
+    return GBPRefreshScheduler(business_repo=services.business_repo, scraper=services.gbp_scraper)
+
+
+def _call_handler(services):
+    from ..call_management.call_handler import CallHandler
+    return CallHandler()
+
+
+def _call_analytics(services):
+    from ..business.analytics import CallAnalytics
+    return CallAnalytics(rollup_repo=services.rollup_repo, call_repo=services.call_repo)
+
+
+def _call_rollups(services):
+    from ..business.call_rollups import CallRollups
+    return CallRollups(call_repo=services.call_repo, rollup_repo=services.rollup_repo)
+
+
+# Service name -> factory(container); repositories are shared by the services built on them
+SERVICE_FACTORIES: Dict[str, Callable[["ServiceContainer"], Any]] = {
+    "business_repo": _business_repo,
+    "training_repo": _training_repo,
+    "photo_repo": _photo_repo,
+    "call_repo": _call_repo,
+    "rollup_repo": _rollup_repo,
+    "website_scraper": _website_scraper,
+    "gbp_scraper": _gbp_scraper,
+    "photo_cacher": _photo_cacher,
+    "gbp_refresh": _gbp_refresh,
+    "call_handler": _call_handler,
+    "call_analytics": _call_analytics,
+    "call_rollups": _call_rollups
+}
+
+
+class ServiceContainer:
+    """
+    Services used by the business_data routes, built once per worker.
+
+    Every repository opens its own MongoClient and looks its connection
+    string up in Secret Manager, and GBPScraper resolves its API key the
+    same way, so building them per request cost several round trips before
+    any real work. The container builds each service on first use and hands
+    the same instance to every later request. The services are thread-safe:
+    MongoClient and the HTTP session are, and the scrapers keep no
+    per-request state.
+
+    A service whose construction fails is not cached, so a missing secret or
+    module is retried on the next request rather than failing for good.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[["ServiceContainer"], Any]] = None):
+        self._factories = dict(factories or SERVICE_FACTORIES)
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get(name)
+
+    def get(self, name: str) -> Any:
+        """The service registered under name, building it on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        if name not in self._factories:
+            raise AttributeError(f"Unknown service: {name}")
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                try:
+                    instance = self._factories[name](self)
+                except Exception as e:
+                    logger.error(f"Failed to build service {name}: {str(e)}")
+                    raise
+                self._instances[name] = instance
+                logger.info(f"Built service {name}")
+        return instance
+
+    def override(self, name: str, instance: Any):
+        """Use the given instance for a service, e.g. a stand-in in a benchmark."""
+        with self._lock:
+            self._instances[name] = instance
+
+    def built(self) -> Dict[str, str]:
+        """Name -> class of every service built so far."""
+        return {name: type(instance).__name__ for name, instance in self._instances.items()}
+
+
+# Process-wide container, shared by the app and background job threads
+_default_services = None
+_default_services_lock = threading.Lock()
+
+
+def _get_default_services() -> ServiceContainer:
+    global _default_services
+    if _default_services is None:
+        with _default_services_lock:
+            if _default_services is None:
+                _default_services = ServiceContainer()
+    return _default_services
+
+
+def init_services(app: Flask, container: ServiceContainer = None) -> ServiceContainer:
+    """Attach a service container to the app; services are built lazily on first use."""
+    if container is None:
+        container = _get_default_services()
+    app.extensions[EXTENSION_KEY] = container
+    return container
+
+
+def get_services() -> ServiceContainer:
+    """The current app's service container, or the process-wide one outside an app context."""
+    if has_app_context():
+        container = current_app.extensions.get(EXTENSION_KEY)
+        if container is not None:
+            return container
+    return _get_default_services()
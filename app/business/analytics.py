@@ -0,0 +1,303 @@
+# app/business/analytics.py
+
+import heapq
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from .analytics_pipelines import PipelineCallAnalytics
+from .call_rollups import rollup_name
+from .sketches import ddsketch_merge, ddsketch_quantile, hll_count, hll_merge
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def window_start(days: int, now: Optional[datetime] = None) -> datetime:
+    """Midnight UTC at the start of a window of `days` calendar days ending today."""
+    now = now or datetime.utcnow()
+    return datetime(now.year, now.month, now.day) - timedelta(days=max(1, days) - 1)
+
+
+def fill_days(counts: Dict[str, int], since: datetime, days: int) -> List[Dict[str, Any]]:
+    """One {"date", "count"} entry per day of the window, zero for days without calls."""
+    return [
+        {"date": day, "count": counts.get(day, 0)}
+        for day in ((since + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(max(1, days)))
+    ]
+
+
+def _top(counts: Dict[Any, int], limit: int) -> List[tuple]:
+    """The `limit` most frequent (key, count) pairs, ties by key, from a bounded heap."""
+    return heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _merge_counts(rollups: List[Dict[str, Any]], field: str) -> Counter:
+    merged = Counter()
+    for rollup in rollups:
+        for key, count in (rollup.get(field) or {}).items():
+            merged[rollup_name(key)] += count
+    return merged
+
+
+def volume_from_rollups(rollups: List[Dict[str, Any]], since: datetime, days: int) -> List[Dict[str, Any]]:
+    return fill_days({rollup["day"]: rollup.get("calls", 0) for rollup in rollups}, since, days)
+
+
+def duration_from_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    with_duration = sum(rollup.get("calls_with_duration", 0) for rollup in rollups)
+    total_duration = sum(rollup.get("total_duration", 0) for rollup in rollups)
+    minimums = [rollup["min_duration"] for rollup in rollups if rollup.get("min_duration") is not None]
+    maximums = [rollup["max_duration"] for rollup in rollups if rollup.get("max_duration") is not None]
+    return {
+        "total_calls": sum(rollup.get("calls", 0) for rollup in rollups),
+        "calls_with_duration": with_duration,
+        "total_duration": total_duration,
+        "average_duration": round(total_duration / with_duration, 2) if with_duration else None,
+        "min_duration": min(minimums) if minimums else None,
+        "max_duration": max(maximums) if maximums else None,
+        **duration_percentiles_from_rollups(rollups)
+    }
+
+
+def duration_percentiles_from_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """p50/p90/p99 call duration from the merged daily DDSketches, within 1%."""
+    sketch = ddsketch_merge(rollup.get("duration_sketch") for rollup in rollups)
+    percentiles = {}
+    for name, quantile in (("p50_duration", 0.5), ("p90_duration", 0.9), ("p99_duration", 0.99)):
+        value = ddsketch_quantile(sketch, quantile)
+        percentiles[name] = round(value, 2) if value is not None else None
+    return percentiles
+
+
+def unique_callers_from_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Approximate distinct caller numbers from the merged daily HyperLogLogs."""
+    return {
+        "total_calls": sum(rollup.get("calls", 0) for rollup in rollups),
+        "unique_callers": hll_count(hll_merge(rollup.get("unique_callers") for rollup in rollups))
+    }
+
+
+def intents_from_rollups(rollups: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    return [{"intent": intent, "count": count} for intent, count in _top(_merge_counts(rollups, "intents"), limit)]
+
+
+def entities_from_rollups(rollups: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    merged = Counter()
+    for rollup in rollups:
+        for entity_type, values in (rollup.get("entities") or {}).items():
+            for value, count in values.items():
+                merged[(rollup_name(entity_type), rollup_name(value))] += count
+    return [{"type": key[0], "value": key[1], "count": count} for key, count in _top(merged, limit)]
+
+
+def actions_from_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    total_calls = sum(rollup.get("calls", 0) for rollup in rollups)
+    calls_with_actions = sum(rollup.get("calls_with_actions", 0) for rollup in rollups)
+    actions = _merge_counts(rollups, "actions")
+    return {
+        "total_calls": total_calls,
+        "calls_with_actions": calls_with_actions,
+        "action_rate": round(calls_with_actions / total_calls, 4) if total_calls else 0.0,
+        "actions": [{"action": action, "count": count} for action, count in _top(actions, len(actions))]
+    }
+
+
+def keywords_from_rollups(rollups: List[Dict[str, Any]], top_n: int) -> List[Dict[str, Any]]:
+    merged = Counter()
+    for rollup in rollups:
+        merged.update(rollup.get("terms") or {})
+    return [{"keyword": keyword, "count": count} for keyword, count in _top(merged, top_n)]
+
+
+# Rollup fields read by each metric
+VOLUME_FIELDS = ["calls"]
+DURATION_FIELDS = ["calls", "calls_with_duration", "total_duration", "min_duration", "max_duration",
+                   "duration_sketch"]
+CALLER_FIELDS = ["calls", "unique_callers"]
+ACTION_FIELDS = ["calls", "calls_with_actions", "actions"]
+
+
+class CallAnalytics:
+    """
+    Call analytics for a business over a window of recent days.
+
+    Metrics are read from call_daily_rollups (see call_rollups.CallRollups),
+    one document per day of the window, so a 30-day window reads 30
+    documents however many calls there were. Keyword frequency merges the
+    per-day term counts that were tokenized from each transcript when its
+    call ended.
+
+    Rollups only hold every call from the day a business's rollups were
+    last rebuilt (CallRollups.rebuild, run by the rollup sweep cron and the
+    rebuild route). Windows reaching back further, including every window
+    of a business not rebuilt yet, are computed from the calls themselves
+    with aggregation pipelines (see analytics_pipelines).
+
+    Calls are call_transcripts documents. Besides business_id and
+    created_at, the fields used are:
+        duration: call length in seconds (number or numeric string)
+        detected_intents: [{"intent": ..., "confidence": ...}]
+        extracted_entities: [{"type": ..., "value": ...}]
+        actions: [{"type": ...}], e.g. transfer or schedule_appointment
+        transcript: [{"speaker": ..., "text": ...}]
+    """
+
+    def __init__(self, rollup_repo=None, call_repo=None):
+        try:
+            if rollup_repo is None:
+                from ..repositories.call_rollup_repository import CallRollupRepository
+                rollup_repo = CallRollupRepository()
+            if call_repo is None:
+                from ..repositories.call_repository import CallRepository
+                call_repo = CallRepository()
+        except Exception as e:
+            logger.error(f"Failed to initialize call analytics: {str(e)}")
+            raise
+        self.rollup_repo = rollup_repo
+        self.pipelines = PipelineCallAnalytics(call_repo)
+
+    def _covered(self, business_id: str, since: datetime) -> bool:
+        """Whether the business's rollups hold every call of a window starting at since."""
+        covered_since = self.rollup_repo.get_covered_since(business_id)
+        return covered_since is not None and covered_since <= since.strftime("%Y-%m-%d")
+
+    def _rollups(self, business_id: str, days: int, fields: List[str] = None):
+        """(window start, the window's rollups), or (window start, None) if rollups do not cover it."""
+        since = window_start(days)
+        if not self._covered(business_id, since):
+            return since, None
+        return since, self.rollup_repo.get_rollups(business_id, since.strftime("%Y-%m-%d"), fields)
+
+    def get_window_version(self, business_id: str, days: int = 30) -> Optional[List[Any]]:
+        """
+        Cheap version of every metric over a window: its first day and each
+        day's rollup version and update time, without reading the rollups
+        themselves. None for windows the rollups do not cover, whose
+        metrics have no cheap version.
+        """
+        since = window_start(days)
+        if not self._covered(business_id, since):
+            return None
+        day = since.strftime("%Y-%m-%d")
+        return [day] + self.rollup_repo.get_rollup_versions(business_id, day)
+
+    def get_call_volume_by_day(self, business_id: str, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Number of calls per day.
+
+        Returns:
+            list: [{"date": "YYYY-MM-DD", "count": n}] for every day of the window, oldest first
+        """
+        since, rollups = self._rollups(business_id, days, VOLUME_FIELDS)
+        if rollups is None:
+            return fill_days(self.pipelines.get_call_volume(business_id, since), since, days)
+        return volume_from_rollups(rollups, since, days)
+
+    def get_call_duration_stats(self, business_id: str, days: int = 30) -> Dict[str, Any]:
+        """
+        Call duration totals and percentiles in seconds.
+
+        Returns:
+            dict: total_calls, calls_with_duration, total/average/min/max duration
+                and approximate p50/p90/p99 duration (None without rollups)
+        """
+        since, rollups = self._rollups(business_id, days, DURATION_FIELDS)
+        if rollups is None:
+            return self.pipelines.get_call_duration_stats(business_id, since)
+        return duration_from_rollups(rollups)
+
+    def get_unique_callers(self, business_id: str, days: int = 30) -> Dict[str, Any]:
+        """
+        Number of distinct caller numbers, estimated with a standard error of about 3%.
+
+        Returns:
+            dict: total_calls and unique_callers
+        """
+        since, rollups = self._rollups(business_id, days, CALLER_FIELDS)
+        if rollups is None:
+            return self.pipelines.get_unique_callers(business_id, since)
+        return unique_callers_from_rollups(rollups)
+
+    def get_top_intents(self, business_id: str, days: int = 30, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Most frequent caller intents.
+
+        Returns:
+            list: [{"intent": ..., "count": calls}], most frequent first
+        """
+        since, rollups = self._rollups(business_id, days, ["intents"])
+        if rollups is None:
+            return self.pipelines.get_top_intents(business_id, since, limit)
+        return intents_from_rollups(rollups, limit)
+
+    def get_common_entities(self, business_id: str, days: int = 30, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Most frequent extracted entities; values are compared case-insensitively.
+
+        Returns:
+            list: [{"type": ..., "value": ..., "count": n}], most frequent first
+        """
+        since, rollups = self._rollups(business_id, days, ["entities"])
+        if rollups is None:
+            return self.pipelines.get_common_entities(business_id, since, limit)
+        return entities_from_rollups(rollups, limit)
+
+    def get_call_action_metrics(self, business_id: str, days: int = 30) -> Dict[str, Any]:
+        """
+        How many calls led to an action, and which.
+
+        Returns:
+            dict: total_calls, calls_with_actions, action_rate and [{"action", "count"}]
+        """
+        since, rollups = self._rollups(business_id, days, ACTION_FIELDS)
+        if rollups is None:
+            return self.pipelines.get_call_action_metrics(business_id, since)
+        return actions_from_rollups(rollups)
+
+    def get_keyword_frequency(self, business_id: str, days: int = 30, top_n: int = 10) -> List[Dict[str, Any]]:
+        """
+        Most frequent words callers used, without stopwords.
+
+        Returns:
+            list: [{"keyword": ..., "count": n}], most frequent first
+        """
+        since, rollups = self._rollups(business_id, days, ["terms"])
+        if rollups is None:
+            return self.pipelines.get_keyword_frequency(business_id, since, top_n)
+        return keywords_from_rollups(rollups, top_n)
+
+    def get_business_dashboard(self, business_id: str, days: int = 30) -> Dict[str, Any]:
+        """
+        Every metric for the dashboard.
+
+        The window's rollups are fetched once and every metric is computed
+        from that one result, rather than each metric running its own query.
+
+        Returns:
+            dict: The window and the result of each metric
+        """
+        since, rollups = self._rollups(business_id, days)
+        if rollups is None:
+            return {
+                "days": days,
+                "since": since.strftime("%Y-%m-%d"),
+                "call_volume": fill_days(self.pipelines.get_call_volume(business_id, since), since, days),
+                "duration_stats": self.pipelines.get_call_duration_stats(business_id, since),
+                "unique_callers": self.pipelines.get_unique_callers(business_id, since),
+                "top_intents": self.pipelines.get_top_intents(business_id, since, 10),
+                "common_entities": self.pipelines.get_common_entities(business_id, since, 20),
+                "action_metrics": self.pipelines.get_call_action_metrics(business_id, since),
+                "keywords": self.pipelines.get_keyword_frequency(business_id, since, 10)
+            }
+        return {
+            "days": days,
+            "since": since.strftime("%Y-%m-%d"),
+            "call_volume": volume_from_rollups(rollups, since, days),
+            "duration_stats": duration_from_rollups(rollups),
+            "unique_callers": unique_callers_from_rollups(rollups),
+            "top_intents": intents_from_rollups(rollups, 10),
+            "common_entities": entities_from_rollups(rollups, 20),
+            "action_metrics": actions_from_rollups(rollups),
+            "keywords": keywords_from_rollups(rollups, 10)
+        }
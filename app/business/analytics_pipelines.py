@@ -0,0 +1,184 @@
+# app/business/analytics_pipelines.py
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+from .call_rollups import ASSISTANT_SPEAKERS, STOPWORDS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Numeric call duration in seconds; Twilio reports it as a string
+_DURATION = {"$convert": {"input": "$duration", "to": "double", "onError": None, "onNull": None}}
+
+
+def volume_stages() -> List[Dict[str, Any]]:
+    return [
+        {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}, "count": {"$sum": 1}}},
+        {"$sort": {"_id": 1}}
+    ]
+
+
+def duration_stages() -> List[Dict[str, Any]]:
+    return [
+        {"$project": {"duration": _DURATION}},
+        {"$group": {
+            "_id": None,
+            "total_calls": {"$sum": 1},
+            "calls_with_duration": {"$sum": {"$cond": [{"$eq": ["$duration", None]}, 0, 1]}},
+            "total_duration": {"$sum": "$duration"},
+            "average_duration": {"$avg": "$duration"},
+            "min_duration": {"$min": "$duration"},
+            "max_duration": {"$max": "$duration"}
+        }}
+    ]
+
+
+def caller_stages() -> List[Dict[str, Any]]:
+    return [
+        {"$group": {"_id": "$caller_number", "calls": {"$sum": 1}}},
+        {"$group": {
+            "_id": None,
+            "total_calls": {"$sum": "$calls"},
+            "unique_callers": {"$sum": {"$cond": [{"$eq": ["$_id", None]}, 0, 1]}}
+        }}
+    ]
+
+
+def intent_stages(limit: int) -> List[Dict[str, Any]]:
+    # Each intent counts once per call, however often it was detected
+    return [
+        {"$project": {"intents": {"$setUnion": [{"$ifNull": ["$detected_intents.intent", []]}, []]}}},
+        {"$unwind": "$intents"},
+        {"$group": {"_id": "$intents", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit}
+    ]
+
+
+def entity_stages(limit: int) -> List[Dict[str, Any]]:
+    return [
+        {"$project": {"extracted_entities.type": 1, "extracted_entities.value": 1}},
+        {"$unwind": "$extracted_entities"},
+        {"$group": {
+            "_id": {"type": "$extracted_entities.type", "value": {"$toLower": "$extracted_entities.value"}},
+            "count": {"$sum": 1}
+        }},
+        {"$sort": {"count": -1, "_id.type": 1, "_id.value": 1}},
+        {"$limit": limit}
+    ]
+
+
+def action_stages() -> List[Dict[str, Any]]:
+    # Actions are counted once per call, like intents
+    return [
+        {"$project": {"actions": {"$setUnion": [{"$ifNull": ["$actions.type", []]}, []]}}},
+        {"$facet": {
+            "totals": [{"$group": {
+                "_id": None,
+                "total_calls": {"$sum": 1},
+                "calls_with_actions": {"$sum": {"$cond": [{"$gt": [{"$size": "$actions"}, 0]}, 1, 0]}}
+            }}],
+            "actions": [
+                {"$unwind": "$actions"},
+                {"$group": {"_id": "$actions", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}}
+            ]
+        }}
+    ]
+
+
+def keyword_stages(top_n: int) -> List[Dict[str, Any]]:
+    return [
+        {"$project": {"transcript.speaker": 1, "transcript.text": 1}},
+        {"$unwind": "$transcript"},
+        {"$match": {"transcript.speaker": {"$nin": sorted(ASSISTANT_SPEAKERS)}}},
+        {"$project": {"words": {"$regexFindAll": {
+            "input": {"$toLower": {"$ifNull": ["$transcript.text", ""]}},
+            "regex": "[a-z][a-z']+"
+        }}}},
+        {"$unwind": "$words"},
+        {"$match": {"words.match": {"$nin": sorted(STOPWORDS)}}},
+        {"$group": {"_id": "$words.match", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": top_n}
+    ]
+
+
+def duration_result(groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    stats = groups[0] if groups else {}
+    average = stats.get("average_duration")
+    return {
+        "total_calls": stats.get("total_calls", 0),
+        "calls_with_duration": stats.get("calls_with_duration", 0),
+        "total_duration": stats.get("total_duration", 0),
+        "average_duration": round(average, 2) if average is not None else None,
+        "min_duration": stats.get("min_duration"),
+        "max_duration": stats.get("max_duration"),
+        # Percentiles come from the rollups' duration sketches only
+        "p50_duration": None,
+        "p90_duration": None,
+        "p99_duration": None
+    }
+
+
+def action_result(facets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    facet = facets[0] if facets else {}
+    totals = (facet.get("totals") or [{}])[0]
+    total_calls = totals.get("total_calls", 0)
+    calls_with_actions = totals.get("calls_with_actions", 0)
+    return {
+        "total_calls": total_calls,
+        "calls_with_actions": calls_with_actions,
+        "action_rate": round(calls_with_actions / total_calls, 4) if total_calls else 0.0,
+        "actions": [{"action": group["_id"], "count": group["count"]} for group in facet.get("actions", [])]
+    }
+
+
+class PipelineCallAnalytics:
+    """
+    Call analytics computed straight from call_transcripts with
+    aggregation pipelines, run server-side over the business's calls in the
+    window. The (business_id, created_at) index narrows each to an index
+    range scan, and only the aggregated rows come back.
+
+    CallAnalytics falls back to this for windows its rollups do not cover
+    yet, i.e. before a business's rollups have been rebuilt. Results match
+    the rollup metrics, except that duration percentiles are None and
+    unique callers are exact.
+    """
+
+    def __init__(self, call_repo):
+        self.call_repo = call_repo
+
+    def _aggregate(self, business_id: str, since: datetime, stages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.call_repo.aggregate_calls(business_id, since, stages)
+
+    def get_call_volume(self, business_id: str, since: datetime) -> Dict[str, int]:
+        """Number of calls per "YYYY-MM-DD" day."""
+        return {group["_id"]: group["count"] for group in self._aggregate(business_id, since, volume_stages())}
+
+    def get_call_duration_stats(self, business_id: str, since: datetime) -> Dict[str, Any]:
+        return duration_result(self._aggregate(business_id, since, duration_stages()))
+
+    def get_unique_callers(self, business_id: str, since: datetime) -> Dict[str, Any]:
+        groups = self._aggregate(business_id, since, caller_stages())
+        stats = groups[0] if groups else {}
+        return {"total_calls": stats.get("total_calls", 0), "unique_callers": stats.get("unique_callers", 0)}
+
+    def get_top_intents(self, business_id: str, since: datetime, limit: int) -> List[Dict[str, Any]]:
+        groups = self._aggregate(business_id, since, intent_stages(limit))
+        return [{"intent": group["_id"], "count": group["count"]} for group in groups]
+
+    def get_common_entities(self, business_id: str, since: datetime, limit: int) -> List[Dict[str, Any]]:
+        groups = self._aggregate(business_id, since, entity_stages(limit))
+        return [{"type": group["_id"]["type"], "value": group["_id"]["value"], "count": group["count"]}
+                for group in groups]
+
+    def get_call_action_metrics(self, business_id: str, since: datetime) -> Dict[str, Any]:
+        return action_result(self._aggregate(business_id, since, action_stages()))
+
+    def get_keyword_frequency(self, business_id: str, since: datetime, top_n: int) -> List[Dict[str, Any]]:
+        groups = self._aggregate(business_id, since, keyword_stages(top_n))
+        return [{"keyword": group["_id"], "count": group["count"]} for group in groups]
@@ -0,0 +1,304 @@
+# app/business/call_rollups.py
+
+import logging
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+from .sketches import ddsketch_bucket, hll_register
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Calls marked per update while rebuilding
+MARK_BATCH_SIZE = 1000
+
+# Most uncounted calls one sweep counts (see CallRollups.record_uncounted_calls)
+SWEEP_MAX_CALLS = int(os.environ.get("CALL_ROLLUP_SWEEP_MAX", "2000"))
+
+# Days of calls a rebuild recomputes when it backfills a business (see CallRollups.backfill)
+BACKFILL_DAYS = 365
+
+# Businesses one sweep backfills, so a sweep stays inside the cron deadline
+BACKFILL_MAX_BUSINESSES = int(os.environ.get("CALL_ROLLUP_BACKFILL_MAX", "5"))
+
+# Words left out of keyword frequency
+STOPWORDS = frozenset([
+    "a", "about", "after", "all", "also", "am", "an", "and", "any", "are", "as", "at", "be", "been",
+    "but", "by", "can", "could", "did", "do", "does", "for", "from", "get", "got", "had", "has",
+    "have", "he", "her", "hi", "him", "his", "how", "i", "if", "in", "is", "it", "its", "i'm",
+    "just", "know", "like", "me", "my", "no", "not", "of", "ok", "okay", "on", "or", "our", "out",
+    "she", "so", "that", "the", "their", "them", "then", "there", "they", "this", "to", "um", "uh",
+    "up", "us", "was", "we", "well", "were", "what", "when", "where", "which", "who", "why", "will",
+    "with", "would", "yeah", "yes", "you", "your"
+])
+
+# Transcript speakers whose words are not counted as caller keywords
+ASSISTANT_SPEAKERS = frozenset(["ai", "assistant", "system"])
+
+# A keyword: lowercase letters and apostrophes, at least two characters. Never
+# contains "." or "$", so keywords are safe to use as field names unescaped
+_WORD = re.compile(r"[a-z][a-z']+")
+
+# Intent, action and entity names become field names: MongoDB does not allow
+# "." in them or "$" at the start, so those are swapped for full-width forms
+_KEY_ESCAPES = (("\uff0e", "."), ("\uff04", "$"))
+
+
+def rollup_key(value: Any) -> str:
+    key = str(value).replace(".", "\uff0e") or "(none)"
+    if key.startswith("$"):
+        key = "\uff04" + key[1:]
+    return key
+
+
+def rollup_name(key: str) -> str:
+    """The original name of a rollup field made by rollup_key."""
+    for escaped, original in _KEY_ESCAPES:
+        key = key.replace(escaped, original)
+    return key
+
+
+def call_day(call: Dict[str, Any]) -> str:
+    """UTC day a call is counted under: the day it started."""
+    return (call.get("created_at") or datetime.utcnow()).strftime("%Y-%m-%d")
+
+
+def call_duration(call: Dict[str, Any], duration: Any = None) -> Optional[float]:
+    """Call length in seconds, from the call or the given fallback; None if unknown."""
+    for value in (call.get("duration"), duration):
+        try:
+            if value is not None and value != "":
+                return float(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def caller_terms(call: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Keyword counts for what the caller said in a call, without stopwords.
+
+    Uses the term_counts stored on the call when it has them, otherwise
+    tokenizes the caller's transcript turns.
+    """
+    if call.get("term_counts") is not None:
+        return call["term_counts"]
+    terms = Counter()
+    for turn in call.get("transcript") or []:
+        if turn.get("speaker") in ASSISTANT_SPEAKERS:
+            continue
+        terms.update(word for word in _WORD.findall((turn.get("text") or "").lower()) if word not in STOPWORDS)
+    return dict(terms)
+
+
+def caller_key(call: Dict[str, Any]) -> Optional[str]:
+    """The caller's number with formatting removed, or None if the call has none."""
+    digits = re.sub(r"\D", "", str(call.get("caller_number") or ""))
+    return digits or None
+
+
+def rollup_update(call: Dict[str, Any], duration: Any = None, terms: Dict[str, int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    The $inc/$min/$max update that adds one call to its day's rollup.
+
+    Intents and actions count once per call; entities count every
+    occurrence, with values compared case-insensitively; terms count
+    every keyword the caller said (see caller_terms). The caller's number
+    goes into the unique_callers HyperLogLog and the duration into the
+    duration_sketch DDSketch (see sketches); both merge across days.
+    """
+    inc: Dict[str, Any] = {"calls": 1}
+    update: Dict[str, Dict[str, Any]] = {"$inc": inc}
+
+    seconds = call_duration(call, duration)
+    if seconds is not None:
+        inc["calls_with_duration"] = 1
+        inc["total_duration"] = seconds
+        inc[f"duration_sketch.{ddsketch_bucket(seconds)}"] = 1
+        update["$min"] = {"min_duration": seconds}
+        update["$max"] = {"max_duration": seconds}
+
+    caller = caller_key(call)
+    if caller:
+        register, rank = hll_register(caller)
+        update.setdefault("$max", {})[f"unique_callers.{register}"] = rank
+
+    intents = {item.get("intent") for item in call.get("detected_intents") or [] if item.get("intent")}
+    for intent in intents:
+        inc[f"intents.{rollup_key(intent)}"] = 1
+
+    actions = {item.get("type") for item in call.get("actions") or [] if item.get("type")}
+    if actions:
+        inc["calls_with_actions"] = 1
+    for action in actions:
+        inc[f"actions.{rollup_key(action)}"] = 1
+
+    for entity in call.get("extracted_entities") or []:
+        if entity.get("type") and entity.get("value"):
+            field = f"entities.{rollup_key(entity['type'])}.{rollup_key(str(entity['value']).lower())}"
+            inc[field] = inc.get(field, 0) + 1
+
+    for term, count in (caller_terms(call) if terms is None else terms).items():
+        inc[f"terms.{term}"] = count
+
+    return update
+
+
+def apply_rollup_update(rollup: Dict[str, Any], update: Dict[str, Dict[str, Any]]):
+    """Apply a rollup_update to an in-memory rollup the way MongoDB would."""
+    for operator, fields in update.items():
+        for path, value in fields.items():
+            parent = rollup
+            *parents, name = path.split(".")
+            for part in parents:
+                parent = parent.setdefault(part, {})
+            current = parent.get(name)
+            if operator == "$inc":
+                parent[name] = (current or 0) + value
+            elif operator == "$min":
+                parent[name] = value if current is None else min(current, value)
+            elif operator == "$max":
+                parent[name] = value if current is None else max(current, value)
+
+
+class CallRollups:
+    """
+    Keeps call_daily_rollups up to date as calls end.
+
+    Each ended call is added to its (business_id, day) rollup with one
+    atomic update, so analytics over a window of days read one small
+    document per day instead of rescanning every call in the window.
+    The call's transcript is tokenized once, here: its keyword counts are
+    stored on the call as term_counts and added to the day's terms.
+    """
+
+    def __init__(self, call_repo=None, rollup_repo=None):
+        try:
+            if call_repo is None:
+                from ..repositories.call_repository import CallRepository
+                call_repo = CallRepository()
+            if rollup_repo is None:
+                from ..repositories.call_rollup_repository import CallRollupRepository
+                rollup_repo = CallRollupRepository()
+        except Exception as e:
+            logger.error(f"Failed to initialize call rollups: {str(e)}")
+            raise
+        self.call_repo = call_repo
+        self.rollup_repo = rollup_repo
+
+    def record_call_end(self, call_id: str, duration: Any = None) -> bool:
+        """
+        Add an ended call to its day's rollup, once.
+
+        Args:
+            call_id: The call that ended
+            duration: Call length in seconds, used if the call document has none
+
+        The call is claimed before its rollup is updated, so two workers
+        ending it at once count it once; if the update fails the claim is
+        released, so a later end or rebuild can still count it.
+
+        Returns:
+            bool: True if the call was counted, False if it was unknown,
+                already counted or the update failed
+        """
+        try:
+            call = self.call_repo.claim_call_for_rollup(call_id)
+        except Exception as e:
+            logger.error(f"Error claiming call {call_id} for rollups: {str(e)}")
+            return False
+        if not call:
+            return False
+
+        try:
+            terms = caller_terms(call)
+            self.rollup_repo.apply_update(call["business_id"], call_day(call), rollup_update(call, duration, terms))
+        except Exception as e:
+            logger.error(f"Error recording call {call_id} in rollups: {str(e)}")
+            try:
+                self.call_repo.release_call_rollup(call_id)
+            except Exception as release_error:
+                logger.error(f"Call {call_id} stays marked as counted without being counted: {str(release_error)}")
+            return False
+
+        self.call_repo.set_call_term_counts(call_id, terms)
+        return True
+
+    def record_uncounted_calls(self, limit: int = SWEEP_MAX_CALLS) -> Dict[str, int]:
+        """
+        Count ended calls that no end request counted, e.g. calls ended by
+        another service writing call_transcripts directly, or whose rollup
+        update failed. Run periodically by cron.
+
+        Returns:
+            dict: Number of calls found and counted
+        """
+        call_ids = self.call_repo.find_uncounted_call_ids(limit)
+        counted = sum(1 for call_id in call_ids if self.record_call_end(call_id))
+        if call_ids:
+            logger.info(f"Counted {counted} of {len(call_ids)} uncounted calls in rollups")
+        return {"found": len(call_ids), "counted": counted}
+
+    def rebuild(self, business_id: str, since: datetime) -> Dict[str, int]:
+        """
+        Recompute a business's rollups from its calls, e.g. for calls made
+        before rollups existed.
+
+        Only ended calls (with a duration, or already counted) are included;
+        calls still in progress are counted by record_call_end when they end.
+
+        Args:
+            business_id: The business to rebuild
+            since: Midnight UTC of the first day to rebuild
+
+        Returns:
+            dict: Number of calls counted and rollup days written
+        """
+        rollups: Dict[str, Dict[str, Any]] = {}
+        unmarked = []
+        counted = 0
+        for call in self.call_repo.find_calls_for_rollup(business_id, since):
+            if not call.get("rolled_up_at") and call_duration(call) is None:
+                continue
+            day = call_day(call)
+            apply_rollup_update(rollups.setdefault(day, {"day": day}), rollup_update(call))
+            counted += 1
+            if not call.get("rolled_up_at"):
+                unmarked.append(call["call_id"])
+
+        for batch in _batches(unmarked, MARK_BATCH_SIZE):
+            self.call_repo.mark_calls_rolled_up(batch)
+        days = self.rollup_repo.replace_rollups(
+            business_id, [rollups[day] for day in sorted(rollups)], since.strftime("%Y-%m-%d"))
+        self.rollup_repo.set_covered_since(business_id, since.strftime("%Y-%m-%d"))
+        logger.info(f"Rebuilt call rollups for {business_id}: {counted} calls, {days} days")
+        return {"calls": counted, "days": days}
+
+
+    def backfill(self, limit: int = BACKFILL_MAX_BUSINESSES, days: int = BACKFILL_DAYS) -> Dict[str, Any]:
+        """
+        Rebuild the rollups of businesses that have calls but were never
+        rebuilt, so analytics stop falling back to aggregating their calls.
+        Run periodically by cron, a few businesses at a time.
+
+        Returns:
+            dict: The businesses rebuilt and the number still waiting
+        """
+        business_ids = self.call_repo.get_business_ids_with_calls()
+        covered = self.rollup_repo.get_covered_business_ids(business_ids)
+        pending = [business_id for business_id in business_ids if business_id not in covered]
+
+        now = datetime.utcnow()
+        since = datetime(now.year, now.month, now.day) - timedelta(days=days - 1)
+        rebuilt = []
+        for business_id in pending[:limit]:
+            self.rebuild(business_id, since)
+            rebuilt.append(business_id)
+        return {"rebuilt": rebuilt, "remaining": len(pending) - len(rebuilt)}
+
+def _batches(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
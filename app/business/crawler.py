@@ -0,0 +1,228 @@
+# app/business/crawler.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urldefrag, urlparse
+import aiohttp
+from .download import FetchedPage, fetch_page_async
+from .revalidation import conditional_headers
+
+# gevent is optional; it is only present when gunicorn runs gevent workers
+try:
+    from gevent import monkey as gevent_monkey
+except ImportError:
+    gevent_monkey = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sub-pages worth following from the home page, matched against link text and path
+PAGE_KEYWORDS = {
+    "about": ("about", "our-story", "our story", "who-we-are", "who we are", "team"),
+    "services": ("service", "offering", "what-we-do", "what we do", "practice", "menu", "pricing"),
+    "faq": ("faq", "frequently", "questions"),
+    "contact": ("contact", "location", "directions", "find-us", "find us"),
+    "hours": ("hours", "schedule", "opening", "visit"),
+}
+
+# Links that never lead to an HTML page
+SKIPPED_SCHEMES = ("mailto:", "tel:", "javascript:", "sms:", "fax:")
+SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".doc", ".docx", ".mp4", ".mp3")
+
+
+def run_coroutine(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Under gevent workers every request greenlet shares one OS thread, and
+    asyncio allows only one running loop per thread, so the loop is run on
+    a native thread from gevent's pool while the request greenlet yields.
+    """
+    if gevent_monkey is not None and gevent_monkey.is_module_patched("threading"):
+        from gevent import get_hub
+        return get_hub().threadpool.apply(asyncio.run, (coro,))
+    return asyncio.run(coro)
+
+
+# handler(page) -> (extracted result, [(href, link text), ...])
+PageHandler = Callable[[FetchedPage], Tuple[Any, List[Tuple[str, str]]]]
+
+
+class SiteCrawler:
+    """
+    Bounded concurrent crawler for small-business websites.
+
+    Fetches the home page, picks the about, services, FAQ, contact and hours
+    pages from its links and fetches those concurrently. Concurrency per host,
+    link depth, the total number of pages and the overall wall time are all
+    capped; whatever was fetched when a budget runs out is returned.
+    """
+
+    def __init__(self, max_pages: int = 6, max_depth: int = 1, per_host_limit: int = 4,
+                 deadline: float = 20.0, timeout: float = 10.0):
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.per_host_limit = per_host_limit
+        self.deadline = deadline
+        self.timeout = timeout
+
+    def crawl(self, url: str, handler: PageHandler,
+              prefetched: Optional[Dict[str, FetchedPage]] = None) -> List[Tuple[FetchedPage, Any]]:
+        """
+        Crawl a site and run the handler over every fetched page.
+
+        Args:
+            url: The home page URL
+            handler: Called once per page; returns its result and the page's links
+            prefetched: Pages already downloaded by URL, e.g. during revalidation;
+                used instead of fetching them again
+
+        Returns:
+            list: (page, handler result) pairs, home page first
+
+        Raises:
+            Exception: If the home page itself cannot be fetched
+        """
+        return run_coroutine(self._crawl(url, handler, prefetched or {}))
+
+    def revalidate(self, pages: List[Dict[str, Any]]) -> List[Optional[FetchedPage]]:
+        """
+        Re-request previously crawled pages concurrently with conditional headers.
+
+        Args:
+            pages: Stored page states with url, kind, etag and last_modified
+
+        Returns:
+            list: One FetchedPage per input page (status 304 when unchanged),
+                or None where the request failed
+        """
+        return run_coroutine(self._revalidate(pages))
+
+    async def _revalidate(self, pages: List[Dict[str, Any]]) -> List[Optional[FetchedPage]]:
+        async with self._session() as session:
+            tasks = [
+                self._fetch(session, page["url"], page.get("kind", "home"), 0, conditional_headers(page))
+                for page in pages
+            ]
+            results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), self.deadline)
+        return [None if isinstance(result, Exception) else result for result in results]
+
+    def _session(self) -> aiohttp.ClientSession:
+        """Client session honoring the per-host concurrency limit and request timeout."""
+        connector = aiohttp.TCPConnector(limit_per_host=self.per_host_limit)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def _crawl(self, url: str, handler: PageHandler,
+                     prefetched: Dict[str, FetchedPage]) -> List[Tuple[FetchedPage, Any]]:
+        started = time.monotonic()
+
+        async with self._session() as session:
+            # The home page is required; let its errors propagate
+            home = await asyncio.wait_for(self._fetch(session, url, "home", 0, prefetched=prefetched),
+                                          self.deadline)
+            home_result, links = handler(home)
+            results = [(home, home_result)]
+
+            visited = {self._normalize(home.url), self._normalize(url)}
+            host = urlparse(home.url).netloc
+            frontier = self._select_links(home.url, host, links, visited)
+
+            depth = 1
+            while frontier and depth <= self.max_depth:
+                remaining_pages = self.max_pages - len(results)
+                remaining_time = self.deadline - (time.monotonic() - started)
+                if remaining_pages <= 0 or remaining_time <= 0:
+                    break
+
+                batch = frontier[:remaining_pages]
+                tasks = [asyncio.create_task(self._fetch(session, link, kind, depth, prefetched=prefetched))
+                         for link, kind in batch]
+                done, pending = await asyncio.wait(tasks, timeout=remaining_time)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    logger.warning(f"Crawl deadline reached for {url}, dropped {len(pending)} page(s)")
+
+                # Keep link order so merged results are deterministic
+                pages = []
+                for task in tasks:
+                    if task not in done or task.exception() is not None:
+                        if task in done:
+                            logger.warning(f"Skipping page during crawl of {url}: {task.exception()}")
+                        continue
+                    pages.append(task.result())
+
+                # Handlers run in threads so pages handed to the parse pool are extracted in parallel
+                loop = asyncio.get_running_loop()
+                handled = await asyncio.gather(
+                    *(loop.run_in_executor(None, handler, page) for page in pages),
+                    return_exceptions=True
+                )
+
+                next_links = []
+                for page, outcome in zip(pages, handled):
+                    if isinstance(outcome, Exception):
+                        logger.warning(f"Error processing {page.url}: {str(outcome)}")
+                        continue
+                    page_result, page_links = outcome
+                    results.append((page, page_result))
+                    next_links.extend(page_links)
+
+                depth += 1
+                frontier = self._select_links(home.url, host, next_links, visited)
+
+        logger.info(f"Crawled {len(results)} page(s) from {url} in {time.monotonic() - started:.2f}s")
+        return results
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, kind: str, depth: int,
+                     headers: Optional[Dict[str, str]] = None,
+                     prefetched: Optional[Dict[str, FetchedPage]] = None) -> FetchedPage:
+        """
+        Stream one page within the download budget; a 304 answer yields an empty body.
+        A page found in prefetched is returned as is, with this crawl's kind and depth.
+        """
+        page = (prefetched or {}).get(url)
+        if page is not None:
+            return FetchedPage(page.url, kind, depth, page.content, page.encoding, status=page.status,
+                               etag=page.etag, last_modified=page.last_modified, truncated=page.truncated)
+        return await fetch_page_async(session, url, kind, depth, headers)
+
+    def _select_links(self, base_url: str, host: str, links: List[Tuple[str, str]], visited: set) -> List[Tuple[str, str]]:
+        """Pick at most one same-host link per page kind, in PAGE_KEYWORDS order."""
+        chosen: Dict[str, str] = {}
+
+        for href, text in links:
+            if not href or href.startswith("#") or href.lower().startswith(SKIPPED_SCHEMES):
+                continue
+
+            absolute = urldefrag(urljoin(base_url, href))[0]
+            parsed = urlparse(absolute)
+            if parsed.scheme not in ("http", "https") or parsed.netloc != host:
+                continue
+            if parsed.path.lower().endswith(SKIPPED_EXTENSIONS):
+                continue
+
+            normalized = self._normalize(absolute)
+            if normalized in visited:
+                continue
+
+            haystack = f"{parsed.path} {text or ''}".lower()
+            for kind, keywords in PAGE_KEYWORDS.items():
+                if kind not in chosen and any(k in haystack for k in keywords):
+                    chosen[kind] = absolute
+                    visited.add(normalized)
+                    break
+
+        return [(chosen[kind], kind) for kind in PAGE_KEYWORDS if kind in chosen]
+
+    @staticmethod
+    def _normalize(url: str) -> str:
+        """Normalize a URL for duplicate detection."""
+        parsed = urlparse(url)
+        path = parsed.path.rstrip("/") or "/"
+        return f"{parsed.netloc.lower()}{path}?{parsed.query}"
@@ -0,0 +1,170 @@
+# app/business/download.py
+
+import logging
+import os
+from typing import Dict, Optional
+from .http_client import DEFAULT_TIMEOUT
+from .parsers import declared_encoding
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Hard cap on the bytes read for one page, headers excluded
+MAX_PAGE_BYTES = int(os.environ.get("SCRAPER_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+
+# Bytes read after the opening <body> tag before the download stops
+MAX_BODY_BYTES = int(os.environ.get("SCRAPER_MAX_BODY_BYTES", str(1024 * 1024)))
+
+CHUNK_SIZE = 64 * 1024
+
+# Content types worth parsing; a missing Content-Type is given the benefit of the doubt
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+_BODY_TAG = b"<body"
+
+
+class UnsupportedContentError(Exception):
+    """Raised when a response is not an HTML page"""
+
+
+class FetchedPage:
+    """A downloaded page handed to the crawl's page handler"""
+
+    def __init__(self, url: str, kind: str, depth: int, content: bytes, encoding: Optional[str],
+                 status: int = 200, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 truncated: bool = False):
+        self.url = url
+        self.kind = kind
+        self.depth = depth
+        self.content = content
+        self.encoding = encoding
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.truncated = truncated
+
+    @property
+    def not_modified(self) -> bool:
+        """True when the server answered a conditional request with 304"""
+        return self.status == 304
+
+
+class DownloadBudget:
+    """
+    Accumulates streamed chunks until the page or <body> budget runs out.
+
+    The head of a page can be large (inline scripts, styles), so the total
+    cap is paired with a separate allowance for bytes after <body>.
+    """
+
+    def __init__(self, max_bytes: int = None, max_body_bytes: int = None):
+        self.max_bytes = max_bytes or MAX_PAGE_BYTES
+        self.max_body_bytes = max_body_bytes or MAX_BODY_BYTES
+        self._buffer = bytearray()
+        self._body_start: Optional[int] = None
+        self.truncated = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Add a chunk to the page.
+
+        Returns:
+            bool: False once the budget is exhausted and reading should stop
+        """
+        if not chunk:
+            return True
+
+        offset = len(self._buffer)
+        self._buffer.extend(chunk)
+
+        if self._body_start is None:
+            # Look back a few bytes in case the tag straddles two chunks
+            search_from = max(0, offset - len(_BODY_TAG))
+            found = bytes(self._buffer[search_from:]).lower().find(_BODY_TAG)
+            if found != -1:
+                self._body_start = search_from + found
+
+        limit = self.max_bytes
+        if self._body_start is not None:
+            limit = min(limit, self._body_start + self.max_body_bytes)
+
+        if len(self._buffer) >= limit:
+            del self._buffer[limit:]
+            self.truncated = True
+            return False
+        return True
+
+    @property
+    def content(self) -> bytes:
+        return bytes(self._buffer)
+
+
+def check_content_type(headers) -> None:
+    """
+    Reject responses that are not HTML before their body is read.
+
+    Raises:
+        UnsupportedContentError: For PDFs, images and other non-HTML types
+    """
+    content_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        raise UnsupportedContentError(f"Unsupported content type: {content_type}")
+
+
+def fetch_page(session, url: str, kind: str = "home", depth: int = 0,
+               headers: Optional[Dict[str, str]] = None) -> FetchedPage:
+    """
+    Stream one page with a requests session, honoring the download budget.
+
+    Args:
+        session: A requests.Session
+        url: The page URL
+        kind: Page kind recorded on the result
+        depth: Link depth recorded on the result
+        headers: Extra request headers, e.g. conditional validators
+
+    Returns:
+        FetchedPage: The page; a 304 answer yields an empty body
+    """
+    with session.get(url, headers=headers, timeout=DEFAULT_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        budget = DownloadBudget()
+
+        if response.status_code != 304:
+            check_content_type(response.headers)
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if not budget.feed(chunk):
+                    logger.info(f"Stopped reading {url} at {len(budget.content)} bytes")
+                    break
+
+        return FetchedPage(
+            response.url, kind, depth, budget.content, declared_encoding(response.headers),
+            status=response.status_code,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            truncated=budget.truncated
+        )
+
+
+async def fetch_page_async(session, url: str, kind: str = "home", depth: int = 0,
+                           headers: Optional[Dict[str, str]] = None) -> FetchedPage:
+    """Stream one page with an aiohttp session; see fetch_page."""
+    async with session.get(url, headers=headers) as response:
+        response.raise_for_status()
+        budget = DownloadBudget()
+
+        if response.status != 304:
+            check_content_type(response.headers)
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                if not budget.feed(chunk):
+                    logger.info(f"Stopped reading {url} at {len(budget.content)} bytes")
+                    break
+
+        return FetchedPage(
+            str(response.url), kind, depth, budget.content, declared_encoding(response.headers),
+            status=response.status,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            truncated=budget.truncated
+        )
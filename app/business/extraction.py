@@ -0,0 +1,146 @@
+# app/business/extraction.py
+
+import logging
+from typing import Dict, List, Tuple, Any
+from bs4.element import NavigableString, CData
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# String types that BeautifulSoup's get_text() counts as page text
+# (script, style, template and comment strings are left out)
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+# Tags whose text is dropped from the clean text
+CLEAN_TEXT_EXCLUDED_TAGS = {"script", "style", "header", "footer", "nav"}
+
+# Elements collected by class name: bucket -> (tag names, class keywords)
+CLASS_BUCKETS = {
+    "services": (("section", "div"), ("service", "offering", "product")),
+    "service_lists": (("ul",), ("service",)),
+    "hours": (("section", "div"), ("hour", "time", "schedule")),
+    "faq": (("section", "div"), ("faq",)),
+    "about": (("section", "div"), ("about",)),
+    "address": (("div", "p"), ("address",)),
+}
+
+# Elements collected by id: bucket -> (tag names, id keywords)
+ID_BUCKETS = {
+    "about": (("section", "div"), ("about",)),
+}
+
+
+class PageIndex:
+    """
+    Single-pass index over a parsed page.
+
+    Walks the document once and records everything the website extractors
+    look up: the title, meta description and footer, mailto/tel links,
+    other outgoing links, JSON-LD blocks, schema.org itemtype elements,
+    class/id keyword sections and the page text. The soup itself is never modified.
+    """
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.title = None
+        self.meta_description = None
+        self.footer = None
+        self.mailto_links: List[Any] = []
+        self.tel_links: List[Any] = []
+        self.about_links: List[Any] = []
+        self.links: List[Tuple[str, str]] = []
+        self.json_ld: List[str] = []
+        self.itemtypes: Dict[str, List[Any]] = {}
+        self.by_class: Dict[str, List[Any]] = {name: [] for name in CLASS_BUCKETS}
+        self.by_id: Dict[str, List[Any]] = {name: [] for name in ID_BUCKETS}
+        self.text = ""
+        self.clean_text = ""
+        self._walk()
+
+    def _walk(self):
+        """Traverse the document once, indexing tags and collecting text."""
+        text_parts = []
+        clean_parts = []
+
+        # Explicit stack keeps document order without recursion limits
+        stack = [(self.soup, False)]
+        while stack:
+            node, hidden = stack.pop()
+
+            if isinstance(node, NavigableString):
+                if type(node) in TEXT_STRING_TYPES:
+                    text_parts.append(node)
+                    if not hidden:
+                        clean_parts.append(node)
+                continue
+
+            self._index_tag(node)
+            hidden = hidden or node.name in CLEAN_TEXT_EXCLUDED_TAGS
+            stack.extend((child, hidden) for child in reversed(node.contents))
+
+        self.text = "".join(text_parts)
+        self.clean_text = "".join(clean_parts)
+
+    def _index_tag(self, tag):
+        """Record a single tag in every bucket it belongs to."""
+        name = tag.name
+        attrs = tag.attrs
+
+        if name == "title":
+            if self.title is None:
+                self.title = tag
+        elif name == "meta":
+            if self.meta_description is None and attrs.get("name") == "description":
+                self.meta_description = tag
+        elif name == "footer":
+            if self.footer is None:
+                self.footer = tag
+        elif name == "script":
+            if str(attrs.get("type", "")).strip().lower() == "application/ld+json":
+                self.json_ld.append(str(tag.string or ""))
+        elif name == "a":
+            href = attrs.get("href")
+            link_text = tag.string
+            if isinstance(href, str):
+                if href.startswith("mailto"):
+                    self.mailto_links.append(tag)
+                elif href.startswith("tel"):
+                    self.tel_links.append(tag)
+                else:
+                    self.links.append((href, str(link_text or "")))
+            if link_text and "about" in link_text.lower():
+                self.about_links.append(tag)
+
+        itemtype = attrs.get("itemtype")
+        if itemtype:
+            self.itemtypes.setdefault(itemtype, []).append(tag)
+
+        classes = attrs.get("class")
+        if classes:
+            if isinstance(classes, str):
+                classes = classes.split()
+            lowered = [c.lower() for c in classes]
+            for bucket, (tag_names, keywords) in CLASS_BUCKETS.items():
+                if name in tag_names and _contains_keyword(lowered, keywords):
+                    self.by_class[bucket].append(tag)
+
+        tag_id = attrs.get("id")
+        if tag_id:
+            lowered_id = tag_id.lower()
+            for bucket, (tag_names, keywords) in ID_BUCKETS.items():
+                if name in tag_names and any(k in lowered_id for k in keywords):
+                    self.by_id[bucket].append(tag)
+
+    def itemtype(self, schema_type: str) -> List[Any]:
+        """Elements whose itemtype is the given schema.org URL."""
+        return self.itemtypes.get(schema_type, [])
+
+
+def _contains_keyword(values: List[str], keywords) -> bool:
+    """True if any keyword is a substring of any of the values."""
+    for value in values:
+        for keyword in keywords:
+            if keyword in value:
+                return True
+    return False
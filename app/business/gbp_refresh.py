@@ -0,0 +1,183 @@
+# app/business/gbp_refresh.py
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Maximum age of each field group before it is refreshed. A refresh asks for the
+# cheapest field tier covering the due groups, so keep each group's age no shorter
+# than that of the groups its tier brings along (see places_fields.FIELD_TIERS).
+FRESHNESS_POLICY = {
+    "hours": timedelta(days=1),
+    "phone": timedelta(days=1),
+    "reviews": timedelta(days=7),
+    "profile": timedelta(days=7),
+    "photos": timedelta(days=30)
+}
+
+# The scheduler runs this many times a day (see cron.yaml); each business refreshes in one slot
+REFRESH_SLOTS_PER_DAY = int(os.environ.get("GBP_REFRESH_SLOTS_PER_DAY", "24"))
+
+# Upper bound on businesses refreshed in one run, to keep a run inside the cron deadline
+MAX_REFRESHES_PER_RUN = int(os.environ.get("GBP_REFRESH_MAX_PER_RUN", "200"))
+
+# Fields overdue by more than this are refreshed in the next run, whatever the slot
+CATCH_UP_AFTER = timedelta(days=1)
+
+
+def refresh_slot(business_id: str, slots: int = REFRESH_SLOTS_PER_DAY) -> int:
+    """Fixed slot of the day for a business, so refreshes spread evenly over the day."""
+    digest = hashlib.sha1(str(business_id).encode("utf-8")).hexdigest()
+    return int(digest[:8], 16) % slots
+
+
+def current_slot(now: datetime, slots: int = REFRESH_SLOTS_PER_DAY) -> int:
+    minute_of_day = now.hour * 60 + now.minute
+    return minute_of_day * slots // (24 * 60)
+
+
+def stale_groups(doc: Dict[str, Any], now: datetime, policy: Dict[str, timedelta] = None,
+                 window: timedelta = timedelta(0)) -> List[str]:
+    """
+    Field groups of a stored GBP document that are due for a refresh.
+
+    Args:
+        doc: Stored GBP document with its field_scraped_at times; groups
+            that were never fetched are always due
+        now: Current time (UTC)
+        policy: Maximum age per group; defaults to FRESHNESS_POLICY
+        window: Groups coming due within this window count as due now
+
+    Returns:
+        list: Names of the due groups
+    """
+    policy = policy or FRESHNESS_POLICY
+    scraped = doc.get("field_scraped_at") or {}
+    due = []
+    for group, max_age in policy.items():
+        scraped_at = scraped.get(group)
+        if scraped_at is None or scraped_at + max_age <= now + window:
+            due.append(group)
+    return due
+
+
+def _overdue(doc: Dict[str, Any], groups: List[str], now: datetime, policy: Dict[str, timedelta]) -> bool:
+    """True if any due group is more than CATCH_UP_AFTER past its freshness limit."""
+    scraped = doc.get("field_scraped_at") or {}
+    for group in groups:
+        scraped_at = scraped.get(group)
+        if scraped_at is None or scraped_at + policy[group] + CATCH_UP_AFTER <= now:
+            return True
+    return False
+
+
+class GBPRefreshScheduler:
+    """
+    Refreshes stored GBP data whose fields are older than the freshness policy.
+
+    Each business is assigned a fixed slot of the day and is only refreshed
+    when a run falls in its slot, which spreads Places quota use across the
+    day instead of refreshing everything at once. Each refresh asks for the
+    cheapest field tier covering the stale groups, so an hours refresh does
+    not pay for reviews and photos.
+    """
+
+    def __init__(self, business_repo=None, scraper=None, policy: Dict[str, timedelta] = None,
+                 slots: int = REFRESH_SLOTS_PER_DAY, max_refreshes: int = MAX_REFRESHES_PER_RUN,
+                 max_workers: int = 4):
+        self.policy = policy or FRESHNESS_POLICY
+        self.slots = slots
+        self.max_refreshes = max_refreshes
+        self.max_workers = max_workers
+        try:
+            if business_repo is None:
+                from ..repositories.business_repository import BusinessRepository
+                business_repo = BusinessRepository()
+            if scraper is None:
+                from .scrapers import GBPScraper
+                scraper = GBPScraper(business_repo=business_repo)
+        except Exception as e:
+            logger.error(f"Failed to initialize GBP refresh scheduler: {str(e)}")
+            raise
+        self.business_repo = business_repo
+        self.scraper = scraper
+
+    def due_refreshes(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Businesses to refresh in this run and the groups due for each.
+
+        Returns:
+            list: [{"business_id", "place_id", "name", "address", "groups"}], at most max_refreshes
+        """
+        now = now or datetime.utcnow()
+        window = timedelta(days=1) / self.slots
+        slot = current_slot(now, self.slots)
+
+        cutoffs = {group: now + window - max_age for group, max_age in self.policy.items()}
+        candidates = self.business_repo.find_stale_gbp_data(cutoffs)
+
+        due = []
+        for doc in candidates:
+            groups = stale_groups(doc, now, self.policy, window)
+            if not groups:
+                continue
+            if refresh_slot(doc["business_id"], self.slots) != slot and not _overdue(doc, groups, now, self.policy):
+                continue
+            due.append({
+                "business_id": doc["business_id"],
+                "place_id": doc.get("place_id"),
+                "name": doc.get("name"),
+                "address": doc.get("address"),
+                "groups": groups
+            })
+            if len(due) >= self.max_refreshes:
+                break
+        return due
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Refresh every business due in the current slot.
+
+        Returns:
+            dict: Counts of due, refreshed, failed and skipped businesses, and refreshes per group
+        """
+        due = self.due_refreshes(now)
+        summary = {"due": len(due), "refreshed": 0, "failed": 0, "skipped": 0,
+                   "groups": {group: 0 for group in self.policy}}
+        if not due:
+            return summary
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gbp-refresh") as executor:
+            for result in executor.map(self._refresh, due):
+                if result.get("skipped"):
+                    summary["skipped"] += 1
+                elif result.get("success"):
+                    summary["refreshed"] += 1
+                    for group in result.get("groups", []):
+                        summary["groups"][group] += 1
+                else:
+                    summary["failed"] += 1
+
+        logger.info(f"GBP refresh run: {summary}")
+        return summary
+
+    def _refresh(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if self.scraper.limiter.suspended:
+            return {"success": False, "skipped": True}
+        try:
+            if item["place_id"]:
+                return self.scraper.refresh_gbp_fields(item["business_id"], item["place_id"], item["groups"])
+            # Documents saved before place_id was stored need a full scrape
+            if item["name"]:
+                return self.scraper.scrape_gbp(item["business_id"], item["name"], item["address"])
+            return {"success": False, "error": "No place_id or name stored"}
+        except Exception as e:
+            logger.error(f"Error refreshing GBP data for {item['business_id']}: {str(e)}")
+            return {"success": False, "error": str(e)}
@@ -0,0 +1,99 @@
+# app/business/http_client.py
+
+import logging
+import random
+import threading
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default per-request timeout in seconds
+DEFAULT_TIMEOUT = 10
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Connection pool size per host; hosts not listed use the default
+DEFAULT_POOL_SIZE = 10
+HOST_POOL_SIZES = {
+    "https://maps.googleapis.com": 20,
+}
+
+USER_AGENT = "SloaneBot/1.0 (+https://sloane.ai)"
+
+
+class JitteredRetry(Retry):
+    """Retry policy whose exponential backoff is spread with random jitter"""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        # "Equal jitter": keep half the backoff, randomize the other half
+        return backoff / 2 + random.uniform(0, backoff / 2) if backoff else 0
+
+
+def create_session(retries: int = 3, backoff_factor: float = 0.5,
+                   pool_sizes: Optional[Dict[str, int]] = None) -> requests.Session:
+    """
+    Create a keep-alive HTTP session with bounded retries.
+
+    Args:
+        retries: Maximum retries per request for connection errors and 429/5xx
+        backoff_factor: Base of the exponential backoff between retries, in seconds
+        pool_sizes: Connection pool size per URL prefix, on top of the default
+
+    Returns:
+        requests.Session: A session that can be shared across threads
+    """
+    retry = JitteredRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+
+    default_adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=DEFAULT_POOL_SIZE, max_retries=retry)
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+
+    for prefix, size in (pool_sizes or HOST_POOL_SIZES).items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=retry))
+
+    return session
+
+
+# Global HTTP session shared by the scrapers in this process
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Get the process-wide pooled HTTP session."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = create_session()
+                logger.info("Created shared HTTP session")
+    return _http_session
+
+
+def close_http_session():
+    """Close the process-wide HTTP session."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
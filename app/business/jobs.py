@@ -0,0 +1,308 @@
+# app/business/jobs.py
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Finished jobs are kept this long for status polling, in seconds
+FINISHED_JOB_TTL = 3600
+
+# Stored jobs (see JobRepository) are kept this long after they are queued, in seconds
+STORED_JOB_TTL = 86400
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many job items are already waiting for a worker"""
+
+
+class Job:
+    """A scrape job made of one or more items processed by the worker pool"""
+
+    def __init__(self, job_id: str, key: str, kind: str, items: List[Dict[str, Any]]):
+        self.job_id = job_id
+        self.key = key
+        self.kind = kind
+        self.items = items
+        self.results: List[Any] = [None] * len(items)
+        self.errors: List[Optional[str]] = [None] * len(items)
+        self.status = JOB_QUEUED
+        self.completed = 0
+        self.failed = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Orders this job's writes to the job store
+        self.store_lock = threading.Lock()
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.utcfromtimestamp(self.created_at + STORED_JOB_TTL)
+
+    @property
+    def total(self) -> int:
+        return len(self.items)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def to_dict(self, include_results: bool = True) -> Dict[str, Any]:
+        """Status and progress of the job, plus per-item results when requested."""
+        data = {
+            "job_id": self.job_id,
+            "type": self.kind,
+            "status": self.status,
+            "progress": {
+                "completed": self.completed,
+                "failed": self.failed,
+                "total": self.total
+            },
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if include_results:
+            data["results"] = [
+                {"item": item, "result": result, "error": error}
+                for item, result, error in zip(self.items, self.results, self.errors)
+            ]
+        return data
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded thread pool and tracks their status.
+
+    Items of a batch job run in parallel on the pool. Submitting a job that
+    is identical to one still queued or running in this process returns the
+    existing job.
+
+    Jobs run on the worker that accepted them. With a store (JobRepository)
+    their status and item results are also written to MongoDB, so a status
+    poll answered by any other worker or instance finds them; a job whose
+    instance shut down mid-run stays "running" there until it expires.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 200, store=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._jobs: Dict[str, Job] = {}
+        self._in_flight: Dict[str, Job] = {}
+        self._pending_items = 0
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, items: List[Dict[str, Any]],
+               run_item: Callable[[Dict[str, Any]], Tuple[Any, Optional[str]]]) -> Tuple[Job, bool]:
+        """
+        Queue a job, or return the identical job already in flight.
+
+        Args:
+            kind: Job type, e.g. "website" or "gbp"
+            items: Parameters for each unit of work
+            run_item: Called on a worker with one item; returns (result, error message or None)
+
+        Returns:
+            tuple: (job, True if an in-flight job was reused)
+
+        Raises:
+            JobQueueFullError: If accepting the job would exceed max_pending queued items
+        """
+        job, deduplicated = self._accept(kind, items)
+        if not deduplicated:
+            for index, item in enumerate(items):
+                self._executor.submit(self._run_item, job, index, item, run_item)
+        return job, deduplicated
+
+    def submit_batch(self, kind: str, items: List[Dict[str, Any]],
+                     run_batch: Callable[[List[Dict[str, Any]]], Iterable[Tuple[int, Any, Optional[str]]]]
+                     ) -> Tuple[Job, bool]:
+        """
+        Queue a job whose items are run together by one call, or return the
+        identical job already in flight.
+
+        For batches that schedule their own items, e.g. GBP scrapes paced by
+        the Places rate limiter. Item results are recorded as they are yielded.
+
+        Args:
+            kind: Job type, e.g. "gbp"
+            items: Parameters for each unit of work
+            run_batch: Called on a worker with all the items; yields
+                (index, result, error message or None) as each item finishes
+
+        Returns:
+            tuple: (job, True if an in-flight job was reused)
+
+        Raises:
+            JobQueueFullError: If accepting the job would exceed max_pending queued items
+        """
+        job, deduplicated = self._accept(kind, items)
+        if not deduplicated:
+            self._executor.submit(self._run_batch, job, run_batch)
+        return job, deduplicated
+
+    def _accept(self, kind: str, items: List[Dict[str, Any]]) -> Tuple[Job, bool]:
+        """Register a new job, or find the identical one in flight; returns (job, reused)."""
+        key = f"{kind}:{json.dumps(items, sort_keys=True, default=str)}"
+
+        with self._lock:
+            self._prune()
+
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                return existing, True
+
+            if self._pending_items + len(items) > self.max_pending:
+                raise JobQueueFullError(f"Too many scrape jobs queued ({self._pending_items})")
+
+            job = Job(uuid.uuid4().hex, key, kind, items)
+            self._jobs[job.job_id] = job
+            self._in_flight[key] = job
+            self._pending_items += len(items)
+
+        if self.store is not None:
+            try:
+                self.store.create_job(job.to_dict(include_results=False), items, job.expires_at)
+            except Exception as e:
+                logger.error(f"Could not store {kind} job {job.job_id}: {str(e)}")
+
+        logger.info(f"Queued {kind} job {job.job_id} with {len(items)} item(s)")
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job accepted by this process."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_status(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Status of a job accepted by this process or, with a store, by any worker.
+
+        Returns:
+            dict: Job.to_dict of the job, or None if it is unknown or expired
+        """
+        job = self.get(job_id)
+        if job is not None:
+            with self._lock:
+                return job.to_dict(include_results)
+        if self.store is None:
+            return None
+        return self.store.get_job(job_id, include_results)
+
+    def _store_status(self, job: Job):
+        """Write a job's current status to the store; the last write always has the latest status."""
+        if self.store is None:
+            return
+        try:
+            with job.store_lock:
+                with self._lock:
+                    status = job.to_dict(include_results=False)
+                self.store.update_job(job.job_id, status)
+        except Exception as e:
+            logger.error(f"Could not store status of {job.kind} job {job.job_id}: {str(e)}")
+
+    def _start(self, job: Job, items: int):
+        """Take items off the pending count and mark the job running if it was queued."""
+        with self._lock:
+            self._pending_items -= items
+            started = job.status == JOB_QUEUED
+            if started:
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+        if started:
+            self._store_status(job)
+
+    def _run_item(self, job: Job, index: int, item: Dict[str, Any], run_item):
+        self._start(job, 1)
+
+        try:
+            result, error = run_item(item)
+        except Exception as e:
+            logger.error(f"Error in {job.kind} job {job.job_id}: {str(e)}")
+            result, error = None, str(e)
+
+        self._finish_item(job, index, result, error)
+
+    def _run_batch(self, job: Job, run_batch):
+        self._start(job, job.total)
+
+        unfinished = set(range(job.total))
+        try:
+            for index, result, error in run_batch(job.items):
+                unfinished.discard(index)
+                self._finish_item(job, index, result, error)
+        except Exception as e:
+            logger.error(f"Error in {job.kind} job {job.job_id}: {str(e)}")
+            for index in sorted(unfinished):
+                self._finish_item(job, index, None, str(e))
+
+    def _finish_item(self, job: Job, index: int, result: Any, error: Optional[str]):
+        """Record one item's outcome and finish the job once every item has one."""
+        if self.store is not None:
+            try:
+                self.store.save_item_result(job.job_id, index, result, error, job.expires_at)
+            except Exception as e:
+                logger.error(f"Could not store result of {job.kind} job {job.job_id}: {str(e)}")
+
+        with self._lock:
+            job.results[index] = result
+            job.errors[index] = error
+            if error:
+                job.failed += 1
+            else:
+                job.completed += 1
+
+            if job.completed + job.failed == job.total:
+                job.status = JOB_FAILED if job.completed == 0 else JOB_COMPLETED
+                job.finished_at = time.time()
+                self._in_flight.pop(job.key, None)
+                logger.info(f"{job.kind} job {job.job_id} finished: {job.completed} ok, {job.failed} failed")
+        self._store_status(job)
+
+    def _prune(self):
+        """Forget finished jobs older than FINISHED_JOB_TTL. Caller holds the lock."""
+        cutoff = time.time() - FINISHED_JOB_TTL
+        expired = [job_id for job_id, job in self._jobs.items() if job.done and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Global job manager for this process
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    Get the process-wide job manager, sized by the SCRAPE_WORKERS environment
+    variable and storing job status in MongoDB.
+    """
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                try:
+                    from ..repositories.job_repository import JobRepository
+                    store = JobRepository()
+                except Exception as e:
+                    logger.error(f"Job status will only be visible to this worker: {str(e)}")
+                    store = None
+                _job_manager = JobManager(max_workers=int(os.environ.get("SCRAPE_WORKERS", "4")), store=store)
+    return _job_manager
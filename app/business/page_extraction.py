@@ -0,0 +1,286 @@
+# app/business/page_extraction.py
+
+import re
+import logging
+from .extraction import PageIndex
+from .parsers import parse_html, get_parser_backend
+from .structured_data import extract_structured_data
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Placeholder used for the about text when only a link to the about page was found
+ABOUT_LINK_PREFIX = "About page available at: "
+
+
+class PageExtractor:
+    """
+    Parses fetched pages and extracts business information from them.
+
+    Kept apart from WebsiteScraper so parser processes can import it
+    without the repositories, Places client and their dependencies.
+    """
+    
+    def __init__(self, parser=None):
+        # HTML parser backend, see parsers.get_parser_backend
+        self.parser = get_parser_backend(parser)
+    
+
+    def extract_page(self, content, encoding, domain):
+        """
+        Parse a fetched page and run every extractor over it
+        
+        Args:
+            content: The raw response body
+            encoding: The charset declared by the server, if any
+            domain: The website domain, used to prefer on-domain emails
+            
+        Returns:
+            dict: Extracted fields
+        """
+        return self._extract_fields(self._index_page(content, encoding), domain)
+    
+    def extract_page_with_links(self, content, encoding, domain):
+        """
+        Parse a fetched page, run every extractor over it and collect its links
+        
+        Returns:
+            tuple: (extracted fields, the page's (href, text) links)
+        """
+        page = self._index_page(content, encoding)
+        return self._extract_fields(page, domain), page.links
+    
+    def _index_page(self, content, encoding):
+        """Parse raw page bytes with the configured backend and index them in a single pass"""
+        return PageIndex(parse_html(content, encoding, self.parser))
+    
+    def _extract_fields(self, page, domain):
+        """
+        Run every extractor over an indexed page
+        
+        Fields found in the page's JSON-LD structured data are taken from it
+        directly and their DOM heuristics are skipped.
+        """
+        structured = extract_structured_data(page.json_ld)
+        
+        return {
+            'title': structured.get('title') or self._get_title(page),
+            'description': structured.get('description') or self._get_meta_description(page),
+            'services': structured.get('services') or self._extract_services(page),
+            'contact_info': self._extract_contact_info(page, domain, structured),
+            'hours': structured.get('hours') or self._extract_hours(page),
+            'faq': structured.get('faq') or self._extract_faq(page),
+            'about': self._extract_about(page),
+            'raw_text': self._extract_clean_text(page)
+        }
+    
+    def _get_title(self, page):
+        """Extract the website title"""
+        return page.title.text.strip() if page.title else ""
+    
+    def _get_meta_description(self, page):
+        """Extract meta description"""
+        meta = page.meta_description
+        return meta['content'].strip() if meta and 'content' in meta.attrs else ""
+    
+    def _extract_services(self, page):
+        """Extract services offered by the business"""
+        services = []
+        
+        # Look for common service indicators
+        for section in page.by_class['services']:
+            headings = section.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+            for heading in headings:
+                services.append(heading.text.strip())
+                
+        # If no structured services found, try to extract from list items
+        if not services:
+            for ul in page.by_class['service_lists']:
+                items = ul.find_all('li')
+                for item in items:
+                    services.append(item.text.strip())
+        
+        return services
+    
+    def _extract_contact_info(self, page, domain, structured=None):
+        """Extract contact information, preferring structured data when present"""
+        structured = structured or {}
+        contact_info = {
+            'email': structured.get('email') or self._extract_email(page, domain),
+            'phone': structured.get('phone') or self._extract_phone(page),
+            'address': structured.get('address') or self._extract_address(page)
+        }
+        return contact_info
+    
+    def _extract_email(self, page, domain):
+        """Extract email addresses"""
+        # First look for mailto links
+        emails = [link['href'].replace('mailto:', '').strip() for link in page.mailto_links]
+        
+        # If no emails found in links, try regex on text
+        if not emails:
+            # Look for domain-specific emails first for better quality
+            email_pattern = rf'\b[A-Za-z0-9._%+-]+@{re.escape(domain)}\b'
+            domain_emails = re.findall(email_pattern, page.text)
+            
+            if domain_emails:
+                emails = domain_emails
+            else:
+                # Fall back to any email pattern
+                general_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+                emails = re.findall(general_pattern, page.text)
+        
+        return emails
+    
+    def _extract_phone(self, page):
+        """Extract phone numbers"""
+        # Look for tel links first
+        phones = [link['href'].replace('tel:', '').strip() for link in page.tel_links]
+        
+        # If no phones found in links, try regex
+        if not phones:
+            # US phone pattern - can be expanded for international
+            patterns = [
+                r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890 or 123-456-7890
+                r'\+\d{1,3}\s?\(?\d{1,4}\)?[-.\s]?\d{3}[-.\s]?\d{4}'  # +1 (123) 456-7890
+            ]
+            
+            for pattern in patterns:
+                found_phones = re.findall(pattern, page.text)
+                if found_phones:
+                    phones.extend(found_phones)
+        
+        return phones
+    
+    def _extract_address(self, page):
+        """Extract physical address"""
+        address = ""
+        
+        # Look for address in structured data
+        address_elements = page.itemtype("http://schema.org/PostalAddress")
+        if address_elements:
+            address = " ".join(elem.text.strip() for elem in address_elements)
+        
+        # Look for address in common containers
+        if not address:
+            address_containers = page.by_class['address']
+            if address_containers:
+                address = address_containers[0].text.strip()
+        
+        # Look for footer address
+        if not address:
+            if page.footer:
+                # Common US address pattern
+                address_pattern = r'\d+\s+[A-Za-z0-9\s,.-]+\s+[A-Za-z]{2}\s+\d{5}'
+                matches = re.search(address_pattern, page.footer.text)
+                if matches:
+                    address = matches.group(0)
+        
+        return address
+    
+    def _extract_hours(self, page):
+        """Extract business hours"""
+        hours = {}
+        
+        # Look for schema.org structured data
+        hours_elements = page.itemtype("http://schema.org/OpeningHoursSpecification")
+        if hours_elements:
+            for elem in hours_elements:
+                day = elem.find(itemprop="dayOfWeek")
+                opens = elem.find(itemprop="opens")
+                closes = elem.find(itemprop="closes")
+                
+                if day and opens and closes:
+                    day_text = day.text.strip()
+                    hours[day_text] = {
+                        "opens": opens.text.strip(),
+                        "closes": closes.text.strip()
+                    }
+        
+        # Look for hours in text
+        if not hours:
+            hours_section = page.by_class['hours']
+            
+            if hours_section:
+                section_text = hours_section[0].text.lower()
+                days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+                for day in days:
+                    pattern = rf'{day}\s*:?\s*(\d+(?::\d+)?\s*(?:am|pm)?\s*-\s*\d+(?::\d+)?\s*(?:am|pm)?)'
+                    matches = re.search(pattern, section_text)
+                    if matches:
+                        hours[day] = matches.group(1)
+        
+        return hours
+    
+    def _extract_faq(self, page):
+        """Extract FAQ content"""
+        faqs = []
+        
+        # Look for schema.org structured FAQs
+        faq_elements = page.itemtype("http://schema.org/FAQPage")
+        if faq_elements:
+            for elem in faq_elements:
+                questions = elem.find_all(itemtype="http://schema.org/Question")
+                for q in questions:
+                    question = q.find(itemprop="name")
+                    answer = q.find(itemprop="text")
+                    
+                    if question and answer:
+                        faqs.append({
+                            "question": question.text.strip(),
+                            "answer": answer.text.strip()
+                        })
+        
+        # If no structured FAQs, look for FAQ sections
+        if not faqs:
+            faq_section = page.by_class['faq']
+            
+            if faq_section:
+                # Look for question-answer pairs
+                questions = faq_section[0].find_all(['h3', 'h4', 'strong', 'dt'])
+                
+                for q in questions:
+                    # The answer is likely in the next sibling
+                    answer = q.find_next(['p', 'div', 'dd'])
+                    if answer:
+                        faqs.append({
+                            "question": q.text.strip(),
+                            "answer": answer.text.strip()
+                        })
+        
+        return faqs
+    
+    def _extract_about(self, page):
+        """Extract 'About us' content"""
+        about_text = ""
+        
+        # Look for about sections
+        about_sections = page.by_id['about'] or page.by_class['about']
+        
+        if about_sections:
+            paragraphs = about_sections[0].find_all('p')
+            about_text = "\n".join(p.text.strip() for p in paragraphs)
+        
+        # If still empty, try looking for about pages
+        if not about_text:
+            if page.about_links:
+                # Point at the about page; a crawl replaces this with its content
+                about_text = ABOUT_LINK_PREFIX + page.about_links[0].get('href', '')
+        
+        return about_text
+    
+    def _extract_clean_text(self, page):
+        """Extract clean text content from the website"""
+        # Script, style, header, footer and nav text is already left out by the index
+        text = page.clean_text
+        
+        # Break into lines and remove leading and trailing space on each
+        lines = (line.strip() for line in text.splitlines())
+        
+        # Break multi-headlines into a line each
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        
+        # Drop blank lines
+        text = '\n'.join(chunk for chunk in chunks if chunk)
+        
+        return text
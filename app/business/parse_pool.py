@@ -0,0 +1,199 @@
+# app/business/parse_pool.py
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Parser processes per web worker; 0 parses in-process. One core is left for the web worker itself.
+PARSE_WORKERS = int(os.environ.get("SCRAPER_PARSE_WORKERS", str(min(4, max(0, (os.cpu_count() or 1) - 1)))))
+
+# Seconds a single page may take to parse and extract before its process is killed
+PARSE_TIMEOUT = float(os.environ.get("SCRAPER_PARSE_TIMEOUT", "15"))
+
+# Pages a parser process handles before it is replaced, to bound memory growth
+MAX_TASKS_PER_WORKER = 500
+
+# "spawn" starts clean interpreters; forking a threaded web worker is not safe
+START_METHOD = os.environ.get("SCRAPER_PARSE_START_METHOD", "spawn")
+
+
+class ParseTimeoutError(Exception):
+    """Raised when a page takes longer than the parse timeout"""
+
+
+class ParseError(Exception):
+    """Raised when parsing fails inside a parser process"""
+
+
+def _worker_main(conn):
+    """Parser process loop: receive raw page bytes, send back the extracted fields and links."""
+    # Only the extraction code; the scrapers module pulls in the repositories and Places client
+    from .page_extraction import PageExtractor
+    extractors = {}
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+
+        content, encoding, domain, parser = task
+        try:
+            if parser not in extractors:
+                extractors[parser] = PageExtractor(parser)
+            conn.send(("ok", extractors[parser].extract_page_with_links(content, encoding, domain)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+
+
+class _ParserProcess:
+    """One parser process and the pipe used to talk to it"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        # Under gevent the pipe is a patched socketpair; keep both ends blocking
+        os.set_blocking(self.conn.fileno(), True)
+        os.set_blocking(child_conn.fileno(), True)
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ParsePool:
+    """
+    Bounded pool of parser processes for CPU-bound HTML parsing and extraction.
+
+    Parsing holds the GIL, so a large page parsed in a web worker stalls
+    every other request in it. Pages are sent to separate processes as raw
+    bytes and come back as the compact extracted dict. Each process handles
+    one page at a time, so a page that overruns the timeout is dealt with by
+    killing just its process; other pages in flight are unaffected.
+    (concurrent.futures.ProcessPoolExecutor cannot cancel a running task
+    without breaking the whole pool.) Processes start on first use.
+    """
+
+    def __init__(self, max_workers: int = PARSE_WORKERS, timeout: float = PARSE_TIMEOUT,
+                 start_method: str = START_METHOD):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: "queue.LifoQueue[_ParserProcess]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self._processes: List[_ParserProcess] = []
+        self._closed = False
+
+    def extract(self, content: bytes, encoding: Optional[str], domain: str,
+                parser: Optional[str] = None) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+        """
+        Parse a page in a parser process and run every extractor over it.
+
+        Args:
+            content: The raw response body
+            encoding: The charset declared by the server, if any
+            domain: The website domain, used to prefer on-domain emails
+            parser: HTML parser backend, see parsers.get_parser_backend
+
+        Returns:
+            tuple: (extracted fields, the page's (href, text) links)
+
+        Raises:
+            ParseTimeoutError: If the page took longer than the timeout; its process is killed
+            ParseError: If parsing failed or the parser process died
+        """
+        with self._slots:
+            worker = self._checkout()
+            try:
+                worker.conn.send((content, encoding, domain, parser))
+                # wait() goes through selectors, so it yields to other greenlets under gevent
+                if not wait([worker.conn], self.timeout):
+                    raise ParseTimeoutError(f"Parsing took longer than {self.timeout:g}s")
+                status, payload = worker.conn.recv()
+            except ParseTimeoutError:
+                logger.warning(f"Killing parser process {worker.process.pid} after {self.timeout:g}s")
+                self._forget(worker)
+                worker.kill()
+                raise
+            except (EOFError, OSError) as e:
+                self._forget(worker)
+                worker.kill()
+                raise ParseError(f"Parser process died: {str(e)}")
+
+            worker.tasks += 1
+            if worker.tasks >= MAX_TASKS_PER_WORKER:
+                self._forget(worker)
+                worker.stop()
+            else:
+                self._idle.put(worker)
+
+        if status != "ok":
+            raise ParseError(payload)
+        return payload
+
+    def shutdown(self):
+        """Stop every parser process."""
+        with self._lock:
+            self._closed = True
+            processes, self._processes = self._processes, []
+        for worker in processes:
+            worker.stop()
+
+    def _checkout(self) -> _ParserProcess:
+        """An idle parser process, or a new one; the caller holds a slot."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise ParseError("Parse pool is shut down")
+            worker = _ParserProcess(self._context)
+            self._processes.append(worker)
+            return worker
+
+    def _forget(self, worker: _ParserProcess):
+        with self._lock:
+            if worker in self._processes:
+                self._processes.remove(worker)
+
+
+# Global parse pool for this process
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """Get the process-wide parse pool, or None when SCRAPER_PARSE_WORKERS is 0."""
+    global _parse_pool
+    if PARSE_WORKERS <= 0:
+        return None
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                _parse_pool = ParsePool()
+    return _parse_pool
@@ -0,0 +1,87 @@
+# app/business/parsers.py
+
+import os
+import re
+import logging
+from typing import Optional, Mapping
+from bs4 import BeautifulSoup
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Supported BeautifulSoup tree builders, fastest first
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+# Always available, used when lxml is missing or fails on a document
+FALLBACK_PARSER = "html.parser"
+
+_CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+
+
+def _lxml_available() -> bool:
+    """Check whether the lxml package can be imported."""
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_parser_backend(name: Optional[str] = None) -> str:
+    """
+    Resolve the HTML parser backend to use.
+
+    Args:
+        name: Requested backend; defaults to the SCRAPER_PARSER environment variable
+
+    Returns:
+        The name of an installed backend
+    """
+    backend = (name or os.environ.get("SCRAPER_PARSER", "lxml")).strip().lower()
+
+    if backend not in PARSER_BACKENDS:
+        logger.warning(f"Unknown parser backend '{backend}', using {FALLBACK_PARSER}")
+        return FALLBACK_PARSER
+
+    if backend == "lxml" and not _lxml_available():
+        logger.warning(f"lxml is not installed, using {FALLBACK_PARSER}")
+        return FALLBACK_PARSER
+
+    return backend
+
+
+def declared_encoding(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    Get the charset declared in the Content-Type header, if any.
+
+    Unlike response.encoding this does not assume ISO-8859-1 for text/*
+    responses, so an undeclared charset is left to the parser, which checks
+    the page's own <meta charset> first.
+    """
+    content_type = headers.get("Content-Type") or headers.get("content-type") or ""
+    match = _CHARSET_PATTERN.search(content_type)
+    return match.group(1).lower() if match else None
+
+
+def parse_html(content: bytes, encoding: Optional[str] = None, backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse raw page bytes into a BeautifulSoup tree.
+
+    Args:
+        content: The undecoded response body
+        encoding: The declared charset, if known
+        backend: Parser backend name; see get_parser_backend
+
+    Returns:
+        BeautifulSoup: The parsed document
+    """
+    backend = get_parser_backend(backend)
+
+    try:
+        return BeautifulSoup(content, backend, from_encoding=encoding)
+    except Exception as e:
+        if backend == FALLBACK_PARSER:
+            raise
+        logger.warning(f"{backend} failed to parse document, retrying with {FALLBACK_PARSER}: {str(e)}")
+        return BeautifulSoup(content, FALLBACK_PARSER, from_encoding=encoding)
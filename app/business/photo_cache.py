@@ -0,0 +1,206 @@
+# app/business/photo_cache.py
+
+import hashlib
+import io
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+from .jobs import get_job_manager, JobQueueFullError
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pillow is optional: without it photos are cached at full size only
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Photos cached per place, in Places order
+PHOTO_CACHE_COUNT = int(os.environ.get("GBP_PHOTO_CACHE_COUNT", "5"))
+
+# Width requested from the Places Photo endpoint for the cached original
+PHOTO_MAX_WIDTH = 1600
+
+# Width of the generated thumbnail
+THUMBNAIL_WIDTH = 400
+
+# Cached photos never change under a digest, so clients may keep them for a year
+PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Route serving cached photos, see business_data.get_cached_photo
+PHOTO_URL_PREFIX = "/api/business/photos/"
+
+# Route resolving a photo reference to its cached photo, see business_data.get_photo_by_reference
+PHOTO_REF_URL_PREFIX = "/api/business/photos/ref/"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def photo_url(digest: str) -> str:
+    return f"{PHOTO_URL_PREFIX}{digest}"
+
+
+def photo_ref_url(photo_reference: str) -> str:
+    """Key-free URL for a photo that may not be cached yet."""
+    return f"{PHOTO_REF_URL_PREFIX}{quote(photo_reference, safe='')}"
+
+
+def make_thumbnail(data: bytes, width: int = THUMBNAIL_WIDTH) -> Optional[Tuple[bytes, str]]:
+    """
+    Resize an image to the given width, keeping its aspect ratio.
+
+    Returns:
+        tuple: (JPEG bytes, content type), or None if Pillow is missing or the
+            image is already no wider than the thumbnail
+    """
+    if Image is None:
+        return None
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width <= width:
+            return None
+        height = max(1, round(image.height * width / image.width))
+        thumbnail = image.convert("RGB").resize((width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        thumbnail.save(output, format="JPEG", quality=85, optimize=True)
+        return output.getvalue(), "image/jpeg"
+
+
+class PhotoCacher:
+    """
+    Copies the first few photos of a place into our own photo store.
+
+    Stored GBP photo entries start out pointing at our photo-reference
+    route, which would otherwise resolve each reference on first view. This
+    job downloads each photo once, keeps it and a thumbnail under their
+    sha256 digests, and rewrites the stored entries to the cached photo URLs.
+    Entries stored before that route existed still carry the Places Photo URL
+    with our API key and are rewritten to it.
+    """
+
+    def __init__(self, scraper=None, photo_repo=None, business_repo=None, count: int = PHOTO_CACHE_COUNT):
+        self.count = count
+        try:
+            if business_repo is None:
+                from ..repositories.business_repository import BusinessRepository
+                business_repo = BusinessRepository()
+            if photo_repo is None:
+                from ..repositories.photo_repository import PhotoRepository
+                photo_repo = PhotoRepository()
+            if scraper is None:
+                from .scrapers import GBPScraper
+                scraper = GBPScraper(business_repo=business_repo)
+        except Exception as e:
+            logger.error(f"Failed to initialize photo cacher: {str(e)}")
+            raise
+        self.scraper = scraper
+        self.photo_repo = photo_repo
+        self.business_repo = business_repo
+
+    def cache_photos(self, business_id: str) -> Dict[str, Any]:
+        """
+        Cache the stored GBP photos of a business and point them at our endpoint.
+
+        Returns:
+            dict: Counts of photos cached, already cached and failed
+        """
+        documents = self.business_repo.get_gbp_data(business_id)
+        if not documents:
+            return {"success": False, "error": "No GBP data stored for business"}
+
+        photos = [dict(photo) for photo in documents[0].get("photos") or []]
+        summary = {"success": True, "cached": 0, "already_cached": 0, "failed": 0}
+        rewritten = False
+
+        for photo in photos[:self.count]:
+            if photo.get("content_hash") or not photo.get("photo_reference"):
+                summary["already_cached"] += 1
+                continue
+            try:
+                hashes, downloaded = self._cache_photo(photo["photo_reference"])
+            except Exception as e:
+                logger.error(f"Error caching photo for {business_id}: {str(e)}")
+                summary["failed"] += 1
+                keyless_url = photo_ref_url(photo["photo_reference"])
+                if photo.get("url") != keyless_url:
+                    photo["url"] = keyless_url
+                    rewritten = True
+                continue
+
+            photo["content_hash"] = hashes["content_hash"]
+            photo["url"] = photo_url(hashes["content_hash"])
+            photo["thumbnail_url"] = photo_url(hashes.get("thumbnail_hash") or hashes["content_hash"])
+            summary["cached" if downloaded else "already_cached"] += 1
+            rewritten = True
+
+        if rewritten:
+            self.business_repo.update_gbp_photos(business_id, photos)
+        logger.info(f"Photo cache for {business_id}: {summary}")
+        return summary
+
+    def cache_reference(self, photo_reference: str) -> Optional[Dict[str, str]]:
+        """
+        Digests for a photo reference of stored GBP data, downloading the photo on first use.
+
+        Returns:
+            dict: content_hash and, if one was made, thumbnail_hash; None if no
+                stored GBP data has the reference
+        """
+        known = self.photo_repo.get_photo_ref(photo_reference)
+        if known and self.photo_repo.has_photo(known["content_hash"]):
+            return known
+        # Only references we stored ourselves, so the route cannot be used to bill arbitrary downloads
+        if not self.business_repo.has_photo_reference(photo_reference):
+            return None
+        hashes, _ = self._cache_photo(photo_reference)
+        return hashes
+
+    def _cache_photo(self, photo_reference: str) -> Tuple[Dict[str, str], bool]:
+        """Digests for one photo, downloading it only if its reference is new; returns (hashes, downloaded)."""
+        known = self.photo_repo.get_photo_ref(photo_reference)
+        if known and self.photo_repo.has_photo(known["content_hash"]):
+            return known, False
+
+        data, content_type = self.scraper.fetch_photo(photo_reference, PHOTO_MAX_WIDTH)
+        hashes = {"content_hash": content_hash(data)}
+        self.photo_repo.save_photo(hashes["content_hash"], data, content_type)
+
+        try:
+            thumbnail = make_thumbnail(data)
+        except Exception as e:
+            logger.error(f"Could not create thumbnail: {str(e)}")
+            thumbnail = None
+        if thumbnail:
+            hashes["thumbnail_hash"] = content_hash(thumbnail[0])
+            self.photo_repo.save_photo(hashes["thumbnail_hash"], *thumbnail)
+
+        self.photo_repo.save_photo_ref(photo_reference, hashes)
+        return hashes, True
+
+
+def _run_photo_job_item(item):
+    """Cache one business's photos for a job; returns (result, error)"""
+    # The worker's shared repositories and scraper; building them per job
+    # cost a Secret Manager lookup and a MongoClient each time
+    from ..api.services import get_services
+    result = get_services().photo_cacher.cache_photos(item["business_id"])
+    return result, result.get("error")
+
+
+def queue_photo_caching(business_id: str) -> Optional[str]:
+    """
+    Cache a business's photos in the background.
+
+    Returns:
+        str: The job id, or None if the job could not be queued
+    """
+    try:
+        job, _ = get_job_manager().submit("gbp_photos", [{"business_id": business_id}], _run_photo_job_item)
+        return job.job_id
+    except JobQueueFullError as e:
+        logger.warning(f"Photo caching for {business_id} not queued: {str(e)}")
+        return None
@@ -0,0 +1,180 @@
+# app/business/places_cache.py
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# place_ids are stable, so query lookups are kept much longer than details
+QUERY_TTL_SECONDS = int(os.environ.get("PLACES_QUERY_CACHE_TTL", str(30 * 24 * 3600)))
+DETAILS_TTL_SECONDS = int(os.environ.get("PLACES_DETAILS_CACHE_TTL", str(24 * 3600)))
+
+# Entries kept in process memory per level
+MEMORY_CACHE_SIZE = 1000
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(business_name: str, location: Optional[str] = None) -> str:
+    """Normalize a business search so trivially different spellings share a cache entry."""
+    query = f"{business_name} {location or ''}".lower()
+    query = _PUNCTUATION.sub(" ", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PlacesCache:
+    """
+    Two-level cache for Google Places API responses.
+
+    Level one maps a normalized search query to a place_id (long TTL); level
+    two maps a place_id plus the requested field set to the Place Details
+    result (shorter TTL). Each level is checked in process memory first and
+    then in MongoDB, and Mongo hits are copied back into memory. Mongo errors
+    are treated as misses so the cache never fails a scrape.
+    """
+
+    def __init__(self, repository=None, use_mongo: bool = True,
+                 query_ttl: int = QUERY_TTL_SECONDS, details_ttl: int = DETAILS_TTL_SECONDS,
+                 max_entries: int = MEMORY_CACHE_SIZE):
+        self.query_ttl = query_ttl
+        self.details_ttl = details_ttl
+        self._queries = TTLCache(max_entries, query_ttl)
+        self._details = TTLCache(max_entries, details_ttl)
+        self._repository = repository
+        self._use_mongo = use_mongo
+        self._repository_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            level: {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+            for level in ("query", "details")
+        }
+
+    def get_place_id(self, query: str) -> Optional[str]:
+        """Cached place_id for a normalized query, or None."""
+        return self._get("query", self._queries, self._query_key(query))
+
+    def set_place_id(self, query: str, place_id: str):
+        self._set("query", self._queries, self._query_key(query), place_id, self.query_ttl)
+
+    def get_details(self, place_id: str, fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """Cached Place Details result for a place_id and field set, or None."""
+        return self._get("details", self._details, self._details_key(place_id, fields))
+
+    def set_details(self, place_id: str, fields: Iterable[str], result: Dict[str, Any]):
+        self._set("details", self._details, self._details_key(place_id, fields), result, self.details_ttl)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters per level, with hit rates and in-memory sizes."""
+        with self._metrics_lock:
+            metrics = {level: dict(counts) for level, counts in self._metrics.items()}
+
+        for level, counts in metrics.items():
+            lookups = counts["memory_hits"] + counts["mongo_hits"] + counts["misses"]
+            hits = counts["memory_hits"] + counts["mongo_hits"]
+            counts["hit_rate"] = round(hits / lookups, 4) if lookups else None
+        metrics["query"]["memory_entries"] = len(self._queries)
+        metrics["details"]["memory_entries"] = len(self._details)
+        return metrics
+
+    def _get(self, level: str, memory: TTLCache, key: str) -> Optional[Any]:
+        value = memory.get(key)
+        if value is not None:
+            self._count(level, "memory_hits")
+            return value
+
+        repository = self._get_repository()
+        value = repository.get_entry(key) if repository else None
+        if value is not None:
+            memory.set(key, value)
+            self._count(level, "mongo_hits")
+            return value
+
+        self._count(level, "misses")
+        return None
+
+    def _set(self, level: str, memory: TTLCache, key: str, value: Any, ttl: int):
+        memory.set(key, value)
+        repository = self._get_repository()
+        if repository:
+            repository.set_entry(key, level, value, ttl)
+
+    def _count(self, level: str, counter: str):
+        with self._metrics_lock:
+            self._metrics[level][counter] += 1
+
+    def _get_repository(self):
+        """Create the Mongo tier on first use; disable it if that fails."""
+        if self._repository is None and self._use_mongo:
+            with self._repository_lock:
+                if self._repository is None and self._use_mongo:
+                    try:
+                        from ..repositories.places_cache_repository import PlacesCacheRepository
+                        self._repository = PlacesCacheRepository()
+                    except Exception as e:
+                        logger.error(f"Places cache running without MongoDB tier: {str(e)}")
+                        self._use_mongo = False
+        return self._repository
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return "query:" + hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _details_key(place_id: str, fields: Iterable[str]) -> str:
+        return f"details:{place_id}:{','.join(sorted(fields))}"
+
+
+# Global Places cache for this process
+_places_cache = None
+_places_cache_lock = threading.Lock()
+
+
+def get_places_cache() -> PlacesCache:
+    """Get the process-wide Places cache."""
+    global _places_cache
+    if _places_cache is None:
+        with _places_cache_lock:
+            if _places_cache is None:
+                _places_cache = PlacesCache()
+    return _places_cache
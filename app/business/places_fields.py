@@ -0,0 +1,102 @@
+# app/business/places_fields.py
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stored GBP fields grouped by how quickly they go stale: group -> (Places fields, stored fields)
+GBP_FIELD_GROUPS = {
+    "hours": (["opening_hours"], ["opening_hours"]),
+    "phone": (["formatted_phone_number"], ["phone"]),
+    "reviews": (["rating", "user_ratings_total", "reviews"], ["rating", "total_ratings", "reviews"]),
+    "profile": (["name", "formatted_address", "website", "types"], ["name", "address", "website", "types"]),
+    "photos": (["photos"], ["photos"])
+}
+
+# Named Place Details field masks, cheapest first. Each tier includes the one before it.
+# Reviews are the largest part of a response and are billed at a higher SKU; new photo
+# references also cost Photo API downloads for the cache, so only "full" asks for photos.
+FIELD_TIERS = {
+    "hours": ["hours", "phone"],
+    "basic": ["hours", "phone", "profile"],
+    "reviews": ["hours", "phone", "profile", "reviews"],
+    "full": ["hours", "phone", "profile", "reviews", "photos"]
+}
+
+DEFAULT_TIER = "full"
+
+
+def tier_groups(tier: str) -> List[str]:
+    """Field groups covered by a tier."""
+    if tier not in FIELD_TIERS:
+        raise ValueError(f"Unknown Places field tier: {tier}")
+    return FIELD_TIERS[tier]
+
+
+def tier_fields(tier: str) -> List[str]:
+    """Place Details fields requested for a tier."""
+    return [field for group in tier_groups(tier) for field in GBP_FIELD_GROUPS[group][0]]
+
+
+def cheapest_tier(groups: Iterable[str]) -> str:
+    """Cheapest tier that covers all the given field groups."""
+    wanted = set(groups)
+    for tier, covered in FIELD_TIERS.items():
+        if wanted <= set(covered):
+            return tier
+    raise ValueError(f"No Places field tier covers: {', '.join(sorted(wanted))}")
+
+
+class PlacesRequestMetrics:
+    """Thread-safe response size and latency counters per Places request kind (tier or search)"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, response_bytes: int, seconds: float):
+        with self._lock:
+            stats = self._stats.setdefault(kind, {
+                "requests": 0, "total_bytes": 0, "max_bytes": 0,
+                "total_seconds": 0.0, "max_seconds": 0.0
+            })
+            stats["requests"] += 1
+            stats["total_bytes"] += response_bytes
+            stats["max_bytes"] = max(stats["max_bytes"], response_bytes)
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Request count, average and max response size and latency per kind."""
+        with self._lock:
+            stats = {kind: dict(values) for kind, values in self._stats.items()}
+
+        return {
+            kind: {
+                "requests": values["requests"],
+                "avg_bytes": round(values["total_bytes"] / values["requests"]),
+                "max_bytes": values["max_bytes"],
+                "avg_latency_ms": round(values["total_seconds"] * 1000 / values["requests"], 1),
+                "max_latency_ms": round(values["max_seconds"] * 1000, 1)
+            }
+            for kind, values in stats.items()
+        }
+
+
+# Global Places request metrics for this process
+_request_metrics = None
+_request_metrics_lock = threading.Lock()
+
+
+def get_places_request_metrics() -> PlacesRequestMetrics:
+    """Get the process-wide Places request metrics."""
+    global _request_metrics
+    if _request_metrics is None:
+        with _request_metrics_lock:
+            if _request_metrics is None:
+                _request_metrics = PlacesRequestMetrics()
+    return _request_metrics
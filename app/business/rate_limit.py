@@ -0,0 +1,115 @@
+# app/business/rate_limit.py
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Places API requests per second allowed by our quota, and the burst on top of
+# it, for the whole project
+PLACES_QPS = float(os.environ.get("PLACES_QPS", "10"))
+PLACES_BURST = int(os.environ.get("PLACES_BURST", "10"))
+
+# The limiter is a token bucket in each process, not shared between gunicorn
+# workers or App Engine instances, so each process gets an equal share of the
+# quota: PLACES_INSTANCES is the most instances expected to run at once (set
+# it with automatic_scaling.max_instances in app.yaml), times GUNICORN_WORKERS
+# processes each. Running more processes than that can exceed the quota; the
+# OVER_QUERY_LIMIT backoff below then pauses each process that hits it.
+PLACES_INSTANCES = max(1, int(os.environ.get("PLACES_INSTANCES", "1")))
+PLACES_PROCESSES = PLACES_INSTANCES * max(1, int(os.environ.get("GUNICORN_WORKERS", "1")))
+
+# How long Places calls are refused after the API reports OVER_QUERY_LIMIT, in seconds
+QUOTA_BACKOFF_SECONDS = float(os.environ.get("PLACES_QUOTA_BACKOFF", "60"))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one. The bucket can also be suspended, e.g. after the
+    upstream API reports its quota is spent, in which case acquire() fails
+    immediately instead of waiting.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._suspended_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for a refill if needed.
+
+        Args:
+            timeout: Longest time to wait in seconds; None waits as long as it takes
+
+        Returns:
+            bool: True if a token was taken, False on timeout or while suspended
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._suspended_until:
+                    return False
+
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def suspend(self, seconds: float):
+        """Refuse tokens for the next `seconds` and drop any saved-up burst."""
+        with self._lock:
+            self._suspended_until = max(self._suspended_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+        logger.warning(f"Rate limiter suspended for {seconds:.0f}s")
+
+    @property
+    def suspended(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._suspended_until
+
+
+# Global Places API limiter for this process
+_places_limiter = None
+_places_limiter_lock = threading.Lock()
+
+
+def get_places_rate_limiter() -> TokenBucket:
+    """
+    Get the process-wide Places API limiter: this process's share of
+    PLACES_QPS and PLACES_BURST, see PLACES_PROCESSES.
+    """
+    global _places_limiter
+    if _places_limiter is None:
+        with _places_limiter_lock:
+            if _places_limiter is None:
+                _places_limiter = TokenBucket(PLACES_QPS / PLACES_PROCESSES,
+                                              max(1, PLACES_BURST // PLACES_PROCESSES))
+                logger.info(f"Places API limit for this process: {_places_limiter.rate:g} requests/s "
+                            f"({PLACES_PROCESSES} processes share {PLACES_QPS:g}/s)")
+    return _places_limiter
@@ -0,0 +1,49 @@
+# app/business/revalidation.py
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Markup that changes between identical page loads (nonces, tracking ids, build hashes)
+_VOLATILE_MARKUP = re.compile(rb"<script\b.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(rb"\s+")
+
+
+def content_fingerprint(content: bytes) -> str:
+    """
+    Hash a page body after normalizing away volatile markup.
+
+    Scripts, styles and comments are dropped and whitespace is collapsed, so
+    a page whose visible content is unchanged hashes the same even when the
+    server injects a fresh nonce or analytics snippet on every request.
+    """
+    normalized = _VOLATILE_MARKUP.sub(b"", content or b"")
+    normalized = _WHITESPACE.sub(b" ", normalized).strip()
+    return hashlib.sha256(normalized).hexdigest()
+
+
+def conditional_headers(validators: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def section_hashes(data: Dict[str, Any], sections: Iterable[str]) -> Dict[str, str]:
+    """Hash each named section of a document so later versions can be diffed."""
+    hashes = {}
+    for section in sections:
+        encoded = json.dumps(data.get(section), sort_keys=True, default=str).encode("utf-8")
+        hashes[section] = hashlib.sha256(encoded).hexdigest()
+    return hashes
+
+
+def changed_sections(old_hashes: Optional[Dict[str, str]], new_hashes: Dict[str, str]) -> List[str]:
+    """Names of the sections whose hash differs from the stored one."""
+    old_hashes = old_hashes or {}
+    return [section for section, digest in new_hashes.items() if old_hashes.get(section) != digest]
@@ -1,41 +1,98 @@
 # ~/Desktop/clean-code/app/business/scrapers.py
 
 import requests
-from bs4 import BeautifulSoup
 import json
-import re
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
+from .page_extraction import PageExtractor, ABOUT_LINK_PREFIX
+from .crawler import SiteCrawler
+from .places_cache import get_places_cache, normalize_query
+from .rate_limit import get_places_rate_limiter, QUOTA_BACKOFF_SECONDS
+from .places_fields import GBP_FIELD_GROUPS, DEFAULT_TIER, tier_groups, tier_fields, cheapest_tier, get_places_request_metrics
+from .download import fetch_page, UnsupportedContentError, CHUNK_SIZE
+from .photo_cache import photo_ref_url, queue_photo_caching
+from .parse_pool import get_parse_pool
+from .http_client import get_http_session, DEFAULT_TIMEOUT
+from .revalidation import content_fingerprint, conditional_headers, section_hashes, changed_sections
 from ..repositories.business_repository import BusinessRepository
 from ..repositories.training_repository import TrainingRepository
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
-from ..utils.secrets import get_secret
 import os
-import pandas as pd
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from google.cloud import secretmanager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class WebsiteScraper:
+# Google Places web service endpoint
+PLACES_API_BASE_URL = "https://maps.googleapis.com/maps/api/place"
+
+# Places status returned once the daily or per-second quota is spent
+PLACES_OVER_QUERY_LIMIT = "OVER_QUERY_LIMIT"
+
+# Largest photo downloaded from the Places Photo endpoint
+MAX_PHOTO_BYTES = 5 * 1024 * 1024
+
+# Concurrent scrapes in a GBP batch; the rate limiter, not this, sets throughput
+BATCH_MAX_WORKERS = 8
+
+
+class PlacesQuotaExceededError(Exception):
+    """Raised when Places API calls are paused because the quota ran out"""
+
+
+# Extracted website fields tracked for change detection
+WEBSITE_SECTIONS = ('title', 'description', 'services', 'contact_info', 'hours', 'faq', 'about', 'raw_text', 'pages')
+
+
+def _page_state(url, kind, etag, last_modified, content):
+    """Validators and content hash stored for one fetched page"""
+    return {
+        'url': url,
+        'kind': kind,
+        'etag': etag,
+        'last_modified': last_modified,
+        'content_hash': content_fingerprint(content)
+    }
+
+
+def _merge_unique(first, second):
+    """Concatenate two lists, dropping repeated items but keeping order"""
+    merged = list(first)
+    merged.extend(item for item in second if item not in merged)
+    return merged
+
+
+class WebsiteScraper(PageExtractor):
     """Class for scraping business websites to extract relevant information"""
     
-    def __init__(self, business_repo=None, training_repo=None):
+    def __init__(self, business_repo=None, training_repo=None, parser=None, crawler=None, session=None,
+                 parse_pool=None):
+        super().__init__(parser)
+        self.crawler = crawler or SiteCrawler()
+        # Parser processes for extraction; None parses in this process (SCRAPER_PARSE_WORKERS=0)
+        self.parse_pool = parse_pool or get_parse_pool()
+        # Pooled keep-alive session with retries, shared by default
+        self.session = session or get_http_session()
         try:
             self.business_repo = business_repo or BusinessRepository()
             self.training_repo = training_repo or TrainingRepository()
         except Exception as e:
             logger.error(f"Failed to initialize repositories: {str(e)}")
             raise
-        
-    def scrape_website(self, business_id, url):
+    
+    def scrape_website(self, business_id, url, crawl=True):
         """
         Scrape a business website to extract useful information
         
         Args:
             business_id: The ID of the business in the database
             url: The website URL to scrape
+            crawl: Also fetch the about, services, FAQ, contact and hours pages
             
         Returns:
             dict: Extracted information
@@ -50,35 +107,45 @@ class WebsiteScraper:
             # Parse domain for later use
             domain = urlparse(url).netloc
             
-            # Fetch the website
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Skip the whole scrape when nothing changed since the last one
+            state = self.business_repo.get_scrape_state(business_id, url)
+            prefetched = {}
+            if state:
+                unchanged, prefetched, refreshed_pages = self._revalidate(state, crawl)
+                if unchanged:
+                    logger.info(f"Website unchanged since last scrape, skipping: {url}")
+                    if refreshed_pages is not None:
+                        # Same content under new validators: store them so the next run gets 304s
+                        self.business_repo.save_scrape_state(business_id, url, {'pages': refreshed_pages})
+                    return self._unchanged_result(business_id, url, domain)
             
             # Extract relevant information
             extracted_data = {
                 'business_id': business_id,
                 'source': 'website',
                 'url': url,
-                'domain': domain,
-                'title': self._get_title(soup),
-                'description': self._get_meta_description(soup),
-                'services': self._extract_services(soup),
-                'contact_info': self._extract_contact_info(soup, domain),
-                'hours': self._extract_hours(soup),
-                'faq': self._extract_faq(soup),
-                'about': self._extract_about(soup),
-                'raw_text': self._extract_clean_text(soup)
+                'domain': domain
             }
             
-            # Store in MongoDB through the repository
-            self.business_repo.save_website_data(business_id, extracted_data)
-            
-            # Also save relevant parts to the training repository
+            # Pages downloaded during revalidation are reused rather than fetched again
+            if crawl:
+                # Fetch the home page and its key sub-pages concurrently
+                fields, page_states = self._crawl_website(url, domain, prefetched)
+            else:
+                # Fetch the home page only
+                fields, page_states = self._fetch_single_page(url, domain, prefetched)
+            extracted_data.update(fields)
             training_data = self._prepare_training_data(extracted_data)
-            self.training_repo.save_training_data(business_id, training_data)
+            
+            new_state = {
+                'crawl': crawl,
+                'pages': page_states,
+                'section_hashes': section_hashes(extracted_data, WEBSITE_SECTIONS),
+                'training_hashes': section_hashes(training_data, training_data.keys()),
+                'scraped_at': datetime.utcnow()
+            }
+            self._save_changes(business_id, url, extracted_data, training_data, state, new_state)
+            self.business_repo.save_scrape_state(business_id, url, new_state)
             
             logger.info(f"Successfully scraped website for business_id: {business_id}")
             return extracted_data
@@ -90,230 +157,179 @@ class WebsiteScraper:
             logger.error(f"Error scraping website {url}: {str(e)}")
             return {"error": str(e), "url": url}
     
-    def _get_title(self, soup):
-        """Extract the website title"""
-        title_tag = soup.find('title')
-        return title_tag.text.strip() if title_tag else ""
-    
-    def _get_meta_description(self, soup):
-        """Extract meta description"""
-        meta = soup.find('meta', attrs={'name': 'description'})
-        return meta['content'].strip() if meta and 'content' in meta.attrs else ""
-    
-    def _extract_services(self, soup):
-        """Extract services offered by the business"""
-        services = []
+    def _revalidate(self, state, crawl):
+        """
+        Revalidate the pages from the last scrape with conditional requests
         
-        # Look for common service indicators
-        service_sections = soup.find_all(['section', 'div'], class_=lambda c: c and any(x in c.lower() for x in ['service', 'offering', 'product']))
+        Args:
+            state: The stored scrape state
+            crawl: Whether this scrape crawls sub-pages
+            
+        Returns:
+            tuple: (unchanged, prefetched, refreshed_pages) where unchanged is True
+                if every page answered 304 or still has the same content hash,
+                prefetched maps URL -> FetchedPage for every page that came back
+                with a body, and refreshed_pages is the stored page list with
+                updated validators if any unchanged page sent new ones, else None
+        """
+        pages = state.get('pages') or []
+        if not pages or state.get('crawl') != crawl:
+            return False, {}, None
         
-        for section in service_sections:
-            headings = section.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            for heading in headings:
-                services.append(heading.text.strip())
-                
-        # If no structured services found, try to extract from list items
-        if not services:
-            service_lists = soup.find_all('ul', class_=lambda c: c and 'service' in c.lower())
-            for ul in service_lists:
-                items = ul.find_all('li')
-                for item in items:
-                    services.append(item.text.strip())
-        
-        return services
-    
-    def _extract_contact_info(self, soup, domain):
-        """Extract contact information"""
-        contact_info = {
-            'email': self._extract_email(soup, domain),
-            'phone': self._extract_phone(soup),
-            'address': self._extract_address(soup)
-        }
-        return contact_info
-    
-    def _extract_email(self, soup, domain):
-        """Extract email addresses"""
-        # First look for mailto links
-        email_links = soup.select('a[href^=mailto]')
-        emails = [link['href'].replace('mailto:', '').strip() for link in email_links]
-        
-        # If no emails found in links, try regex on text
-        if not emails:
-            # Look for domain-specific emails first for better quality
-            domain_name = domain.split('.')[-2] if len(domain.split('.')) > 1 else domain
-            email_pattern = rf'\b[A-Za-z0-9._%+-]+@{re.escape(domain)}\b'
-            domain_emails = re.findall(email_pattern, soup.text)
-            
-            if domain_emails:
-                emails = domain_emails
+        try:
+            if crawl:
+                responses = self.crawler.revalidate(pages)
             else:
-                # Fall back to any email pattern
-                general_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                emails = re.findall(general_pattern, soup.text)
-        
-        return emails
+                responses = [self._revalidate_single_page(pages[0])]
+        except Exception as e:
+            logger.warning(f"Revalidation failed, doing a full scrape: {str(e)}")
+            return False, {}, None
+        
+        unchanged = True
+        prefetched = {}
+        refreshed_pages = []
+        refreshed = False
+        for page, response in zip(pages, responses):
+            if response is None:
+                unchanged = False
+                refreshed_pages.append(page)
+                continue
+            if response.not_modified:
+                refreshed_pages.append(page)
+                continue
+            prefetched[page['url']] = response
+            if content_fingerprint(response.content) != page.get('content_hash'):
+                unchanged = False
+                refreshed_pages.append(page)
+                continue
+            if (response.etag, response.last_modified) != (page.get('etag'), page.get('last_modified')):
+                refreshed = True
+            refreshed_pages.append(dict(page, etag=response.etag, last_modified=response.last_modified))
+        return unchanged, prefetched, refreshed_pages if refreshed else None
     
-    def _extract_phone(self, soup):
-        """Extract phone numbers"""
-        # Look for tel links first
-        phone_links = soup.select('a[href^=tel]')
-        phones = [link['href'].replace('tel:', '').strip() for link in phone_links]
-        
-        # If no phones found in links, try regex
-        if not phones:
-            # US phone pattern - can be expanded for international
-            patterns = [
-                r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890 or 123-456-7890
-                r'\+\d{1,3}\s?\(?\d{1,4}\)?[-.\s]?\d{3}[-.\s]?\d{4}'  # +1 (123) 456-7890
-            ]
-            
-            all_text = soup.text
-            for pattern in patterns:
-                found_phones = re.findall(pattern, all_text)
-                if found_phones:
-                    phones.extend(found_phones)
-        
-        return phones
+    def _revalidate_single_page(self, page):
+        """Conditional GET for a single stored page"""
+        return fetch_page(self.session, page['url'], page.get('kind', 'home'), headers=conditional_headers(page))
     
-    def _extract_address(self, soup):
-        """Extract physical address"""
-        address = ""
-        
-        # Look for address in structured data
-        address_elements = soup.find_all(itemtype="http://schema.org/PostalAddress")
-        if address_elements:
-            address = " ".join(elem.text.strip() for elem in address_elements)
-        
-        # Look for address in common containers
-        if not address:
-            address_containers = soup.find_all(['div', 'p'], class_=lambda c: c and 'address' in c.lower())
-            if address_containers:
-                address = address_containers[0].text.strip()
-        
-        # Look for footer address
-        if not address:
-            footer = soup.find('footer')
-            if footer:
-                # Common US address pattern
-                address_pattern = r'\d+\s+[A-Za-z0-9\s,.-]+\s+[A-Za-z]{2}\s+\d{5}'
-                matches = re.search(address_pattern, footer.text)
-                if matches:
-                    address = matches.group(0)
-        
-        return address
+    def _unchanged_result(self, business_id, url, domain):
+        """Return the stored website data for a scrape that was skipped"""
+        result = {
+            'business_id': business_id,
+            'source': 'website',
+            'url': url,
+            'domain': domain
+        }
+        for document in self.business_repo.get_website_data(business_id):
+            if document.get('url') == url:
+                result.update({k: v for k, v in document.items() if k != '_id'})
+                break
+        result['unchanged'] = True
+        return result
     
-    def _extract_hours(self, soup):
-        """Extract business hours"""
-        hours = {}
-        
-        # Look for schema.org structured data
-        hours_elements = soup.find_all(itemtype="http://schema.org/OpeningHoursSpecification")
-        if hours_elements:
-            for elem in hours_elements:
-                day = elem.find(itemprop="dayOfWeek")
-                opens = elem.find(itemprop="opens")
-                closes = elem.find(itemprop="closes")
-                
-                if day and opens and closes:
-                    day_text = day.text.strip()
-                    hours[day_text] = {
-                        "opens": opens.text.strip(),
-                        "closes": closes.text.strip()
-                    }
+    def _save_changes(self, business_id, url, extracted_data, training_data, old_state, new_state):
+        """
+        Write only the sections that changed since the last scrape
         
-        # Look for hours in text
-        if not hours:
-            hours_section = soup.find_all(['section', 'div'], class_=lambda c: c and any(x in c.lower() for x in ['hour', 'time', 'schedule']))
-            
-            if hours_section:
-                days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-                for day in days:
-                    pattern = rf'{day}\s*:?\s*(\d+(?::\d+)?\s*(?:am|pm)?\s*-\s*\d+(?::\d+)?\s*(?:am|pm)?)'
-                    matches = re.search(pattern, hours_section[0].text.lower())
-                    if matches:
-                        hours[day] = matches.group(1)
+        Falls back to full saves when there is no previous state or the
+        stored documents have gone missing.
+        """
+        old_state = old_state or {}
+        
+        if old_state.get('section_hashes'):
+            changed = changed_sections(old_state['section_hashes'], new_state['section_hashes'])
+            if changed:
+                logger.info(f"Website sections changed for {url}: {', '.join(changed)}")
+                sections = {section: extracted_data.get(section) for section in changed}
+                if not self.business_repo.update_website_sections(business_id, url, sections):
+                    self.business_repo.save_website_data(business_id, extracted_data)
+        else:
+            self.business_repo.save_website_data(business_id, extracted_data)
         
-        return hours
+        if old_state.get('training_hashes'):
+            changed = changed_sections(old_state['training_hashes'], new_state['training_hashes'])
+            if changed:
+                sections = {section: training_data.get(section) for section in changed}
+                if not self.training_repo.update_training_sections(business_id, training_data['source'], sections):
+                    self.training_repo.save_training_data(business_id, training_data)
+        else:
+            self.training_repo.save_training_data(business_id, training_data)
     
-    def _extract_faq(self, soup):
-        """Extract FAQ content"""
-        faqs = []
-        
-        # Look for schema.org structured FAQs
-        faq_elements = soup.find_all(itemtype="http://schema.org/FAQPage")
-        if faq_elements:
-            for elem in faq_elements:
-                questions = elem.find_all(itemtype="http://schema.org/Question")
-                for q in questions:
-                    question = q.find(itemprop="name")
-                    answer = q.find(itemprop="text")
-                    
-                    if question and answer:
-                        faqs.append({
-                            "question": question.text.strip(),
-                            "answer": answer.text.strip()
-                        })
-        
-        # If no structured FAQs, look for FAQ sections
-        if not faqs:
-            faq_section = soup.find_all(['section', 'div'], class_=lambda c: c and 'faq' in c.lower())
-            
-            if faq_section:
-                # Look for question-answer pairs
-                questions = faq_section[0].find_all(['h3', 'h4', 'strong', 'dt'])
-                
-                for q in questions:
-                    # The answer is likely in the next sibling
-                    answer = q.find_next(['p', 'div', 'dd'])
-                    if answer:
-                        faqs.append({
-                            "question": q.text.strip(),
-                            "answer": answer.text.strip()
-                        })
-        
-        return faqs
+    def _fetch_single_page(self, url, domain, prefetched=None):
+        """Fetch and extract the given URL only, reusing a page already downloaded"""
+        fetched = (prefetched or {}).get(url) or fetch_page(self.session, url)
+        fields, _ = self._parse_and_extract(fetched.content, fetched.encoding, domain)
+        fields['pages'] = [{'url': url, 'kind': 'home'}]
+        page_states = [_page_state(url, 'home', fetched.etag, fetched.last_modified, fetched.content)]
+        return fields, page_states
     
-    def _extract_about(self, soup):
-        """Extract 'About us' content"""
-        about_text = ""
-        
-        # Look for about sections
-        about_sections = soup.find_all(['section', 'div'], id=lambda i: i and 'about' in i.lower())
-        if not about_sections:
-            about_sections = soup.find_all(['section', 'div'], class_=lambda c: c and 'about' in c.lower())
-        
-        if about_sections:
-            paragraphs = about_sections[0].find_all('p')
-            about_text = "\n".join(p.text.strip() for p in paragraphs)
-        
-        # If still empty, try looking for about pages
-        if not about_text:
-            about_links = soup.find_all('a', text=lambda t: t and 'about' in t.lower())
-            if about_links:
-                # Would ideally follow this link and extract content
-                about_text = "About page available at: " + about_links[0].get('href', '')
-        
-        return about_text
+    def _crawl_website(self, url, domain, prefetched=None):
+        """Crawl the site and merge the data extracted from every page"""
+        def handle_page(fetched):
+            return self._parse_and_extract(fetched.content, fetched.encoding, domain)
+        
+        results = self.crawler.crawl(url, handle_page, prefetched)
+        page_states = [
+            _page_state(page.url, page.kind, page.etag, page.last_modified, page.content)
+            for page, _ in results
+        ]
+        return self._merge_pages(results), page_states
     
-    def _extract_clean_text(self, soup):
-        """Extract clean text content from the website"""
-        # Remove script and style elements
-        for script in soup(["script", "style", "header", "footer", "nav"]):
-            script.extract()
-            
-        # Get text
-        text = soup.get_text()
-        
-        # Break into lines and remove leading and trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    def _merge_pages(self, results):
+        """
+        Merge extracted data from crawled pages into one record
         
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
+        Args:
+            results: (page, extracted fields) pairs, home page first
+            
+        Returns:
+            dict: Merged fields plus the list of crawled pages
+        """
+        home_page, home_data = results[0]
+        merged = dict(home_data)
+        merged['contact_info'] = dict(home_data['contact_info'])
+        merged['hours'] = dict(home_data['hours'])
+        text_parts = [home_data['raw_text']]
+        
+        for page, data in results[1:]:
+            merged['services'] = _merge_unique(merged['services'], data['services'])
+            
+            contact_info = merged['contact_info']
+            contact_info['email'] = _merge_unique(contact_info['email'], data['contact_info']['email'])
+            contact_info['phone'] = _merge_unique(contact_info['phone'], data['contact_info']['phone'])
+            if not contact_info['address']:
+                contact_info['address'] = data['contact_info']['address']
+            
+            # Home page hours win; sub-pages only fill in missing days
+            known_days = {day.lower() for day in merged['hours']}
+            for day, hours in data['hours'].items():
+                if day.lower() not in known_days:
+                    merged['hours'][day] = hours
+            
+            known_questions = {faq['question'] for faq in merged['faq']}
+            merged['faq'] = merged['faq'] + [faq for faq in data['faq'] if faq['question'] not in known_questions]
+            
+            # Replace a missing or link-only about text with the about page content
+            if page.kind == 'about' and (not merged['about'] or merged['about'].startswith(ABOUT_LINK_PREFIX)):
+                merged['about'] = data['about'] or data['raw_text']
+            
+            text_parts.append(data['raw_text'])
+        
+        merged['raw_text'] = '\n\n'.join(part for part in text_parts if part)
+        merged['pages'] = [{'url': page.url, 'kind': page.kind} for page, _ in results]
+        return merged
+    
+    def _parse_and_extract(self, content, encoding, domain):
+        """
+        Extract a fetched page in the parse pool when one is configured
         
-        return text
+        Only the raw bytes go to the parser process and only the extracted
+        fields and links come back. A page that overruns the parse timeout
+        raises ParseTimeoutError.
+        """
+        if self.parse_pool is None:
+            return self.extract_page_with_links(content, encoding, domain)
+        return self.parse_pool.extract(content, encoding, domain, self.parser)
+    
     
     def _prepare_training_data(self, extracted_data):
         """Prepare training data for the AI from extracted website data"""
@@ -372,8 +388,23 @@ class WebsiteScraper:
 class GBPScraper:
     """Class for scraping Google Business Profile data"""
     
-    def __init__(self):
+    def __init__(self, session=None, base_url=None, cache=None, limiter=None, business_repo=None):
         self.api_key = self._get_api_key()
+        try:
+            self.business_repo = business_repo or BusinessRepository()
+        except Exception as e:
+            logger.error(f"Failed to initialize repositories: {str(e)}")
+            raise
+        # Token bucket matched to the Places QPS quota, shared by default
+        self.limiter = limiter or get_places_rate_limiter()
+        # Query -> place_id and place_id -> details cache, shared by default
+        self.cache = cache or get_places_cache()
+        # Response size and latency per field tier, shared by default
+        self.request_metrics = get_places_request_metrics()
+        # Pooled keep-alive session with retries, shared by default
+        self.session = session or get_http_session()
+        # Overridable so tests can point the scraper at a local stub server
+        self.base_url = (base_url or os.environ.get("PLACES_API_BASE_URL") or PLACES_API_BASE_URL).rstrip("/")
         
     def _get_api_key(self) -> str:
         """Get Google Maps API key from Secret Manager or environment variable."""
@@ -422,7 +453,8 @@ class GBPScraper:
             logger.error(f"Critical error getting API key: {str(e)}")
             raise ValueError("Critical failure obtaining Places API key")
             
-    def scrape_gbp(self, business_id: str, business_name: str, location: Optional[str] = None) -> Dict[str, Any]:
+    def scrape_gbp(self, business_id: str, business_name: str, location: Optional[str] = None,
+                   tier: str = DEFAULT_TIER, save: bool = True) -> Dict[str, Any]:
         """
         Scrape business data from Google Business Profile using Places API.
         
@@ -430,114 +462,92 @@ class GBPScraper:
             business_id: The ID of the business in our database
             business_name: Name of the business to search for
             location: Optional location to narrow down the search
+            tier: Places field tier, see places_fields.FIELD_TIERS; only
+                "full" includes photos
+            save: Store the result for business_id; diagnostics pass False so
+                they do not overwrite a real business's data
             
         Returns:
             Dict containing the scraped data or error information
         """
         try:
+            fields = tier_fields(tier)
+            groups = tier_groups(tier)
+            
             # The API key is already validated in the constructor
             api_key = self.api_key
             
-            # Construct search query
-            search_query = business_name
-            if location:
-                search_query = f"{business_name} {location}"
-            search_query = requests.utils.quote(search_query)
+            # Reuse the place_id from an earlier identical search when cached
+            query_key = normalize_query(business_name, location)
+            place_id = self.cache.get_place_id(query_key)
             
-            # First, search for the business
-            places_url = f"https://maps.googleapis.com/maps/api/place/textsearch/json?query={search_query}&key={api_key}"
-            logger.info(f"Searching for business: {business_name}")
+            if place_id is None:
+                # Construct search query
+                search_query = business_name
+                if location:
+                    search_query = f"{business_name} {location}"
+                search_query = requests.utils.quote(search_query)
             
-            response = requests.get(places_url, timeout=10)
-            response.raise_for_status()
-            search_data = response.json()
-            
-            if search_data.get('status') != 'OK':
-                error_msg = f"Places API error: {search_data.get('status')}"
-                details = search_data.get('error_message', '')
-                logger.error(f"{error_msg} - {details}")
-                return {
-                    "success": False,
-                    "error": error_msg,
-                    "details": details
-                }
-            
-            if not search_data.get('results'):
-                logger.error("No results found for the business")
-                return {
-                    "success": False,
-                    "error": "No results found for the business"
-                }
-            
-            # Get the first result (most relevant)
-            place = search_data['results'][0]
-            place_id = place['place_id']
+                # First, search for the business
+                places_url = f"{self.base_url}/textsearch/json?query={search_query}&key={api_key}"
+                logger.info(f"Searching for business: {business_name}")
+            
+                search_data = self._places_get(places_url, "textsearch")
+            
+                if search_data.get('status') != 'OK':
+                    return self._places_error(search_data)
+            
+                if not search_data.get('results'):
+                    logger.error("No results found for the business")
+                    return {
+                        "success": False,
+                        "error": "No results found for the business"
+                    }
+            
+                # Get the first result (most relevant)
+                place = search_data['results'][0]
+                place_id = place['place_id']
+                self.cache.set_place_id(query_key, place_id)
+            else:
+                logger.info(f"Places query cache hit for: {business_name}")
             
             # Get detailed information about the place
-            fields = [
-                "name",
-                "formatted_address",
-                "formatted_phone_number",
-                "website",
-                "rating",
-                "user_ratings_total",
-                "types",
-                "opening_hours",
-                "reviews",
-                "photos"
-            ]
-            
-            details_url = f"https://maps.googleapis.com/maps/api/place/details/json?place_id={place_id}&fields={','.join(fields)}&key={api_key}"
-            logger.info(f"Getting details for place_id: {place_id}")
-            
-            response = requests.get(details_url, timeout=10)
-            response.raise_for_status()
-            details_data = response.json()
-            
-            if details_data.get('status') != 'OK':
-                error_msg = f"Places API error: {details_data.get('status')}"
-                details = details_data.get('error_message', '')
-                logger.error(f"{error_msg} - {details}")
-                return {
-                    "success": False,
-                    "error": error_msg,
-                    "details": details
-                }
-            
-            result = details_data['result']
-            
-            # Process photos if available
-            photos = []
-            if result.get('photos'):
-                for photo in result['photos'][:5]:  # Limit to 5 photos
-                    photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={photo['photo_reference']}&key={api_key}"
-                    photos.append({
-                        'url': photo_url,
-                        'height': photo['height'],
-                        'width': photo['width']
-                    })
-            
-            # Construct the final response
-            business_data = {
-                'business_id': business_id,
-                'name': result.get('name'),
-                'address': result.get('formatted_address'),
-                'phone': result.get('formatted_phone_number'),
-                'website': result.get('website'),
-                'rating': result.get('rating'),
-                'total_ratings': result.get('user_ratings_total'),
-                'types': result.get('types', []),
-                'opening_hours': result.get('opening_hours', {}).get('periods', []),
-                'reviews': result.get('reviews', []),
-                'photos': photos
-            }
+            result = self.cache.get_details(place_id, fields)
+            
+            if result is None:
+                result, error = self._get_place_details(place_id, fields, tier)
+                if error:
+                    return error
+            else:
+                logger.info(f"Places details cache hit for place_id: {place_id}")
+            
+            business_data = self._build_gbp_data(business_id, place_id, result, groups)
+            new_photos = False
+            if save and 'photos' in groups:
+                business_data['photos'], new_photos = self._keep_cached_photos(business_id, business_data['photos'])
+            scraped_at = datetime.utcnow()
+            business_data['scraped_at'] = scraped_at
+            saved = save and self._save_gbp_data(business_id, business_data, groups, scraped_at)
+            if saved and new_photos:
+                queue_photo_caching(business_id)
             
             logger.info(f"Successfully scraped GBP data for {business_name}")
             return {
                 "success": True,
-                "data": business_data
+                "data": business_data,
+                "tier": tier,
+                "groups": groups,
+                "saved": saved
             }
             
+        except PlacesQuotaExceededError as e:
+            logger.warning(f"Skipped GBP scrape for {business_name}: {str(e)}")
+            return {
+                "success": False,
+                "error": "Places API quota exhausted",
+                "status": PLACES_OVER_QUERY_LIMIT,
+                "skipped": True
+            }
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error while scraping GBP: {str(e)}")
             return {
@@ -551,3 +561,255 @@ class GBPScraper:
                 "success": False,
                 "error": str(e)
             }
+
+    def refresh_gbp_fields(self, business_id: str, place_id: str, groups: List[str]) -> Dict[str, Any]:
+        """
+        Re-fetch only some field groups of stored GBP data and save them.
+        
+        Args:
+            business_id: The ID of the business in our database
+            place_id: Places ID saved with the business's GBP data
+            groups: Field groups to refresh, see places_fields.GBP_FIELD_GROUPS
+            
+        Returns:
+            Dict with the refreshed fields or error information
+        """
+        try:
+            # Ask for the cheapest tier covering the stale groups, and store everything it returns
+            tier = cheapest_tier(groups)
+            groups = tier_groups(tier)
+            
+            # A refresh must see current data, so skip the cache read but store the answer
+            result, error = self._get_place_details(place_id, tier_fields(tier), tier)
+            if error:
+                return error
+            
+            refreshed = self._build_gbp_data(business_id, place_id, result, groups)
+            del refreshed['business_id'], refreshed['place_id']
+            new_photos = False
+            if 'photos' in groups:
+                refreshed['photos'], new_photos = self._keep_cached_photos(business_id, refreshed['photos'])
+            
+            scraped_at = datetime.utcnow()
+            self.business_repo.update_gbp_fields(business_id, refreshed, groups, scraped_at)
+            if new_photos:
+                queue_photo_caching(business_id)
+            logger.info(f"Refreshed GBP {tier} tier for business {business_id}")
+            return {
+                "success": True,
+                "data": refreshed,
+                "tier": tier,
+                "groups": groups
+            }
+            
+        except PlacesQuotaExceededError as e:
+            logger.warning(f"Skipped GBP refresh for {business_id}: {str(e)}")
+            return {
+                "success": False,
+                "error": "Places API quota exhausted",
+                "status": PLACES_OVER_QUERY_LIMIT,
+                "skipped": True
+            }
+        except Exception as e:
+            logger.error(f"Error refreshing GBP data: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def fetch_photo(self, photo_reference: str, max_width: int) -> Tuple[bytes, str]:
+        """
+        Download one photo from the Places Photo endpoint.
+        
+        Args:
+            photo_reference: Reference from a Place Details result
+            max_width: Largest width to ask Places for
+            
+        Returns:
+            tuple: (image bytes, content type)
+            
+        Raises:
+            UnsupportedContentError: If the response is not an image or is too large
+        """
+        if not self.limiter.acquire():
+            raise PlacesQuotaExceededError("Places API calls are paused after OVER_QUERY_LIMIT")
+        
+        url = f"{self.base_url}/photo?maxwidth={max_width}&photoreference={photo_reference}&key={self.api_key}"
+        started = time.perf_counter()
+        with self.session.get(url, timeout=DEFAULT_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+            if not content_type.startswith('image/'):
+                raise UnsupportedContentError(f"Unsupported photo content type: {content_type}")
+            
+            data = bytearray()
+            for chunk in response.iter_content(CHUNK_SIZE):
+                data.extend(chunk)
+                if len(data) > MAX_PHOTO_BYTES:
+                    raise UnsupportedContentError(f"Photo larger than {MAX_PHOTO_BYTES} bytes")
+        
+        self.request_metrics.record("photo", len(data), time.perf_counter() - started)
+        return bytes(data), content_type
+    
+    def _get_place_details(self, place_id: str, fields: List[str], tier: str):
+        """Fetch Place Details for a tier's fields; returns (result, error dict or None)."""
+        details_url = f"{self.base_url}/details/json?place_id={place_id}&fields={','.join(fields)}&key={self.api_key}"
+        logger.info(f"Getting {tier} details for place_id: {place_id}")
+        
+        details_data = self._places_get(details_url, tier)
+        
+        if details_data.get('status') != 'OK':
+            return None, self._places_error(details_data)
+        
+        result = details_data['result']
+        self.cache.set_details(place_id, fields, result)
+        return result, None
+    
+    def _build_gbp_data(self, business_id: str, place_id: str, result: Dict[str, Any],
+                        groups: List[str]) -> Dict[str, Any]:
+        """Map a Place Details result onto the stored GBP fields of the given groups."""
+        # Process photos if available; the Places Photo URL carries our API
+        # key, so clients get our own endpoint, which serves the cached copy
+        photos = []
+        if result.get('photos'):
+            for photo in result['photos'][:5]:  # Limit to 5 photos
+                photos.append({
+                    'url': photo_ref_url(photo['photo_reference']),
+                    'photo_reference': photo['photo_reference'],
+                    'height': photo['height'],
+                    'width': photo['width']
+                })
+        
+        values = {
+            'name': result.get('name'),
+            'address': result.get('formatted_address'),
+            'phone': result.get('formatted_phone_number'),
+            'website': result.get('website'),
+            'rating': result.get('rating'),
+            'total_ratings': result.get('user_ratings_total'),
+            'types': result.get('types', []),
+            'opening_hours': result.get('opening_hours', {}).get('periods', []),
+            'reviews': result.get('reviews', []),
+            'photos': photos
+        }
+        
+        business_data = {'business_id': business_id, 'place_id': place_id}
+        for group in groups:
+            for field in GBP_FIELD_GROUPS[group][1]:
+                business_data[field] = values[field]
+        return business_data
+    
+    def _keep_cached_photos(self, business_id: str, photos: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Keep the stored entries of photos whose reference has not changed.
+        
+        Stored entries carry the cached copy's content_hash and URL, so
+        re-fetching the photo list does not send unchanged photos through
+        the cache again.
+        
+        Returns:
+            tuple: (photo entries, True if any reference is not stored yet)
+        """
+        try:
+            stored = {
+                photo.get('photo_reference'): photo
+                for photo in self.business_repo.get_gbp_photos(business_id) or []
+            }
+        except Exception as e:
+            logger.error(f"Error reading stored GBP photos for {business_id}: {str(e)}")
+            stored = {}
+        
+        kept = [stored.get(photo['photo_reference'], photo) for photo in photos]
+        return kept, any(photo['photo_reference'] not in stored for photo in photos)
+    
+    def _save_gbp_data(self, business_id: str, business_data: Dict[str, Any], groups: List[str],
+                       scraped_at: datetime) -> bool:
+        """
+        Persist a scrape; a database failure is logged but does not fail the scrape.
+        
+        A scrape with a smaller tier only updates its own fields of an existing
+        document, so it never blanks out reviews or photos saved earlier.
+        """
+        try:
+            if set(groups) != set(GBP_FIELD_GROUPS):
+                fields = {k: v for k, v in business_data.items() if k != 'business_id'}
+                if self.business_repo.update_gbp_fields(business_id, fields, groups, scraped_at):
+                    return True
+            
+            document = dict(business_data)
+            document['field_scraped_at'] = {group: scraped_at for group in groups}
+            self.business_repo.save_gbp_data(business_id, document)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving GBP data for {business_id}: {str(e)}")
+            return False
+    
+    def iter_gbp_batch(self, items: List[Any], max_workers: int = BATCH_MAX_WORKERS,
+                       tier: str = DEFAULT_TIER) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Scrape many Google Business Profiles concurrently.
+        
+        Throughput is bounded by the shared Places rate limiter rather than by
+        per-request latency. Once the API reports OVER_QUERY_LIMIT, items that
+        have not started yet are skipped instead of being sent.
+        
+        Args:
+            items: (business_id, business_name, location) tuples or dicts with
+                those keys and optionally a tier
+            max_workers: Number of scrapes in flight at once
+            tier: Places field tier for items that do not name one
+            
+        Yields:
+            tuple: (index into items, scrape_gbp result) as each item finishes
+        """
+        stop = threading.Event()
+        
+        def run(item):
+            if stop.is_set() or self.limiter.suspended:
+                return {"success": False, "error": "Skipped: Places API quota exhausted", "skipped": True}
+            business_id, business_name, location, item_tier = _gbp_batch_args(item, tier)
+            result = self.scrape_gbp(business_id, business_name, location, item_tier)
+            if result.get("status") == PLACES_OVER_QUERY_LIMIT:
+                stop.set()
+            return result
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gbp-batch") as executor:
+            futures = {executor.submit(run, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
+    def _places_get(self, url: str, kind: str) -> Dict[str, Any]:
+        """Send one Places API request once the rate limiter allows it, recording size and latency under kind."""
+        if not self.limiter.acquire():
+            raise PlacesQuotaExceededError("Places API calls are paused after OVER_QUERY_LIMIT")
+        
+        started = time.perf_counter()
+        response = self.session.get(url, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        self.request_metrics.record(kind, len(response.content), time.perf_counter() - started)
+        return response.json()
+    
+    def _places_error(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Error result for a non-OK Places status; pauses all Places calls if the quota is spent."""
+        status = data.get('status')
+        error_msg = f"Places API error: {status}"
+        details = data.get('error_message', '')
+        logger.error(f"{error_msg} - {details}")
+        
+        if status == PLACES_OVER_QUERY_LIMIT:
+            self.limiter.suspend(QUOTA_BACKOFF_SECONDS)
+        
+        return {
+            "success": False,
+            "error": error_msg,
+            "details": details,
+            "status": status
+        }
+
+
+def _gbp_batch_args(item, tier: str) -> Tuple[str, str, Optional[str], str]:
+    """Unpack a batch item given as a tuple or a dict, with the tier to scrape it at."""
+    if isinstance(item, dict):
+        return item.get('business_id'), item.get('business_name'), item.get('location'), item.get('tier', tier)
+    business_id, business_name, *rest = item
+    return business_id, business_name, rest[0] if rest else None, tier
@@ -0,0 +1,111 @@
+# app/business/singleflight.py
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight execution and the requests waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe request coalescing.
+
+    do(key, func) runs func unless an identical call (same key) is already
+    in flight, in which case it waits for that call and returns its result,
+    or raises its exception. Nothing is cached: once a call finishes the
+    next request with its key runs func again.
+
+    Counters per kind: executed (calls that ran func), coalesced (calls
+    that shared another's result) and in_flight.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, kind: str, counter: str, delta: int = 1):
+        stats = self._stats.setdefault(kind, {"executed": 0, "coalesced": 0, "in_flight": 0})
+        stats[counter] += delta
+
+    def do(self, key: Hashable, func: Callable[[], Any], kind: str = "default") -> Tuple[Any, bool]:
+        """
+        Run func, or share the result of the identical call already running.
+
+        Args:
+            key: Identifies identical calls; must be hashable
+            func: The work, called with no arguments
+            kind: Metrics bucket, e.g. "scrape-website"
+
+        Returns:
+            tuple: (result, shared), shared being True if another call's result was reused
+        """
+        key = (kind, key)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._count(kind, "executed")
+                self._count(kind, "in_flight")
+            else:
+                call.waiters += 1
+                self._count(kind, "coalesced")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self._count(kind, "in_flight", -1)
+                if call.waiters:
+                    logger.info(f"Shared one {kind} execution with {call.waiters} identical requests")
+            call.done.set()
+        return call.result, False
+
+    def metrics(self) -> Dict[str, Any]:
+        """Executed, coalesced and in-flight counts per kind, with the share of requests coalesced."""
+        with self._lock:
+            stats = {kind: dict(counts) for kind, counts in self._stats.items()}
+
+        for counts in stats.values():
+            requests = counts["executed"] + counts["coalesced"]
+            counts["coalesced_rate"] = round(counts["coalesced"] / requests, 4) if requests else None
+        return stats
+
+
+# Process-wide coalescing, shared by every route and job thread
+_singleflight = None
+_singleflight_lock = threading.Lock()
+
+
+def get_singleflight() -> SingleFlight:
+    """Get the process-wide SingleFlight."""
+    global _singleflight
+    if _singleflight is None:
+        with _singleflight_lock:
+            if _singleflight is None:
+                _singleflight = SingleFlight()
+    return _singleflight
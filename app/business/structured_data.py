@@ -0,0 +1,229 @@
+# app/business/structured_data.py
+
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Node types that describe the page or its parts rather than the business itself
+NON_BUSINESS_TYPES = {
+    "website", "webpage", "breadcrumblist", "listitem", "faqpage", "question", "answer",
+    "imageobject", "person", "searchaction", "sitenavigationelement", "article", "blogposting",
+    "offer", "offercatalog", "service", "postaladdress", "openinghoursspecification"
+}
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_ABBREVIATIONS = {"mo": 0, "tu": 1, "we": 2, "th": 3, "fr": 4, "sa": 5, "su": 6}
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_OPENING_HOURS_PATTERN = re.compile(
+    r"^\s*([A-Za-z]{2}(?:\s*-\s*[A-Za-z]{2})?(?:\s*,\s*[A-Za-z]{2}(?:\s*-\s*[A-Za-z]{2})?)*)\s+(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})\s*$"
+)
+
+
+def parse_json_ld(blocks: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Decode JSON-LD script blocks into a flat list of nodes.
+
+    Top-level arrays and @graph containers are unpacked; blocks that are not
+    valid JSON are skipped.
+    """
+    nodes = []
+    for block in blocks:
+        if not block or not block.strip():
+            continue
+        try:
+            data = json.loads(block)
+        except ValueError:
+            logger.debug("Skipping invalid JSON-LD block")
+            continue
+
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            node = pending.pop(0)
+            if not isinstance(node, dict):
+                continue
+            if isinstance(node.get("@graph"), list):
+                pending.extend(node["@graph"])
+            if node.get("@type"):
+                nodes.append(node)
+    return nodes
+
+
+def extract_structured_data(blocks: Iterable[str]) -> Dict[str, Any]:
+    """
+    Pull business fields out of a page's JSON-LD blocks.
+
+    Args:
+        blocks: Raw contents of the page's application/ld+json scripts
+
+    Returns:
+        dict: Any of title, description, phone, email, address, hours,
+            services and faq that the structured data provides; fields it
+            does not provide are left out
+    """
+    nodes = parse_json_ld(blocks)
+    if not nodes:
+        return {}
+
+    fields: Dict[str, Any] = {}
+    business = next((node for node in nodes if _is_business(node)), None)
+
+    if business:
+        if _text(business.get("name")):
+            fields["title"] = _text(business.get("name"))
+        if _text(business.get("description")):
+            fields["description"] = _text(business.get("description"))
+
+        phones = [_text(phone) for phone in _as_list(business.get("telephone")) if _text(phone)]
+        if phones:
+            fields["phone"] = phones
+
+        emails = [_text(email).replace("mailto:", "") for email in _as_list(business.get("email")) if _text(email)]
+        if emails:
+            fields["email"] = emails
+
+        address = _format_address(business.get("address"))
+        if address:
+            fields["address"] = address
+
+        hours = _extract_hours(business)
+        if hours:
+            fields["hours"] = hours
+
+        services = _extract_services(business)
+        if services:
+            fields["services"] = services
+
+    faqs = []
+    for node in nodes:
+        if "faqpage" in _types(node):
+            faqs.extend(_extract_faq(node))
+    if faqs:
+        fields["faq"] = faqs
+
+    return fields
+
+
+def _types(node: Dict[str, Any]) -> List[str]:
+    return [str(t).lower() for t in _as_list(node.get("@type"))]
+
+
+def _is_business(node: Dict[str, Any]) -> bool:
+    """A node describing the business: not a page-structure type and carrying contact details."""
+    if all(t in NON_BUSINESS_TYPES for t in _types(node)):
+        return False
+    return any(key in node for key in ("telephone", "address", "openingHoursSpecification", "openingHours"))
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _text(value: Any) -> str:
+    """Plain text of a JSON-LD value, with any embedded HTML tags removed."""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("text") or value.get("@value")
+    if value is None or isinstance(value, (dict, list)):
+        return ""
+    return _TAG_PATTERN.sub("", str(value)).strip()
+
+
+def _format_address(address: Any) -> str:
+    """Format a PostalAddress node (or plain string) as one line."""
+    if isinstance(address, list):
+        address = address[0] if address else None
+    if isinstance(address, str):
+        return address.strip()
+    if not isinstance(address, dict):
+        return ""
+
+    region = " ".join(part for part in (_text(address.get("addressRegion")), _text(address.get("postalCode"))) if part)
+    parts = [_text(address.get("streetAddress")), _text(address.get("addressLocality")), region]
+    return ", ".join(part for part in parts if part)
+
+
+def _day_name(value: Any) -> Optional[str]:
+    """Normalize 'Monday', 'https://schema.org/Monday' or 'Mo' to 'Monday'."""
+    day = _text(value).rstrip("/").rsplit("/", 1)[-1].strip()
+    for name in DAY_NAMES:
+        if day.lower() == name.lower():
+            return name
+    index = DAY_ABBREVIATIONS.get(day[:2].lower()) if len(day) == 2 else None
+    return DAY_NAMES[index] if index is not None else None
+
+
+def _extract_hours(business: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """Opening hours as {day: {"opens": ..., "closes": ...}}, same shape as the microdata extractor."""
+    hours = {}
+
+    for spec in _as_list(business.get("openingHoursSpecification")):
+        if not isinstance(spec, dict):
+            continue
+        opens, closes = _text(spec.get("opens")), _text(spec.get("closes"))
+        if not opens or not closes:
+            continue
+        for value in _as_list(spec.get("dayOfWeek")):
+            day = _day_name(value)
+            if day:
+                hours[day] = {"opens": opens, "closes": closes}
+
+    # Compact form, e.g. "Mo-Fr 09:00-17:00"
+    for value in _as_list(business.get("openingHours")):
+        match = _OPENING_HOURS_PATTERN.match(_text(value))
+        if not match:
+            continue
+        days_spec, opens, closes = match.groups()
+        for day_range in days_spec.split(","):
+            bounds = [DAY_ABBREVIATIONS.get(b.strip()[:2].lower()) for b in day_range.split("-")]
+            if None in bounds:
+                continue
+            start, end = bounds[0], bounds[-1]
+            span = range(start, end + 1) if start <= end else list(range(start, 7)) + list(range(0, end + 1))
+            for index in span:
+                hours.setdefault(DAY_NAMES[index], {"opens": opens, "closes": closes})
+
+    return hours
+
+
+def _extract_services(business: Dict[str, Any]) -> List[str]:
+    """Service names from hasOfferCatalog / makesOffer, including nested catalogs."""
+    services: List[str] = []
+    pending = _as_list(business.get("hasOfferCatalog")) + _as_list(business.get("makesOffer"))
+
+    while pending:
+        node = pending.pop(0)
+        if not isinstance(node, dict):
+            continue
+        types = _types(node)
+
+        if "offercatalog" in types:
+            pending.extend(_as_list(node.get("itemListElement")))
+            continue
+
+        offered = node.get("itemOffered") if "offer" in types or "itemOffered" in node else node
+        for item in _as_list(offered):
+            name = _text(item)
+            if name and name not in services:
+                services.append(name)
+
+    return services
+
+
+def _extract_faq(faq_page: Dict[str, Any]) -> List[Dict[str, str]]:
+    faqs = []
+    for question in _as_list(faq_page.get("mainEntity")):
+        if not isinstance(question, dict):
+            continue
+        answer = _as_list(question.get("acceptedAnswer"))
+        question_text = _text(question.get("name"))
+        answer_text = _text(answer[0].get("text")) if answer and isinstance(answer[0], dict) else ""
+        if question_text and answer_text:
+            faqs.append({"question": question_text, "answer": answer_text})
+    return faqs
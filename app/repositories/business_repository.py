@@ -29,6 +29,19 @@ class BusinessRepository:
         
         self.client = MongoClient(mongodb_url)
         self.db = self.client.sloane_ai_service
+        self._ensure_indexes()
+        
+    def _ensure_indexes(self):
+        """Indexes the scrape and refresh paths rely on; safe to repeat"""
+        try:
+            # One revalidation state per scraped website
+            self.db.scrape_state.create_index([("business_id", 1), ("url", 1)], unique=True)
+            # The GBP refresh scans stored data oldest first
+            self.db.business_data.create_index([("data_type", 1), ("scraped_at", 1)])
+            # Photo-reference lookups from the photo route
+            self.db.business_data.create_index("photos.photo_reference", sparse=True)
+        except Exception as e:
+            logger.error(f"Error creating business data indexes: {str(e)}")
         
     def create_business(self, business_data: Dict[str, Any]) -> Optional[str]:
         """Create a new business."""
@@ -191,6 +204,87 @@ class BusinessRepository:
             logger.error(f"Error saving website data: {str(e)}")
             raise
     
+    def update_website_sections(self, business_id, url, sections):
+        """
+        Update only the given sections of stored website data
+        
+        Args:
+            business_id: The business ID
+            url: The scraped website URL
+            sections: Mapping of field name to new value
+            
+        Returns:
+            bool: True if a stored document was found for the URL
+        """
+        try:
+            update = dict(sections)
+            update["updated_at"] = datetime.utcnow()
+            
+            result = self.db.business_data.update_one(
+                {
+                    "business_id": business_id,
+                    "data_type": "website_data",
+                    "url": url
+                },
+                {"$set": update}
+            )
+            return result.matched_count > 0
+                
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"MongoDB connection error while updating website data: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error updating website data: {str(e)}")
+            raise
+    
+    def get_scrape_state(self, business_id, url):
+        """
+        Get the stored revalidation state for a scraped website
+        
+        Args:
+            business_id: The business ID
+            url: The scraped website URL
+            
+        Returns:
+            dict: Page validators, content hashes and section hashes, or None
+        """
+        try:
+            return self.db.scrape_state.find_one({
+                "business_id": business_id,
+                "url": url
+            })
+                
+        except Exception as e:
+            logger.error(f"Error getting scrape state: {str(e)}")
+            return None
+    
+    def save_scrape_state(self, business_id, url, state):
+        """
+        Save the revalidation state for a scraped website
+        
+        Args:
+            business_id: The business ID
+            url: The scraped website URL
+            state: Page validators, content hashes and section hashes
+            
+        Returns:
+            bool: True if the state was written
+        """
+        try:
+            state = dict(state)
+            state["updated_at"] = datetime.utcnow()
+            
+            self.db.scrape_state.update_one(
+                {"business_id": business_id, "url": url},
+                {"$set": state},
+                upsert=True
+            )
+            return True
+                
+        except Exception as e:
+            logger.error(f"Error saving scrape state: {str(e)}")
+            return False
+    
     def save_gbp_data(self, business_id, gbp_data):
         """
         Save Google Business Profile data to MongoDB
@@ -218,7 +312,8 @@ class BusinessRepository:
             })
             
             if existing:
-                # Update the existing document
+                # Update the existing document, keeping its creation time
+                gbp_data.pop("created_at", None)
                 gbp_data["updated_at"] = datetime.utcnow()
                 result = self.db.business_data.update_one(
                     {"_id": existing["_id"]},
@@ -237,6 +332,125 @@ class BusinessRepository:
             logger.error(f"Error saving GBP data: {str(e)}")
             raise
     
+    def update_gbp_fields(self, business_id, fields, groups, scraped_at):
+        """
+        Update refreshed fields of stored GBP data
+        
+        Args:
+            business_id: The business ID
+            fields: Mapping of stored field name to new value
+            groups: Field groups the new values belong to
+            scraped_at: When the values were fetched
+            
+        Returns:
+            bool: True if a stored document was found for the business
+        """
+        try:
+            update = dict(fields)
+            update["updated_at"] = datetime.utcnow()
+            for group in groups:
+                update[f"field_scraped_at.{group}"] = scraped_at
+            
+            result = self.db.business_data.update_one(
+                {
+                    "business_id": business_id,
+                    "data_type": "gbp_data"
+                },
+                {"$set": update}
+            )
+            return result.matched_count > 0
+                
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"MongoDB connection error while updating GBP data: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error updating GBP data: {str(e)}")
+            raise
+    
+    def update_gbp_photos(self, business_id, photos):
+        """
+        Replace the photo entries of stored GBP data
+        
+        Args:
+            business_id: The business ID
+            photos: Photo entries, e.g. rewritten to cached photo URLs
+            
+        Returns:
+            bool: True if a stored document was found for the business
+        """
+        try:
+            result = self.db.business_data.update_one(
+                {
+                    "business_id": business_id,
+                    "data_type": "gbp_data"
+                },
+                {"$set": {"photos": photos, "updated_at": datetime.utcnow()}}
+            )
+            return result.matched_count > 0
+                
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"MongoDB connection error while updating GBP photos: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error updating GBP photos: {str(e)}")
+            raise
+    
+    def get_gbp_photos(self, business_id):
+        """
+        Get the photo entries of stored GBP data
+        
+        Args:
+            business_id: The business ID
+            
+        Returns:
+            list: Photo entries, or None if no GBP data is stored for the business
+        """
+        try:
+            document = self.db.business_data.find_one(
+                {
+                    "business_id": business_id,
+                    "data_type": "gbp_data"
+                },
+                {"photos": 1}
+            )
+            return (document.get("photos") or []) if document else None
+                
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"MongoDB connection error while getting GBP photos: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error getting GBP photos: {str(e)}")
+            raise
+    
+    def find_stale_gbp_data(self, cutoffs):
+        """
+        Find stored GBP data with at least one field group scraped before its cutoff
+        
+        Args:
+            cutoffs: Mapping of field group to the oldest acceptable scrape time
+            
+        Returns:
+            list: GBP documents with business_id, place_id, name, address and scrape times
+        """
+        try:
+            stale = []
+            for group, cutoff in cutoffs.items():
+                stale.append({f"field_scraped_at.{group}": {"$lt": cutoff}})
+                stale.append({f"field_scraped_at.{group}": {"$exists": False}})
+            
+            cursor = self.db.business_data.find(
+                {"data_type": "gbp_data", "$or": stale},
+                {"business_id": 1, "place_id": 1, "name": 1, "address": 1, "scraped_at": 1, "field_scraped_at": 1}
+            ).sort("scraped_at", 1)
+            return list(cursor)
+                
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"MongoDB connection error while finding stale GBP data: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error finding stale GBP data: {str(e)}")
+            raise
+    
     def get_business_data(self, business_id, data_type=None):
         """
         Get all data for a business
@@ -280,6 +494,29 @@ class BusinessRepository:
             logger.error(f"Error getting website data: {str(e)}")
             raise
     
+    def has_photo_reference(self, photo_reference):
+        """
+        Check whether stored GBP data contains a Places photo reference
+        
+        Args:
+            photo_reference: The Places photo reference
+            
+        Returns:
+            bool: True if a GBP document lists the reference among its photos
+        """
+        try:
+            return self.db.business_data.find_one(
+                {"data_type": "gbp_data", "photos.photo_reference": photo_reference},
+                {"_id": 1}
+            ) is not None
+                
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"MongoDB connection error while checking photo reference: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error checking photo reference: {str(e)}")
+            raise
+    
     def get_gbp_data(self, business_id):
         """
         Get Google Business Profile data for a business
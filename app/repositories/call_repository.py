@@ -26,7 +26,20 @@ class CallRepository:
             
         self.client = MongoClient(mongodb_url)
         self.db = self.client.sloane_ai_service
+        self._ensure_indexes()
         
+    def _ensure_indexes(self):
+        """
+        Indexes for claiming ended calls by call_id, rebuilding rollups by
+        business and time, and finding calls not counted yet.
+        """
+        try:
+            self.db.call_transcripts.create_index("call_id")
+            self.db.call_transcripts.create_index([("business_id", 1), ("created_at", 1)])
+            self.db.call_transcripts.create_index("rolled_up_at")
+        except Exception as e:
+            logger.error(f"Error creating call transcript indexes: {str(e)}")
+            
     def create_call_transcript(self, transcript_data: Dict[str, Any]) -> bool:
         """Create a new call transcript."""
         try:
@@ -258,6 +271,115 @@ class CallRepository:
             logger.error(f"Error getting calls by business: {str(e)}")
             return []
             
+    def claim_call_for_rollup(self, call_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a call as counted in the daily rollups.
+        
+        The mark is set atomically, so a call that is ended twice, or by two
+        workers at once, is only counted once.
+        
+        Returns:
+            dict: The call's rollup fields, or None if the call is unknown or already counted
+        """
+        try:
+            return self.db.call_transcripts.find_one_and_update(
+                {"call_id": call_id, "rolled_up_at": {"$exists": False}},
+                {"$set": {"rolled_up_at": datetime.utcnow()}},
+                projection={"full_recording_transcript": 0}
+            )
+        except Exception as e:
+            logger.error(f"Error claiming call for rollup: {str(e)}")
+            raise
+            
+    def release_call_rollup(self, call_id: str) -> bool:
+        """Undo claim_call_for_rollup for a call whose rollup update failed."""
+        try:
+            result = self.db.call_transcripts.update_one(
+                {"call_id": call_id},
+                {"$unset": {"rolled_up_at": ""}}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Error releasing call rollup claim: {str(e)}")
+            raise
+            
+    def aggregate_calls(self, business_id: str, since: datetime, stages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run an aggregation over a business's calls created since a given time.
+        
+        The leading $match is on (business_id, created_at), so the pipeline
+        starts from an index range scan.
+        
+        Args:
+            business_id: The business whose calls are aggregated
+            since: Start of the window (UTC), inclusive
+            stages: Pipeline stages applied to the matched calls
+            
+        Returns:
+            list: The pipeline's output documents
+        """
+        try:
+            pipeline = [{"$match": {"business_id": business_id, "created_at": {"$gte": since}}}] + stages
+            return list(self.db.call_transcripts.aggregate(pipeline, allowDiskUse=True))
+        except Exception as e:
+            logger.error(f"Error aggregating calls: {str(e)}")
+            raise
+            
+    def get_business_ids_with_calls(self) -> List[str]:
+        """Every business that has calls."""
+        try:
+            return [business_id for business_id in self.db.call_transcripts.distinct("business_id") if business_id]
+        except Exception as e:
+            logger.error(f"Error listing businesses with calls: {str(e)}")
+            raise
+            
+    def find_uncounted_call_ids(self, limit: int) -> List[str]:
+        """Ids of ended calls (with a duration) not yet counted in the daily rollups."""
+        try:
+            cursor = self.db.call_transcripts.find(
+                {"rolled_up_at": {"$exists": False}, "duration": {"$nin": [None, ""]}},
+                {"_id": 0, "call_id": 1}
+            ).limit(limit)
+            return [call["call_id"] for call in cursor if call.get("call_id")]
+        except Exception as e:
+            logger.error(f"Error finding uncounted calls: {str(e)}")
+            raise
+            
+    def find_calls_for_rollup(self, business_id: str, since: datetime):
+        """Iterate a business's calls created since a given time, without their recording transcripts."""
+        try:
+            return self.db.call_transcripts.find(
+                {"business_id": business_id, "created_at": {"$gte": since}},
+                {"full_recording_transcript": 0}
+            )
+        except Exception as e:
+            logger.error(f"Error finding calls for rollup: {str(e)}")
+            raise
+            
+    def mark_calls_rolled_up(self, call_ids: List[str]) -> int:
+        """Mark calls as counted in the daily rollups."""
+        try:
+            result = self.db.call_transcripts.update_many(
+                {"call_id": {"$in": call_ids}, "rolled_up_at": {"$exists": False}},
+                {"$set": {"rolled_up_at": datetime.utcnow()}}
+            )
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"Error marking calls rolled up: {str(e)}")
+            raise
+            
+    def set_call_term_counts(self, call_id: str, term_counts: Dict[str, int]) -> bool:
+        """Store the keyword counts of a call's transcript, as counted into the rollups."""
+        try:
+            result = self.db.call_transcripts.update_one(
+                {"call_id": call_id},
+                {"$set": {"term_counts": term_counts}}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Error setting call term counts: {str(e)}")
+            return False
+            
     def delete_call_transcript(self, call_id: str) -> bool:
         """Delete a call transcript."""
         try:
@@ -0,0 +1,180 @@
+# app/repositories/call_rollup_repository.py
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+from pymongo import MongoClient, ReplaceOne
+import os
+from datetime import datetime
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class CallRollupRepository:
+    """
+    Repository for per-business daily call metrics.
+
+    call_daily_rollups holds one document per (business_id, day), where day
+    is the UTC date as "YYYY-MM-DD". Calls are added to it with atomic
+    $inc/$min/$max updates when they end, so reading a window of days
+    never touches the calls themselves.
+    """
+
+    def __init__(self):
+        """Initialize the repository with MongoDB connection"""
+        try:
+            from ..utils.secrets import get_secret
+            mongodb_url = get_secret("mongodb-connection")
+            if not mongodb_url:
+                mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+        except (ImportError, ModuleNotFoundError):
+            # Fall back to environment variable
+            mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+
+        self.client = MongoClient(mongodb_url)
+        self.db = self.client.sloane_ai_service
+        self._ensure_indexes()
+
+    def _ensure_indexes(self):
+        """
+        One rollup per (business_id, day): concurrent upserts for a new day
+        would otherwise each insert their own document.
+        """
+        try:
+            self.db.call_daily_rollups.create_index([("business_id", 1), ("day", 1)], unique=True)
+        except Exception as e:
+            logger.error(f"Error creating call rollup indexes: {str(e)}")
+
+    def apply_update(self, business_id: str, day: str, update: Dict[str, Any]) -> bool:
+        """
+        Apply an update document to one day's rollup, creating it if needed.
+
+        Args:
+            business_id: The business the call belongs to
+            day: UTC date as "YYYY-MM-DD"
+            update: $inc/$min/$max update built from one call
+        """
+        try:
+            # Copy the operator dicts too: the caller's update is left as it was
+            update = {operator: dict(fields) for operator, fields in update.items()}
+            update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+            update.setdefault("$inc", {})["version"] = 1
+            self.db.call_daily_rollups.update_one(
+                {"business_id": business_id, "day": day},
+                update,
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error updating call rollup: {str(e)}")
+            raise
+
+    def replace_rollups(self, business_id: str, rollups: List[Dict[str, Any]], since_day: str) -> int:
+        """
+        Replace a business's rollups from since_day on with freshly computed ones.
+
+        A replaced day keeps counting its version up from the old document's,
+        so an ETag built from (day, version) never repeats across a rebuild.
+
+        Returns:
+            int: Number of rollup documents written
+        """
+        try:
+            now = datetime.utcnow()
+            query = {"business_id": business_id, "day": {"$gte": since_day}}
+            versions = {
+                rollup["day"]: rollup.get("version") or 0
+                for rollup in self.db.call_daily_rollups.find(query, {"_id": 0, "day": 1, "version": 1})
+            }
+            operations = []
+            for rollup in rollups:
+                document = dict(rollup, business_id=business_id, updated_at=now,
+                                version=versions.get(rollup["day"], 0) + 1)
+                operations.append(ReplaceOne(
+                    {"business_id": business_id, "day": rollup["day"]},
+                    document,
+                    upsert=True
+                ))
+            if operations:
+                self.db.call_daily_rollups.bulk_write(operations, ordered=False)
+            self.db.call_daily_rollups.delete_many(
+                dict(query, day={"$gte": since_day, "$nin": [rollup["day"] for rollup in rollups]})
+            )
+            return len(operations)
+        except Exception as e:
+            logger.error(f"Error replacing call rollups: {str(e)}")
+            raise
+
+    def get_rollups(self, business_id: str, since_day: str, fields: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get a business's daily rollups from since_day (inclusive), oldest first.
+
+        Args:
+            business_id: The business whose rollups are read
+            since_day: First day of the window as "YYYY-MM-DD"
+            fields: Only return these fields (and day); all fields if None
+        """
+        try:
+            projection = {"_id": 0}
+            if fields is not None:
+                projection.update({field: 1 for field in ["day"] + list(fields)})
+            cursor = self.db.call_daily_rollups.find(
+                {"business_id": business_id, "day": {"$gte": since_day}},
+                projection
+            ).sort("day", 1)
+            return list(cursor)
+        except Exception as e:
+            logger.error(f"Error getting call rollups: {str(e)}")
+            raise
+
+    def get_rollup_versions(self, business_id: str, since_day: str) -> List[Any]:
+        """
+        (day, version, updated_at) of a business's rollups from since_day on, oldest first.
+
+        Every update to a rollup increments its version and sets updated_at,
+        so this changes whenever any metric in the window does, including
+        when a day is deleted and later recreated.
+        """
+        try:
+            cursor = self.db.call_daily_rollups.find(
+                {"business_id": business_id, "day": {"$gte": since_day}},
+                {"_id": 0, "day": 1, "version": 1, "updated_at": 1}
+            ).sort("day", 1)
+            return [(rollup["day"], rollup.get("version"), rollup.get("updated_at")) for rollup in cursor]
+        except Exception as e:
+            logger.error(f"Error getting call rollup versions: {str(e)}")
+            raise
+
+    def set_covered_since(self, business_id: str, since_day: str) -> bool:
+        """
+        Record that a business's rollups hold every call from since_day on,
+        after a rebuild from that day; an earlier day already recorded is kept.
+        """
+        try:
+            self.db.call_rollup_state.update_one(
+                {"_id": business_id},
+                {"$min": {"covered_since": since_day}, "$set": {"rebuilt_at": datetime.utcnow()}},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error recording call rollup coverage: {str(e)}")
+            raise
+
+    def get_covered_since(self, business_id: str) -> Optional[str]:
+        """First day ("YYYY-MM-DD") from which the business's rollups hold every call, or None if never rebuilt."""
+        try:
+            state = self.db.call_rollup_state.find_one({"_id": business_id}, {"covered_since": 1})
+            return state.get("covered_since") if state else None
+        except Exception as e:
+            logger.error(f"Error getting call rollup coverage: {str(e)}")
+            raise
+
+    def get_covered_business_ids(self, business_ids: Iterable[str]) -> Set[str]:
+        """The given businesses whose rollups have been rebuilt."""
+        try:
+            cursor = self.db.call_rollup_state.find({"_id": {"$in": list(business_ids)}}, {"_id": 1})
+            return {state["_id"] for state in cursor}
+        except Exception as e:
+            logger.error(f"Error getting covered businesses: {str(e)}")
+            raise
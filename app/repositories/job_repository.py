@@ -0,0 +1,117 @@
+# app/repositories/job_repository.py
+
+import logging
+from typing import Any, Dict, Optional
+from pymongo import MongoClient
+import os
+from datetime import datetime
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class JobRepository:
+    """
+    Repository for scrape job status, shared by every worker and instance.
+
+    scrape_jobs holds one document per job with its items, status and
+    progress; scrape_job_items holds each finished item's result, so a large
+    batch never runs into the document size limit. Both expire with a TTL
+    index on expires_at.
+    """
+
+    def __init__(self):
+        """Initialize the repository with MongoDB connection"""
+        try:
+            from ..utils.secrets import get_secret
+            mongodb_url = get_secret("mongodb-connection")
+            if not mongodb_url:
+                mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+        except (ImportError, ModuleNotFoundError):
+            # Fall back to environment variable
+            mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+
+        self.client = MongoClient(mongodb_url)
+        self.db = self.client.sloane_ai_service
+        self._ensure_indexes()
+
+    def _ensure_indexes(self):
+        """TTL indexes for both collections, and item lookup by job."""
+        try:
+            self.db.scrape_jobs.create_index("expires_at", expireAfterSeconds=0)
+            self.db.scrape_job_items.create_index("expires_at", expireAfterSeconds=0)
+            self.db.scrape_job_items.create_index([("job_id", 1), ("index", 1)], unique=True)
+        except Exception as e:
+            logger.error(f"Error creating scrape job indexes: {str(e)}")
+
+    def create_job(self, status: Dict[str, Any], items: list, expires_at: datetime) -> bool:
+        """
+        Store a new job.
+
+        Args:
+            status: Job.to_dict(include_results=False)
+            items: The job's item parameters
+            expires_at: When MongoDB may delete the job
+        """
+        try:
+            document = dict(status, _id=status["job_id"], items=items, expires_at=expires_at)
+            self.db.scrape_jobs.insert_one(document)
+            return True
+        except Exception as e:
+            logger.error(f"Error storing scrape job: {str(e)}")
+            raise
+
+    def update_job(self, job_id: str, status: Dict[str, Any]) -> bool:
+        """Replace a stored job's status, progress and timestamps."""
+        try:
+            fields = {k: v for k, v in status.items() if k != "job_id"}
+            result = self.db.scrape_jobs.update_one({"_id": job_id}, {"$set": fields})
+            return result.matched_count > 0
+        except Exception as e:
+            logger.error(f"Error updating scrape job: {str(e)}")
+            raise
+
+    def save_item_result(self, job_id: str, index: int, result: Any, error: Optional[str],
+                         expires_at: datetime) -> bool:
+        """Store the result of one finished job item."""
+        try:
+            self.db.scrape_job_items.update_one(
+                {"job_id": job_id, "index": index},
+                {"$set": {"result": result, "error": error, "expires_at": expires_at}},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error storing scrape job item: {str(e)}")
+            raise
+
+    def get_job(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored job in the form of Job.to_dict.
+
+        Returns:
+            dict: The job, with per-item results if requested, or None if unknown
+        """
+        try:
+            document = self.db.scrape_jobs.find_one({"_id": job_id}, {"_id": 0, "expires_at": 0})
+            if not document:
+                return None
+
+            items = document.pop("items", [])
+            if include_results:
+                finished = {
+                    entry["index"]: entry
+                    for entry in self.db.scrape_job_items.find({"job_id": job_id}, {"_id": 0})
+                }
+                document["results"] = [
+                    {
+                        "item": item,
+                        "result": finished.get(index, {}).get("result"),
+                        "error": finished.get(index, {}).get("error")
+                    }
+                    for index, item in enumerate(items)
+                ]
+            return document
+        except Exception as e:
+            logger.error(f"Error getting scrape job: {str(e)}")
+            raise
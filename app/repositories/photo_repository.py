@@ -0,0 +1,103 @@
+# app/repositories/photo_repository.py
+
+import logging
+from typing import Dict, Optional, Tuple
+from pymongo import MongoClient
+import gridfs
+import os
+from datetime import datetime
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class PhotoRepository:
+    """
+    Repository for cached GBP photos.
+
+    Image bytes live in GridFS under their sha256 digest, so a photo that
+    several places (or several photo references) share is stored once. The
+    photo_refs collection remembers which digests a Places photo reference
+    resolved to, so a known reference is never downloaded again.
+    """
+
+    def __init__(self):
+        """Initialize the repository with MongoDB connection"""
+        try:
+            from ..utils.secrets import get_secret
+            mongodb_url = get_secret("mongodb-connection")
+            if not mongodb_url:
+                mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+        except (ImportError, ModuleNotFoundError):
+            # Fall back to environment variable
+            mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+
+        self.client = MongoClient(mongodb_url)
+        self.db = self.client.sloane_ai_service
+        self.fs = gridfs.GridFS(self.db, collection="gbp_photos")
+
+    def has_photo(self, content_hash: str) -> bool:
+        """Check whether image bytes with this digest are stored."""
+        try:
+            return self.fs.exists(content_hash)
+        except Exception as e:
+            logger.error(f"Error checking cached photo: {str(e)}")
+            raise
+
+    def save_photo(self, content_hash: str, data: bytes, content_type: str) -> bool:
+        """
+        Store image bytes under their digest
+
+        Returns:
+            bool: True if the bytes were new, False if they were already stored
+        """
+        try:
+            if self.fs.exists(content_hash):
+                return False
+            self.fs.put(data, _id=content_hash, metadata={"content_type": content_type})
+            return True
+        except gridfs.errors.FileExists:
+            # Stored concurrently by another worker
+            return False
+        except Exception as e:
+            logger.error(f"Error saving cached photo: {str(e)}")
+            raise
+
+    def get_photo(self, content_hash: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Get stored image bytes
+
+        Returns:
+            tuple: (bytes, content type), or None if the digest is unknown
+        """
+        try:
+            grid_out = self.fs.get(content_hash)
+            return grid_out.read(), (grid_out.metadata or {}).get("content_type", "image/jpeg")
+        except gridfs.errors.NoFile:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading cached photo: {str(e)}")
+            raise
+
+    def get_photo_ref(self, photo_reference: str) -> Optional[Dict[str, str]]:
+        """Digests a Places photo reference resolved to, if it was cached before."""
+        try:
+            return self.db.photo_refs.find_one({"_id": photo_reference}, {"_id": 0})
+        except Exception as e:
+            logger.error(f"Error reading photo reference: {str(e)}")
+            raise
+
+    def save_photo_ref(self, photo_reference: str, hashes: Dict[str, str]) -> bool:
+        """Remember the digests a Places photo reference resolved to."""
+        try:
+            update = dict(hashes)
+            update["cached_at"] = datetime.utcnow()
+            self.db.photo_refs.update_one(
+                {"_id": photo_reference},
+                {"$set": update},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error saving photo reference: {str(e)}")
+            raise
@@ -0,0 +1,72 @@
+# app/repositories/places_cache_repository.py
+
+import logging
+from typing import Optional, Any
+from pymongo import MongoClient
+import os
+from datetime import datetime, timedelta
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class PlacesCacheRepository:
+    """Repository for cached Google Places API responses"""
+
+    def __init__(self):
+        """Initialize the repository with MongoDB connection"""
+        try:
+            from ..utils.secrets import get_secret
+            mongodb_url = get_secret("mongodb-connection")
+            if not mongodb_url:
+                mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+        except (ImportError, ModuleNotFoundError):
+            # Fall back to environment variable
+            mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
+
+        self.client = MongoClient(mongodb_url)
+        self.db = self.client.sloane_ai_service
+        self._ensure_indexes()
+
+    def _ensure_indexes(self):
+        """TTL index: MongoDB deletes entries once expires_at has passed."""
+        try:
+            self.db.places_cache.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            logger.error(f"Error creating Places cache indexes: {str(e)}")
+
+    def get_entry(self, key: str) -> Optional[Any]:
+        """Get a cached value if it has not expired."""
+        try:
+            doc = self.db.places_cache.find_one({
+                "_id": key,
+                "expires_at": {"$gt": datetime.utcnow()}
+            })
+            return doc.get("value") if doc else None
+
+        except Exception as e:
+            logger.error(f"Error reading Places cache: {str(e)}")
+            return None
+
+    def set_entry(self, key: str, kind: str, value: Any, ttl_seconds: int) -> bool:
+        """Store a value; MongoDB's TTL index removes it after it expires."""
+        try:
+            now = datetime.utcnow()
+            self.db.places_cache.update_one(
+                {"_id": key},
+                {
+                    "$set": {
+                        "kind": kind,
+                        "value": value,
+                        "cached_at": now,
+                        "expires_at": now + timedelta(seconds=ttl_seconds)
+                    }
+                },
+                upsert=True
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error writing Places cache: {str(e)}")
+            return False
+
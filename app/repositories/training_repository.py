@@ -4,6 +4,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from pymongo import MongoClient
 import os
+from datetime import datetime
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -31,6 +32,7 @@ class TrainingRepository:
         try:
             # Add business ID to training data
             training_data["business_id"] = business_id
+            training_data["updated_at"] = datetime.utcnow()
             
             # Check if training data already exists for this business
             existing = self.db.ai_training.find_one({
@@ -54,6 +56,19 @@ class TrainingRepository:
             logger.error(f"Error saving training data: {str(e)}")
             return False
             
+    def update_training_sections(self, business_id: str, source: str, sections: Dict[str, Any]) -> bool:
+        """Update only the given sections of a source's training data."""
+        try:
+            result = self.db.ai_training.update_one(
+                {"business_id": business_id, "source": source},
+                {"$set": dict(sections, updated_at=datetime.utcnow())}
+            )
+            return result.matched_count > 0
+                
+        except Exception as e:
+            logger.error(f"Error updating training data sections: {str(e)}")
+            return False
+            
     def get_training_data(self, business_id: str, source: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get training data for a business."""
         try:
@@ -76,6 +91,22 @@ class TrainingRepository:
             logger.error(f"Error getting training data: {str(e)}")
             return []
             
+    def get_training_version(self, business_id: str, source: Optional[str] = None) -> List[Any]:
+        """
+        Cheap version of a business's training data: each document's id and
+        updated_at, which every write sets. Changes whenever a document is
+        added, changed or removed.
+        """
+        try:
+            query = {"business_id": business_id}
+            if source:
+                query["source"] = source
+            cursor = self.db.ai_training.find(query, {"updated_at": 1}).sort("_id", 1)
+            return [(str(doc["_id"]), doc.get("updated_at")) for doc in cursor]
+        except Exception as e:
+            logger.error(f"Error getting training data version: {str(e)}")
+            raise
+            
     def get_combined_training_data(self, business_id: str) -> Dict[str, Any]:
         """Get combined training data from all sources for a business."""
         try:
@@ -123,13 +154,13 @@ class TrainingRepository:
                 if data.get("contact_info"):
                     combined_data["contact_info"].update(data["contact_info"])
                     
-            # Remove duplicates from lists
+            # Remove duplicates from lists, keeping first-seen order so the response is stable
             combined_data["example_qa"] = list({str(qa): qa for qa in combined_data["example_qa"]}.values())
-            combined_data["common_phrases"] = list(set(combined_data["common_phrases"]))
-            combined_data["keywords"] = list(set(combined_data["keywords"]))
-            combined_data["services"] = list(set(combined_data["services"]))
-            combined_data["products"] = list(set(combined_data["products"]))
-            combined_data["policies"] = list(set(combined_data["policies"]))
+            combined_data["common_phrases"] = list(dict.fromkeys(combined_data["common_phrases"]))
+            combined_data["keywords"] = list(dict.fromkeys(combined_data["keywords"]))
+            combined_data["services"] = list(dict.fromkeys(combined_data["services"]))
+            combined_data["products"] = list(dict.fromkeys(combined_data["products"]))
+            combined_data["policies"] = list(dict.fromkeys(combined_data["policies"]))
             
             return combined_data
             
@@ -178,7 +209,7 @@ class TrainingRepository:
                         qa["answer"] = answer
                         self.db.ai_training.update_one(
                             {"_id": manual_data["_id"]},
-                            {"$set": {"example_qa": example_qa}}
+                            {"$set": {"example_qa": example_qa, "updated_at": datetime.utcnow()}}
                         )
                         return True
                         
@@ -186,7 +217,7 @@ class TrainingRepository:
                 example_qa.append(qa_pair)
                 self.db.ai_training.update_one(
                     {"_id": manual_data["_id"]},
-                    {"$set": {"example_qa": example_qa}}
+                    {"$set": {"example_qa": example_qa, "updated_at": datetime.utcnow()}}
                 )
                 return True
             else:
@@ -224,7 +255,7 @@ class TrainingRepository:
             # Update manual training data
             self.db.ai_training.update_one(
                 {"_id": manual_data["_id"]},
-                {"$set": {"example_qa": example_qa}}
+                {"$set": {"example_qa": example_qa, "updated_at": datetime.utcnow()}}
             )
             return True
             
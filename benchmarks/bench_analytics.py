@@ -0,0 +1,213 @@
+"""
+Benchmark CallAnalytics against a MongoDB holding a large synthetic call history.
+
+Seeds --calls synthetic call_transcripts documents (default 1,000,000)
+spread over --businesses businesses and the last --history-days days into
+a separate benchmark database, creates the (business_id, created_at)
+index and builds the call_daily_rollups for every business with
+CallRollups.rebuild, then times every CallAnalytics method for one
+business at 7, 30 and 90 day windows, with the number of calls and of
+rollup documents each window covers.
+
+Needs a real MongoDB server. The data is only reseeded when the call count differs
+or --reseed is given. The production database is refused.
+
+Usage:
+    python benchmarks/bench_analytics.py [--mongodb-url mongodb://localhost:27017]
+                                         [--db bench_analytics] [--calls 1000000]
+                                         [--businesses 100] [--runs 5] [--reseed]
+                                         [--save out.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pymongo import MongoClient
+
+from app.business.analytics import CallAnalytics, window_start
+from app.business.call_rollups import CallRollups
+from app.repositories.call_repository import CallRepository
+from app.repositories.call_rollup_repository import CallRollupRepository
+
+# Per-query INFO logging would dominate the timings
+logging.disable(logging.INFO)
+
+PRODUCTION_DB = 'sloane_ai_service'
+WINDOWS = (7, 30, 90)
+INSERT_BATCH = 10000
+
+INTENTS = ['business_hours', 'schedule_appointment', 'business_location', 'service_inquiry',
+           'pricing', 'cancel_appointment', 'high_value_transfer', 'unknown']
+ENTITIES = [('DATE', ['Monday', 'Tuesday', 'Friday', 'tomorrow', 'next week']),
+            ('TIME', ['9am', '10:30', '2pm', '4:15 pm']),
+            ('MONEY', ['$50', '$120', '$300'])]
+ACTIONS = ['transfer', 'schedule_appointment', 'send_sms', 'end_call']
+CALLER_LINES = [
+    "Hi, are you open on Saturday morning?",
+    "I'd like to book a haircut for next Tuesday afternoon",
+    "How much does a deep cleaning cost?",
+    "Can I speak with the manager about my appointment",
+    "Where exactly is your office located downtown?",
+    "Do you take walk-ins or only appointments?",
+    "My sink is leaking and I need a plumber today",
+    "Is parking available near the salon?",
+]
+ASSISTANT_LINES = [
+    "Thanks for calling, how can I help you today?",
+    "We're open from 9am to 5pm Monday through Saturday.",
+    "I can book that appointment for you.",
+]
+
+# Methods timed per window, as (name, call)
+METHODS = [
+    ('get_call_volume_by_day', lambda a, b, days: a.get_call_volume_by_day(b, days)),
+    ('get_call_duration_stats', lambda a, b, days: a.get_call_duration_stats(b, days)),
+    ('get_unique_callers', lambda a, b, days: a.get_unique_callers(b, days)),
+    ('get_top_intents', lambda a, b, days: a.get_top_intents(b, days, 10)),
+    ('get_common_entities', lambda a, b, days: a.get_common_entities(b, days)),
+    ('get_call_action_metrics', lambda a, b, days: a.get_call_action_metrics(b, days)),
+    ('get_keyword_frequency', lambda a, b, days: a.get_keyword_frequency(b, days, 10)),
+    ('get_business_dashboard', lambda a, b, days: a.get_business_dashboard(b, days)),
+]
+
+
+def synthetic_call(rng, index, business_id, created_at):
+    transcript = []
+    for _ in range(rng.randint(1, 3)):
+        transcript.append({'speaker': 'ai', 'text': rng.choice(ASSISTANT_LINES)})
+        transcript.append({'speaker': 'caller', 'text': rng.choice(CALLER_LINES)})
+    entity_type, values = rng.choice(ENTITIES)
+    return {
+        'call_id': f"bench-{index}",
+        'business_id': business_id,
+        'created_at': created_at,
+        'updated_at': created_at,
+        'caller_number': f"+1512555{rng.randint(0, 9999):04d}",
+        'duration': rng.randint(5, 900) if rng.random() > 0.05 else None,
+        'detected_intents': [{'intent': rng.choice(INTENTS), 'confidence': round(rng.random(), 2)}
+                             for _ in range(rng.randint(0, 3))],
+        'extracted_entities': [{'type': entity_type, 'value': rng.choice(values)}
+                               for _ in range(rng.randint(0, 2))],
+        'actions': [{'type': rng.choice(ACTIONS)}] if rng.random() < 0.4 else [],
+        'transcript': transcript
+    }
+
+
+def seed(db, calls, businesses, history_days, rollups):
+    """Replace the benchmark calls with a fresh synthetic history and rebuild its rollups."""
+    db.call_transcripts.drop()
+    db.call_daily_rollups.drop()
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    span = history_days * 24 * 3600
+    started = time.perf_counter()
+
+    batch = []
+    for index in range(calls):
+        business_id = f"business-{rng.randrange(businesses)}"
+        created_at = now - timedelta(seconds=rng.randrange(span))
+        batch.append(synthetic_call(rng, index, business_id, created_at))
+        if len(batch) == INSERT_BATCH:
+            db.call_transcripts.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.call_transcripts.insert_many(batch, ordered=False)
+
+    # The repositories' own index setup, as in production
+    rollups.call_repo._ensure_indexes()
+    rollups.rollup_repo._ensure_indexes()
+    print(f"Seeded {calls} calls in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    since = window_start(history_days + 1)
+    for business in range(businesses):
+        rollups.rebuild(f"business-{business}", since)
+    print(f"Built {db.call_daily_rollups.estimated_document_count()} rollups "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+def time_runs(runs, func):
+    """Best and median wall time in milliseconds over `runs` calls."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'best_ms': round(min(timings), 2), 'median_ms': round(statistics.median(timings), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mongodb-url', default=os.environ.get('MONGODB_URL', 'mongodb://localhost:27017'))
+    parser.add_argument('--db', default='bench_analytics')
+    parser.add_argument('--calls', type=int, default=1000000)
+    parser.add_argument('--businesses', type=int, default=100)
+    parser.add_argument('--history-days', type=int, default=120)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--reseed', action='store_true')
+    parser.add_argument('--save', help='Write the report as JSON to this file')
+    args = parser.parse_args()
+
+    if args.db == PRODUCTION_DB:
+        sys.exit(f"Refusing to seed benchmark data into {PRODUCTION_DB}")
+
+    client = MongoClient(args.mongodb_url, serverSelectionTimeoutMS=5000)
+    db = client[args.db]
+    call_repo = CallRepository.__new__(CallRepository)
+    call_repo.client, call_repo.db = client, db
+    rollup_repo = CallRollupRepository.__new__(CallRollupRepository)
+    rollup_repo.client, rollup_repo.db = client, db
+
+    if args.reseed or db.call_transcripts.estimated_document_count() != args.calls:
+        seed(db, args.calls, args.businesses, args.history_days, CallRollups(call_repo, rollup_repo))
+
+    analytics = CallAnalytics(rollup_repo=rollup_repo, call_repo=call_repo)
+    business_id = 'business-0'
+
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'server': client.server_info().get('version'),
+            'calls': args.calls,
+            'businesses': args.businesses,
+            'runs': args.runs
+        },
+        'windows': {}
+    }
+    for days in WINDOWS:
+        calls_in_window = db.call_transcripts.count_documents(
+            {'business_id': business_id, 'created_at': {'$gte': window_start(days)}})
+        rollups_in_window = db.call_daily_rollups.count_documents(
+            {'business_id': business_id, 'day': {'$gte': window_start(days).strftime('%Y-%m-%d')}})
+        report['windows'][str(days)] = {
+            'calls': calls_in_window,
+            'rollups': rollups_in_window,
+            'methods': {name: time_runs(args.runs, lambda call=call: call(analytics, business_id, days))
+                        for name, call in METHODS}
+        }
+
+    for days, window in report['windows'].items():
+        print(f"\n{days}-day window ({window['calls']} calls, {window['rollups']} rollups for {business_id})")
+        print(f"  {'':<26} {'best ms':>10} {'median ms':>10}")
+        for name, timing in window['methods'].items():
+            print(f"  {name:<26} {timing['best_ms']:>10.2f} {timing['median_ms']:>10.2f}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nSaved report to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Benchmark requests/sec of the gunicorn worker classes under concurrent clients.
+
+Starts gunicorn with the repo's gunicorn.conf.py once per worker class
+(sync, gthread, gevent) and drives it with 10, 50 and 200 concurrent
+clients. The benchmarked route behaves like the backend's real ones: it
+waits on an upstream call made through the shared requests session
+(app/business/http_client.py), here a local stub answering after
+--upstream-ms, standing in for MongoDB, Secret Manager and Places API waits.
+
+For each worker class and client count the harness reports requests/sec,
+p50 and p99 latency and errors. Worker count, threads and connections
+come from gunicorn.conf.py and its GUNICORN_* environment variables, so
+numbers match a deployed F1 instance (one worker) by default.
+
+Usage:
+    python benchmarks/bench_concurrency.py [--duration 10] [--upstream-ms 50]
+                                           [--clients 10 50 200]
+                                           [--worker-classes sync gthread gevent]
+                                           [--save out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from flask import Flask, jsonify
+
+from app.business.http_client import get_http_session
+
+# WSGI app loaded by gunicorn as bench_concurrency:app
+app = Flask(__name__)
+
+
+@app.route('/io')
+def io_bound():
+    response = get_http_session().get(os.environ['BENCH_UPSTREAM_URL'], timeout=30)
+    return jsonify({"success": True, "upstream_status": response.status_code})
+
+
+class UpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def make_upstream_handler(delay):
+    class UpstreamHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(delay)
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return UpstreamHandler
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(worker_class, port, upstream_url):
+    env = dict(os.environ, PORT=str(port), GUNICORN_WORKER_CLASS=worker_class,
+               BENCH_UPSTREAM_URL=upstream_url, PYTHONPATH=ROOT_DIR)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT_DIR, 'gunicorn.conf.py'),
+         '--chdir', os.path.dirname(os.path.abspath(__file__)), '--log-level', 'warning',
+         'bench_concurrency:app'],
+        env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError(f"gunicorn ({worker_class}) exited with {process.returncode}")
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+
+
+def stop_gunicorn(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def drive(url, clients, duration):
+    """Keep `clients` requests in flight for `duration` seconds; returns latencies and errors."""
+    import aiohttp
+
+    latencies, errors = [], 0
+    stop_at = time.monotonic() + duration
+    connector = aiohttp.TCPConnector(limit=clients)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def client():
+            nonlocal errors
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                try:
+                    async with session.get(url) as response:
+                        await response.read()
+                        if response.status != 200:
+                            errors += 1
+                            continue
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.monotonic()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.monotonic() - started
+
+    return latencies, errors, elapsed
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_worker_class(worker_class, upstream_url, args):
+    port = free_port()
+    process = start_gunicorn(worker_class, port, upstream_url)
+    url = f"http://127.0.0.1:{port}/io"
+    results = {}
+    try:
+        # Warm up the worker and its connection pool
+        asyncio.run(drive(url, 5, 1))
+        for clients in args.clients:
+            latencies, errors, elapsed = asyncio.run(drive(url, clients, args.duration))
+            results[str(clients)] = {
+                'requests_per_sec': round(len(latencies) / elapsed, 1),
+                'p50_ms': round(statistics.median(latencies), 1) if latencies else 0.0,
+                'p99_ms': round(percentile(latencies, 0.99), 1),
+                'errors': errors
+            }
+    finally:
+        stop_gunicorn(process)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per client count')
+    parser.add_argument('--upstream-ms', type=float, default=50, help='Upstream wait per request')
+    parser.add_argument('--clients', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--worker-classes', nargs='+', default=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--save', help='Write the report as JSON to this file')
+    args = parser.parse_args()
+
+    upstream = UpstreamServer(('127.0.0.1', 0), make_upstream_handler(args.upstream_ms / 1000))
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    upstream_url = f"http://127.0.0.1:{upstream.server_port}/"
+
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'duration_s': args.duration,
+            'upstream_ms': args.upstream_ms,
+            'workers': os.environ.get('GUNICORN_WORKERS', '1')
+        },
+        'worker_classes': {}
+    }
+    try:
+        for worker_class in args.worker_classes:
+            report['worker_classes'][worker_class] = bench_worker_class(worker_class, upstream_url, args)
+    finally:
+        upstream.shutdown()
+
+    print(f"{'worker class':<14} {'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for worker_class, results in report['worker_classes'].items():
+        for clients, data in results.items():
+            print(f"{worker_class:<14} {clients:>8} {data['requests_per_sec']:>10.1f} "
+                  f"{data['p50_ms']:>10.1f} {data['p99_ms']:>10.1f} {data['errors']:>8}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nSaved report to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark for the single-pass website extraction engine.
+
+Builds a large page by repeating the bodies of the saved corpus pages and
+times parsing, indexing and every WebsiteScraper extractor on it.
+
+Usage:
+    python benchmarks/bench_extraction.py [--repeat 60] [--runs 5]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.business.extraction import PageIndex
+from app.business.parsers import parse_html
+from app.business.scrapers import WebsiteScraper
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'corpus')
+
+
+def build_large_page(repeat):
+    """Concatenate every corpus body `repeat` times inside one document."""
+    bodies = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            html = f.read().decode('utf-8', 'replace')
+        bodies.append(html.split('<body>', 1)[-1].rsplit('</body>', 1)[0])
+    return "<html><head><title>Large page</title></head><body>%s</body></html>" % ("".join(bodies) * repeat)
+
+
+def best_of(runs, func):
+    """Best wall time in seconds over `runs` calls."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=60)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    html = build_large_page(args.repeat)
+    content = html.encode('utf-8')
+    scraper = WebsiteScraper(business_repo=object(), training_repo=object())
+    soup = parse_html(content, 'utf-8')
+    page = PageIndex(soup)
+    domain = 'example.com'
+
+    timings = [
+        ('parse (html.parser)', lambda: parse_html(content, 'utf-8', 'html.parser')),
+        ('parse (lxml)', lambda: parse_html(content, 'utf-8', 'lxml')),
+        ('PageIndex', lambda: PageIndex(soup)),
+        ('_get_title', lambda: scraper._get_title(page)),
+        ('_get_meta_description', lambda: scraper._get_meta_description(page)),
+        ('_extract_services', lambda: scraper._extract_services(page)),
+        ('_extract_contact_info', lambda: scraper._extract_contact_info(page, domain)),
+        ('_extract_hours', lambda: scraper._extract_hours(page)),
+        ('_extract_faq', lambda: scraper._extract_faq(page)),
+        ('_extract_about', lambda: scraper._extract_about(page)),
+        ('_extract_clean_text', lambda: scraper._extract_clean_text(page)),
+    ]
+
+    print(f"Page size: {len(html) / 1024:.0f} KB")
+    for name, func in timings:
+        print(f"{name:<24} {best_of(args.runs, func) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
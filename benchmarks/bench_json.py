@@ -0,0 +1,201 @@
+"""
+Benchmark JSON encoding of large business_data responses.
+
+Builds two synthetic payloads shaped like the backend's heaviest
+responses, as the repositories return them (ObjectId _ids, naive UTC
+datetimes):
+
+  * training-data: one ai_training document per source (website, gbp,
+    manual) with --raw-text-kb of scraped raw_text and page text each,
+    plus services, FAQ and hours sections
+  * call-list: --calls call_transcripts documents with --turns transcript
+    turns each, intents, entities and actions
+
+and times app.json.response() on each with:
+
+  * flask-json: Flask's default provider with the BSON-aware default
+    function (the default provider alone cannot encode ObjectId at all)
+  * mongo-json: MongoJSONProvider without orjson, i.e. its json fallback
+  * mongo-orjson: MongoJSONProvider with orjson
+
+Every provider's output is decoded and compared with flask-json's, so
+the speedup is for identical data.
+
+Usage:
+    python benchmarks/bench_json.py [--runs 20] [--calls 500] [--turns 40]
+                                    [--raw-text-kb 200] [--save out.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.api import json_provider
+from app.api.json_provider import MongoJSONProvider, mongo_default
+
+logging.disable(logging.WARNING)
+
+WORDS = ("we offer same day appointments for haircuts coloring and styling our team of licensed "
+         "stylists has served the downtown area since walk-ins welcome café crème brûlée 24/7 "
+         "call us at (512) 555-0100 or book online parking is free after 6pm").split()
+
+
+class FlaskBSONProvider(DefaultJSONProvider):
+    """Flask's stock provider, taught the same BSON types for comparison."""
+    default = staticmethod(mongo_default)
+
+
+def text(rng, kb):
+    words, size = [], 0
+    while size < kb * 1024:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def training_data_payload(rng, raw_text_kb):
+    now = datetime.utcnow()
+    documents = []
+    for source in ("website", "gbp", "manual"):
+        documents.append({
+            "_id": ObjectId(),
+            "business_id": "business-0",
+            "source": source,
+            "title": "Downtown Salon & Spa",
+            "description": text(rng, 1),
+            "raw_text": text(rng, raw_text_kb),
+            "pages": [{"url": f"https://example.com/page-{index}", "title": f"Page {index}",
+                       "text": text(rng, raw_text_kb // 10)} for index in range(10)],
+            "services": [{"name": f"Service {index}", "description": text(rng, 0.3),
+                          "price": f"${rng.randint(20, 300)}"} for index in range(40)],
+            "faq": [{"question": text(rng, 0.1) + "?", "answer": text(rng, 0.5)} for _ in range(30)],
+            "hours": {day: "9:00 AM - 5:00 PM" for day in ("monday", "tuesday", "wednesday", "thursday",
+                                                           "friday", "saturday", "sunday")},
+            "created_at": now - timedelta(days=30),
+            "updated_at": now,
+        })
+    return {"success": True, "data": documents}
+
+
+def call_list_payload(rng, calls, turns):
+    now = datetime.utcnow()
+    documents = []
+    for index in range(calls):
+        created_at = now - timedelta(minutes=rng.randrange(60 * 24 * 30))
+        documents.append({
+            "_id": ObjectId(),
+            "call_id": f"CA{index:032x}",
+            "business_id": "business-0",
+            "caller_number": f"+1512555{rng.randint(0, 9999):04d}",
+            "duration": rng.randint(5, 900),
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(minutes=5),
+            "transcript": [{"speaker": "ai" if turn % 2 else "caller", "text": text(rng, 0.15),
+                            "timestamp": created_at + timedelta(seconds=turn * 6)} for turn in range(turns)],
+            "detected_intents": [{"intent": "schedule_appointment", "confidence": round(rng.random(), 2)}],
+            "extracted_entities": [{"type": "DATE", "value": "next Tuesday"}],
+            "actions": [{"type": "schedule_appointment", "status": "completed"}],
+        })
+    return {"success": True, "data": documents}
+
+
+def encode_with(app, payload):
+    with app.app_context():
+        return app.json.response(payload).get_data()
+
+
+def time_runs(runs, func):
+    """Best and median wall time in milliseconds over `runs` calls."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'best_ms': round(min(timings), 2), 'median_ms': round(statistics.median(timings), 2)}
+
+
+def bench_payload(payload, runs):
+    flask_app = Flask('flask-json')
+    flask_app.json = FlaskBSONProvider(flask_app)
+    mongo_app = Flask('mongo-json')
+    mongo_app.json = MongoJSONProvider(mongo_app)
+
+    orjson = json_provider.orjson
+    reference = json.loads(encode_with(flask_app, payload))
+    results = {}
+    for name, app, use_orjson in (("flask-json", flask_app, False), ("mongo-json", mongo_app, False),
+                                  ("mongo-orjson", mongo_app, True)):
+        if use_orjson and orjson is None:
+            results[name] = {'error': 'orjson is not installed'}
+            continue
+        json_provider.orjson = orjson if use_orjson else None
+        try:
+            body = encode_with(app, payload)
+            if json.loads(body) != reference:
+                raise AssertionError(f"{name} output differs from flask-json")
+            timing = time_runs(runs, lambda: encode_with(app, payload))
+        finally:
+            json_provider.orjson = orjson
+        timing['bytes'] = len(body)
+        timing['mb_per_s'] = round(len(body) / 1e6 / (timing['median_ms'] / 1000), 1)
+        results[name] = timing
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--turns', type=int, default=40)
+    parser.add_argument('--raw-text-kb', type=int, default=200)
+    parser.add_argument('--save', help='Write the report as JSON to this file')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    payloads = {
+        'training-data': training_data_payload(rng, args.raw_text_kb),
+        'call-list': call_list_payload(rng, args.calls, args.turns),
+    }
+
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'orjson': getattr(json_provider.orjson, '__version__', None),
+            'runs': args.runs
+        },
+        'payloads': {name: bench_payload(payload, args.runs) for name, payload in payloads.items()}
+    }
+
+    for name, results in report['payloads'].items():
+        print(f"\n{name}")
+        print(f"  {'provider':<14} {'bytes':>10} {'best ms':>10} {'median ms':>10} {'MB/s':>8}")
+        for provider, timing in results.items():
+            if 'error' in timing:
+                print(f"  {provider:<14} {timing['error']}")
+                continue
+            print(f"  {provider:<14} {timing['bytes']:>10} {timing['best_ms']:>10.2f} "
+                  f"{timing['median_ms']:>10.2f} {timing['mb_per_s']:>8.1f}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nSaved report to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
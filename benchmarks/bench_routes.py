@@ -0,0 +1,143 @@
+"""
+Benchmark per-request overhead of the business_data routes.
+
+Two numbers matter for a route's fixed cost:
+
+  * construction: what it costs to build each service the routes use
+    (scrapers, repositories, call handler, analytics) from scratch. Before
+    the app-scoped service container, every request paid this; with it, only
+    the first request of a worker does. Repositories look their connection
+    string up in Secret Manager and GBPScraper its API key, so this is
+    dominated by those lookups wherever they are slow.
+  * route overhead: the wall time of a request through the Flask test
+    client when every service is an in-memory stand-in that does no work,
+    i.e. routing, JSON handling and the container lookup.
+
+Services that cannot be built here (no Secret Manager access, a missing
+module) are reported with their error and the time it took to fail.
+
+Usage:
+    python benchmarks/bench_routes.py [--requests 2000] [--construct-runs 3]
+                                      [--skip-construct] [--save out.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+
+from app.api.routes.business_data import router
+from app.api.services import SERVICE_FACTORIES, ServiceContainer, init_services
+
+# Per-request INFO logging would dominate the timings
+logging.disable(logging.INFO)
+
+# (method, path, JSON body) requested through the test client
+ROUTES = [
+    ('POST', '/api/business/scrape-website', {'website_url': 'https://example.com'}),
+    ('POST', '/api/business/scrape-gbp', {'business_name': 'Example', 'location': 'Austin', 'tier': 'hours'}),
+    ('GET', '/api/business/training-data', None),
+    ('POST', '/api/business/training-data/qa', {'question': 'Open Sundays?', 'answer': 'No.'}),
+    ('GET', '/api/business/photos/' + '0' * 64, None),
+    ('POST', '/api/business/call', {'caller_number': '+15125550100', 'twilio_sid': 'CA123'}),
+    ('POST', '/api/business/call/c1/speech', {'speech_text': 'Are you open today?'}),
+    ('GET', '/api/business/analytics/call-volume', None),
+    ('GET', '/api/business/analytics/dashboard', None),
+]
+
+
+class StandIn:
+    """Service stand-in: every method returns a small successful result without doing any work"""
+
+    def __getattr__(self, name):
+        if name == 'get_photo':
+            return lambda *args, **kwargs: (b'\xff\xd8\xff', 'image/jpeg')
+        return lambda *args, **kwargs: {'success': True}
+
+
+def time_construction(runs):
+    """Best wall time in milliseconds to build each service in a fresh container."""
+    results = {}
+    for name in SERVICE_FACTORIES:
+        timings, error = [], None
+        for _ in range(runs):
+            start = time.perf_counter()
+            try:
+                ServiceContainer().get(name)
+            except Exception as e:
+                error = f"{type(e).__name__}: {str(e)}"
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {'best_ms': round(min(timings), 3), 'error': error}
+    return results
+
+
+def time_routes(requests_per_route):
+    """Best and median wall time in microseconds of each route with stand-in services."""
+    app = Flask(__name__)
+    app.register_blueprint(router)
+    container = init_services(app, ServiceContainer())
+    for name in SERVICE_FACTORIES:
+        container.override(name, StandIn())
+
+    client = app.test_client()
+    results = {}
+    for method, path, body in ROUTES:
+        timings = []
+        for _ in range(requests_per_route):
+            start = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            timings.append((time.perf_counter() - start) * 1e6)
+        results[f"{method} {path}"] = {
+            'status': response.status_code,
+            'best_us': round(min(timings), 1),
+            'median_us': round(statistics.median(timings), 1)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per route')
+    parser.add_argument('--construct-runs', type=int, default=3, help='Builds per service')
+    parser.add_argument('--skip-construct', action='store_true', help='Only measure route overhead')
+    parser.add_argument('--save', help='Write the report as JSON to this file')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'requests': args.requests
+        },
+        'routes': time_routes(args.requests)
+    }
+
+    print(f"{'route (stand-in services)':<58} {'status':>6} {'best us':>9} {'median us':>10}")
+    for route, timing in report['routes'].items():
+        label = route if len(route) <= 58 else route[:55] + '...'
+        print(f"{label:<58} {timing['status']:>6} {timing['best_us']:>9.1f} {timing['median_us']:>10.1f}")
+
+    if not args.skip_construct:
+        report['construction'] = time_construction(args.construct_runs)
+        print(f"\n{'service construction (paid once per worker)':<58} {'best ms':>9}")
+        for name, timing in report['construction'].items():
+            note = f"  ({timing['error'][:60]})" if timing['error'] else ''
+            print(f"{name:<58} {timing['best_ms']:>9.1f}{note}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nSaved report to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
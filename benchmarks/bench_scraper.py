@@ -0,0 +1,293 @@
+"""
+Benchmark WebsiteScraper over the recorded corpus, served from a local HTTP stub.
+
+Every benchmarks/corpus/<site>.html is served as the home page of its own
+local site; benchmarks/corpus/<site>/<page>.html files are served at
+/<page>, /<page>/ and /<page>.html so crawl mode can follow the site's
+links. For each site the harness reports:
+
+  * the best wall time of every extractor (_extract_services, _extract_hours,
+    _extract_faq, _extract_clean_text, ...) on the home page
+  * the best wall time of the whole scrape_website
+  * the peak traced memory (tracemalloc) of one scrape_website
+
+Save a run with --save and compare a later run with --compare to see time
+and memory changes and any difference in the extracted output. Parser or
+extractor changes should come with these numbers.
+
+Usage:
+    python benchmarks/bench_scraper.py [--runs 5] [--no-crawl] [--parser lxml]
+                                       [--save out.json] [--compare baseline.json]
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.business.scrapers import WebsiteScraper
+
+# Per-request INFO logging would dominate the timings
+logging.disable(logging.INFO)
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'corpus')
+
+# Extractors timed on each home page, as (name, call)
+EXTRACTORS = [
+    ('_index_page', lambda s, content, page, domain: s._index_page(content, None)),
+    ('_get_title', lambda s, content, page, domain: s._get_title(page)),
+    ('_get_meta_description', lambda s, content, page, domain: s._get_meta_description(page)),
+    ('_extract_services', lambda s, content, page, domain: s._extract_services(page)),
+    ('_extract_contact_info', lambda s, content, page, domain: s._extract_contact_info(page, domain)),
+    ('_extract_hours', lambda s, content, page, domain: s._extract_hours(page)),
+    ('_extract_faq', lambda s, content, page, domain: s._extract_faq(page)),
+    ('_extract_about', lambda s, content, page, domain: s._extract_about(page)),
+    ('_extract_clean_text', lambda s, content, page, domain: s._extract_clean_text(page)),
+    ('extract_page', lambda s, content, page, domain: s.extract_page(content, None, domain)),
+]
+
+# Output fields that change from run to run and are left out of the diff
+VOLATILE_FIELDS = ('scraped_at', 'last_updated', 'updated_at', 'created_at', '_id')
+
+
+class MemoryBusinessRepository:
+    """In-memory stand-in for BusinessRepository so runs never touch MongoDB"""
+
+    def __init__(self):
+        self.website_data = {}
+        self.scrape_state = {}
+
+    def get_scrape_state(self, business_id, url):
+        return self.scrape_state.get((business_id, url))
+
+    def save_scrape_state(self, business_id, url, state):
+        self.scrape_state[(business_id, url)] = state
+        return True
+
+    def save_website_data(self, business_id, website_data):
+        self.website_data[business_id] = dict(website_data)
+        return business_id
+
+    def update_website_sections(self, business_id, url, sections):
+        if business_id not in self.website_data:
+            return False
+        self.website_data[business_id].update(sections)
+        return True
+
+    def get_website_data(self, business_id):
+        data = self.website_data.get(business_id)
+        return [data] if data else []
+
+
+class MemoryTrainingRepository:
+    """In-memory stand-in for TrainingRepository"""
+
+    def __init__(self):
+        self.training_data = {}
+
+    def save_training_data(self, business_id, training_data):
+        self.training_data[(business_id, training_data['source'])] = dict(training_data)
+        return True
+
+    def update_training_sections(self, business_id, source, sections):
+        if (business_id, source) not in self.training_data:
+            return False
+        self.training_data[(business_id, source)].update(sections)
+        return True
+
+
+def make_handler(site_dir, home_path):
+    """Request handler serving one recorded site."""
+
+    class SiteHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0].strip('/')
+            if path in ('', 'index', 'index.html'):
+                file_path = home_path
+            else:
+                name = path[:-5] if path.endswith('.html') else path
+                file_path = os.path.join(site_dir, name + '.html')
+
+            if '..' in path or not os.path.isfile(file_path):
+                self.send_error(404)
+                return
+
+            with open(file_path, 'rb') as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return SiteHandler
+
+
+def start_sites():
+    """Serve every corpus site on its own local port; returns {site: (server, base_url)}."""
+    sites = {}
+    for home_path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.html'))):
+        site = os.path.splitext(os.path.basename(home_path))[0]
+        handler = make_handler(os.path.join(CORPUS_DIR, site), home_path)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        sites[site] = (server, f"http://127.0.0.1:{server.server_port}/")
+    return sites
+
+
+def time_runs(runs, func):
+    """Best and median wall time in milliseconds over `runs` calls."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'best_ms': round(min(timings), 3), 'median_ms': round(statistics.median(timings), 3)}
+
+
+def normalize_output(value, base_url):
+    """Drop volatile fields and the stub's port so outputs compare across runs."""
+    if isinstance(value, dict):
+        return {k: normalize_output(v, base_url) for k, v in sorted(value.items()) if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [normalize_output(v, base_url) for v in value]
+    if isinstance(value, str):
+        return value.replace(base_url.rstrip('/'), '{site}').replace(urlparse(base_url).netloc, '{host}')
+    return value
+
+
+def new_scraper(parser):
+    return WebsiteScraper(business_repo=MemoryBusinessRepository(),
+                          training_repo=MemoryTrainingRepository(), parser=parser)
+
+
+def bench_site(site, base_url, args):
+    with open(os.path.join(CORPUS_DIR, site + '.html'), 'rb') as f:
+        content = f.read()
+    domain = '127.0.0.1'
+
+    scraper = new_scraper(args.parser)
+    page = scraper._index_page(content, None)
+    extractors = {
+        name: time_runs(args.runs, lambda call=call: call(scraper, content, page, domain))
+        for name, call in EXTRACTORS
+    }
+
+    # A fresh repository per run, so every run is a full scrape rather than an unchanged skip
+    scrape = time_runs(args.runs, lambda: new_scraper(args.parser).scrape_website('bench', base_url, crawl=args.crawl))
+
+    scraper = new_scraper(args.parser)
+    tracemalloc.start()
+    result = scraper.scrape_website('bench', base_url, crawl=args.crawl)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'extractors': extractors,
+        'scrape_website': scrape,
+        'peak_memory_kb': round(peak / 1024, 1),
+        'success': 'error' not in result,
+        'output': normalize_output(result, base_url)
+    }
+
+
+def diff_outputs(old, new, path=''):
+    """Paths whose values differ between two normalized outputs."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        diffs = []
+        for key in sorted(set(old) | set(new)):
+            diffs.extend(diff_outputs(old.get(key), new.get(key), f"{path}.{key}" if path else key))
+        return diffs
+    return [] if old == new else [path or '(root)']
+
+
+def change(old, new):
+    if not old:
+        return ''
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+def print_report(report, baseline=None):
+    base_sites = (baseline or {}).get('sites', {})
+    for site, data in report['sites'].items():
+        base = base_sites.get(site)
+        status = 'ok' if data['success'] else 'FAILED'
+        print(f"\n{site} ({status})")
+        print(f"  {'':<24} {'best ms':>10} {'median ms':>10} {'vs base':>9}")
+
+        rows = list(data['extractors'].items()) + [('scrape_website', data['scrape_website'])]
+        for name, timing in rows:
+            old = None
+            if base:
+                old = (base['scrape_website'] if name == 'scrape_website' else base['extractors'].get(name, {})).get('best_ms')
+            print(f"  {name:<24} {timing['best_ms']:>10.3f} {timing['median_ms']:>10.3f} {change(old, timing['best_ms']):>9}")
+
+        old_peak = base.get('peak_memory_kb') if base else None
+        print(f"  {'peak memory (KB)':<24} {data['peak_memory_kb']:>10.1f} {'':>10} {change(old_peak, data['peak_memory_kb']):>9}")
+
+        if base:
+            diffs = diff_outputs(base.get('output'), data['output'])
+            print(f"  output: {'identical' if not diffs else 'DIFF ' + ', '.join(diffs)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--no-crawl', dest='crawl', action='store_false', help='Scrape home pages only')
+    parser.add_argument('--parser', help='HTML parser backend (default: SCRAPER_PARSER or lxml)')
+    parser.add_argument('--save', help='Write the report as JSON to this file')
+    parser.add_argument('--compare', help='Compare against a report saved with --save')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    sites = start_sites()
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'parser': new_scraper(args.parser).parser,
+            'crawl': args.crawl,
+            'runs': args.runs
+        },
+        'sites': {}
+    }
+    try:
+        for site, (_, base_url) in sites.items():
+            report['sites'][site] = bench_site(site, base_url, args)
+    finally:
+        for server, _ in sites.values():
+            server.shutdown()
+
+    print_report(report, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True, default=str)
+        print(f"\nSaved report to {args.save}")
+
+    if baseline and any(diff_outputs(baseline['sites'].get(site, {}).get('output'), data['output'])
+                        for site, data in report['sites'].items()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Check that every parser backend extracts the same data from the saved corpus.
+
+Runs WebsiteScraper.extract_page over each page in benchmarks/corpus with
+the reference backend (html.parser) and every other backend, and prints the
+fields that differ. Exits non-zero when any page differs.
+
+Usage:
+    python benchmarks/check_parser_equivalence.py [--backend lxml]
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.business.parsers import PARSER_BACKENDS, FALLBACK_PARSER
+from app.business.scrapers import WebsiteScraper
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'corpus')
+
+
+def extract(backend, content):
+    scraper = WebsiteScraper(business_repo=object(), training_repo=object(), parser=backend)
+    return scraper.extract_page(content, None, 'example.com')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backend', choices=PARSER_BACKENDS, action='append',
+                        help='Backend to compare against html.parser (default: all)')
+    args = parser.parse_args()
+
+    backends = [b for b in (args.backend or PARSER_BACKENDS) if b != FALLBACK_PARSER]
+    failures = 0
+
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            content = f.read()
+        reference = extract(FALLBACK_PARSER, content)
+
+        for backend in backends:
+            result = extract(backend, content)
+            diffs = [field for field in reference if reference[field] != result.get(field)]
+            status = 'OK' if not diffs else 'DIFF ' + ', '.join(diffs)
+            print(f"{os.path.basename(path):<24} {backend:<12} {status}")
+            for field in diffs:
+                print(f"    {field}:\n      {FALLBACK_PARSER}: {reference[field]!r}\n      {backend}: {result.get(field)!r}")
+            failures += bool(diffs)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,10 +19,14 @@ mkdir -p ${DEPLOY_TMP}/app/api/routes ${DEPLOY_TMP}/app/business ${DEPLOY_TMP}/a
 
 # Copy only the essential files
 cp app.yaml ${DEPLOY_TMP}/
+cp cron.yaml ${DEPLOY_TMP}/
 cp main.py ${DEPLOY_TMP}/
+cp gunicorn.conf.py ${DEPLOY_TMP}/
 cp requirements.txt ${DEPLOY_TMP}/
-cp -r app/business/scrapers.py ${DEPLOY_TMP}/app/business/
-cp -r app/business/analytics.py ${DEPLOY_TMP}/app/business/  # Added analytics.py
+cp -r app/business/*.py ${DEPLOY_TMP}/app/business/  # scrapers.py, analytics.py and their helper modules
+cp -r app/api/services.py ${DEPLOY_TMP}/app/api/
+cp -r app/api/json_provider.py ${DEPLOY_TMP}/app/api/
+cp -r app/api/http_cache.py ${DEPLOY_TMP}/app/api/
 cp -r app/api/routes/business_data.py ${DEPLOY_TMP}/app/api/routes/
 cp -r app/database/mongo.py ${DEPLOY_TMP}/app/database/
 cp -r app/database/mongo_db.py ${DEPLOY_TMP}/app/database/
@@ -45,7 +49,7 @@ touch ${DEPLOY_TMP}/app/repositories/__init__.py
 # Deploy the application
 echo "Deploying application to App Engine..."
 cd ${DEPLOY_TMP}
-gcloud app deploy app.yaml --quiet
+gcloud app deploy app.yaml cron.yaml --quiet
 
 echo "Deployment complete\! Check logs for any issues:"
 echo "gcloud app logs tail -s default"
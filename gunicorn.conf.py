@@ -0,0 +1,56 @@
+# gunicorn.conf.py
+#
+# Gunicorn settings for App Engine (see the entrypoint in app.yaml).
+#
+# Requests spend nearly all their time waiting on MongoDB, Secret Manager,
+# scraped websites and the Places API, so the default worker class is
+# gevent: one process serves many requests cooperatively instead of one at
+# a time. pymongo, requests and aiohttp become cooperative through
+# gevent's monkey patching; the gRPC client used by Secret Manager needs
+# its own gevent integration, enabled in post_fork below. HTML parsing is
+# CPU-bound and runs in the parse pool's processes (app/business/parse_pool.py),
+# so it does not block the worker's event loop.
+#
+# Set GUNICORN_WORKER_CLASS=sync (or gthread) to go back to blocking workers.
+# benchmarks/bench_concurrency.py compares the worker classes.
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+bind = f":{os.environ.get('PORT', '8080')}"
+
+# "gevent", "gthread" or "sync"
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+
+# One process per core; F1 instances have one
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+
+# Open client connections per gevent or gthread worker. A gthread worker
+# stalls once every slot holds a keep-alive connection, so keep this well
+# above the expected number of concurrent clients.
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+# Threads per gthread worker; gunicorn turns a sync worker with threads > 1 into gthread
+threads = int(os.environ.get("GUNICORN_THREADS", "8")) if worker_class == "gthread" else 1
+
+# Scrapes can take a while; App Engine enforces its own request deadline on top
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def post_fork(server, worker):
+    """Make the worker cooperative before the app, and any gRPC channel, is created."""
+    if worker_class != "gevent":
+        return
+
+    from gevent import monkey
+    monkey.patch_all()
+
+    try:
+        import grpc.experimental.gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+    except ImportError:
+        logger.warning("grpc gevent support unavailable; Secret Manager calls will block the worker")
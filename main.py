@@ -100,6 +100,12 @@ def init_api_keys():
 
 # Create Flask app - ensure this is exposed as 'app' variable for gunicorn
 app = Flask(__name__)
+try:
+    # orjson-backed JSON that also encodes ObjectId, datetime and bytes from MongoDB documents
+    from app.api.json_provider import MongoJSONProvider
+    app.json = MongoJSONProvider(app)
+except Exception as e:
+    logger.error(f"Error setting up JSON provider: {str(e)}")
 print("========== MAIN.PY APPLICATION STARTING ==========")
 logger.info("Main.py Flask application initialized")
 
@@ -110,7 +116,10 @@ business_routes_registered = False
 try:
     # Import and register business data routes without the analytics routes
     from app.api.routes.business_data import router as business_router
+    from app.api.services import init_services
     app.register_blueprint(business_router)
+    # Scrapers and repositories are built once per worker, on first use
+    init_services(app)
     business_routes_registered = True
     logger.info("Registered core business data routes successfully")
     
@@ -121,7 +130,9 @@ try:
             "status": "Business routes registered", 
             "endpoints": [
                 "/api/business/scrape-website",
-                "/api/business/scrape-gbp"
+                "/api/business/scrape-gbp",
+                "/api/business/scrape-jobs",
+                "/api/business/gbp/refresh"
             ]
         })
 except Exception as e:
@@ -202,8 +213,9 @@ def gbp_test():
         # Check if scraper has a valid API key
         logger.info(f"Scraper API key available: {'Yes' if scraper.api_key else 'No'}")
         
-        # Test the scraper with a known business
-        result = scraper.scrape_gbp("test_business_id", "Starbucks", "San Francisco")
+        # Test the scraper with a known business, using the cheapest field tier,
+        # without storing the result over test_business_id's data
+        result = scraper.scrape_gbp("test_business_id", "Starbucks", "San Francisco", tier="hours", save=False)
         
         # Add detailed diagnostic information to the response
         result["diagnostics"] = {
@@ -212,7 +224,9 @@ def gbp_test():
             "maps_api_key_via_util_available": bool(maps_api_key),
             "app_engine_api_key_via_util_available": bool(app_engine_api_key_via_util),
             "app_engine_api_key_direct_available": bool(app_engine_api_key_direct),
-            "scraper_key_available": bool(scraper.api_key)
+            "scraper_key_available": bool(scraper.api_key),
+            "places_cache": scraper.cache.metrics(),
+            "places_requests": scraper.request_metrics.metrics()
         }
         
         return jsonify(result)
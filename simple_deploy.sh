@@ -32,6 +32,7 @@ env_variables:
   PROJECT_ID: "clean-code-app-1744825963"
   USE_SECRET_MANAGER: "true"
   GOOGLE_CLOUD_PROJECT: "clean-code-app-1744825963"
+  PLACES_INSTANCES: "2"
 
 automatic_scaling:
   max_instances: 2
@@ -0,0 +1,109 @@
+# tests/test_analytics.py
+
+from datetime import datetime
+
+from app.business.analytics import (CallAnalytics, duration_from_rollups, fill_days, keywords_from_rollups,
+                                    volume_from_rollups, window_start)
+from app.business.call_rollups import apply_rollup_update, rollup_update
+
+
+def rollup_of(*durations):
+    rollup = {}
+    for duration in durations:
+        apply_rollup_update(rollup, rollup_update({"duration": duration, "transcript": []}))
+    return rollup
+
+
+def test_duration_merges_days():
+    rollups = [rollup_of(10, 20), rollup_of(), rollup_of(60), rollup_of(None)]
+    stats = duration_from_rollups(rollups)
+
+    assert stats["total_calls"] == 4
+    assert stats["calls_with_duration"] == 3
+    assert stats["total_duration"] == 90
+    assert stats["average_duration"] == 30
+    assert stats["min_duration"] == 10
+    assert stats["max_duration"] == 60
+    assert abs(stats["p50_duration"] - 20) <= 20 * 0.01
+
+
+def test_duration_of_empty_window():
+    stats = duration_from_rollups([])
+    assert stats["total_calls"] == 0
+    assert stats["average_duration"] is None
+    assert stats["min_duration"] is None
+    assert stats["p50_duration"] is None
+
+
+def test_keywords_merge_days_and_break_ties_by_keyword():
+    rollups = [
+        {"terms": {"haircut": 3, "tuesday": 1}},
+        {"terms": {"haircut": 1, "color": 2, "tuesday": 1}},
+        {}
+    ]
+    assert keywords_from_rollups(rollups, 3) == [
+        {"keyword": "haircut", "count": 4},
+        {"keyword": "color", "count": 2},
+        {"keyword": "tuesday", "count": 2}
+    ]
+    assert keywords_from_rollups(rollups, 1) == [{"keyword": "haircut", "count": 4}]
+
+
+def test_volume_fills_missing_days():
+    since = window_start(3, now=datetime(2026, 10, 3, 12))
+    assert since == datetime(2026, 10, 1)
+    assert volume_from_rollups([{"day": "2026-10-02", "calls": 5}], since, 3) == [
+        {"date": "2026-10-01", "count": 0},
+        {"date": "2026-10-02", "count": 5},
+        {"date": "2026-10-03", "count": 0}
+    ]
+    assert len(fill_days({}, since, 0)) == 1
+
+
+class FakeRollupRepo:
+    def __init__(self, covered_since, rollups):
+        self.covered_since = covered_since
+        self.rollups = rollups
+
+    def get_covered_since(self, business_id):
+        return self.covered_since
+
+    def get_rollups(self, business_id, since_day, fields=None):
+        return [rollup for rollup in self.rollups if rollup["day"] >= since_day]
+
+    def get_rollup_versions(self, business_id, since_day):
+        return [(rollup["day"], 1, None) for rollup in self.get_rollups(business_id, since_day)]
+
+
+class FakeCallRepo:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.pipelines = []
+
+    def aggregate_calls(self, business_id, since, stages):
+        self.pipelines.append(stages)
+        return self.rows
+
+
+def test_windows_not_covered_by_rollups_use_pipelines():
+    today = window_start(1).strftime("%Y-%m-%d")
+    call_repo = FakeCallRepo([{"_id": window_start(2).strftime("%Y-%m-%d"), "count": 7}])
+    analytics = CallAnalytics(rollup_repo=FakeRollupRepo(today, [{"day": today, "calls": 2}]), call_repo=call_repo)
+
+    assert analytics.get_call_volume_by_day("business-1", 1) == [{"date": today, "count": 2}]
+    assert analytics.get_window_version("business-1", 1) == [today, (today, 1, None)]
+    assert not call_repo.pipelines
+
+    # The rollups start today, so a longer window is aggregated from the calls and has no version
+    assert analytics.get_call_volume_by_day("business-1", 2)[0]["count"] == 7
+    assert analytics.get_window_version("business-1", 2) is None
+    assert len(call_repo.pipelines) == 1
+
+
+def test_business_never_rebuilt_uses_pipelines():
+    call_repo = FakeCallRepo()
+    analytics = CallAnalytics(rollup_repo=FakeRollupRepo(None, []), call_repo=call_repo)
+    dashboard = analytics.get_business_dashboard("business-1", 30)
+    assert len(call_repo.pipelines) == 7
+    assert dashboard["duration_stats"]["total_calls"] == 0
+    assert dashboard["unique_callers"] == {"total_calls": 0, "unique_callers": 0}
@@ -0,0 +1,97 @@
+# tests/test_call_rollups.py
+
+from datetime import datetime
+
+from app.business.analytics import entities_from_rollups, intents_from_rollups, actions_from_rollups
+from app.business.call_rollups import (apply_rollup_update, caller_terms, rollup_key, rollup_name,
+                                       rollup_update)
+
+
+def make_call(**fields):
+    call = {
+        "call_id": "CA1",
+        "business_id": "business-1",
+        "created_at": datetime(2026, 10, 1, 15, 30),
+        "caller_number": "+1 (512) 555-0100",
+        "duration": 42,
+        "detected_intents": [{"intent": "schedule_appointment"}, {"intent": "schedule_appointment"}],
+        "actions": [{"type": "transfer"}],
+        "extracted_entities": [{"type": "DATE", "value": "Tuesday"}, {"type": "DATE", "value": "tuesday"}],
+        "transcript": [
+            {"speaker": "caller", "text": "I'd like to book a haircut for Tuesday"},
+            {"speaker": "ai", "text": "Sure, a haircut on Tuesday works"}
+        ]
+    }
+    call.update(fields)
+    return call
+
+
+def test_rollup_key_round_trips_dots_and_dollars():
+    for name in ("example.com", "$where", "$a.b.$c", "plain", "."):
+        key = rollup_key(name)
+        assert "." not in key
+        assert not key.startswith("$")
+        assert rollup_name(key) == name
+
+
+def test_rollup_key_names_empty_values():
+    assert rollup_key("") == "(none)"
+
+
+def test_rollup_update_round_trip():
+    rollup = {}
+    apply_rollup_update(rollup, rollup_update(make_call()))
+    apply_rollup_update(rollup, rollup_update(make_call(call_id="CA2", duration=18, actions=[])))
+
+    assert rollup["calls"] == 2
+    assert rollup["calls_with_duration"] == 2
+    assert rollup["total_duration"] == 60
+    assert rollup["min_duration"] == 18
+    assert rollup["max_duration"] == 42
+    assert sum(rollup["duration_sketch"].values()) == 2
+    # Intents and actions count once per call, entities every occurrence, case-insensitively
+    assert rollup["intents"] == {"schedule_appointment": 2}
+    assert rollup["actions"] == {"transfer": 1}
+    assert rollup["calls_with_actions"] == 1
+    assert rollup["entities"] == {"DATE": {"tuesday": 4}}
+    # Only the caller's words, without stopwords
+    assert rollup["terms"] == {"i'd": 2, "book": 2, "haircut": 2, "tuesday": 2}
+    # Both calls came from the same number
+    assert len(rollup["unique_callers"]) == 1
+
+
+def test_rollup_update_escapes_field_names():
+    call = make_call(
+        detected_intents=[{"intent": "visit.website"}],
+        actions=[{"type": "$set"}],
+        extracted_entities=[{"type": "URL", "value": "Example.COM"}, {"type": "$type", "value": "$x.y"}]
+    )
+    update = rollup_update(call)
+    for fields in update.values():
+        for path in fields:
+            assert all(part and not part.startswith("$") for part in path.split("."))
+
+    rollup = {}
+    apply_rollup_update(rollup, update)
+    assert intents_from_rollups([rollup], 10) == [{"intent": "visit.website", "count": 1}]
+    assert actions_from_rollups([rollup])["actions"] == [{"action": "$set", "count": 1}]
+    assert entities_from_rollups([rollup], 10) == [
+        {"type": "$type", "value": "$x.y", "count": 1},
+        {"type": "URL", "value": "example.com", "count": 1}
+    ]
+
+
+def test_rollup_update_without_duration():
+    rollup = {}
+    apply_rollup_update(rollup, rollup_update(make_call(duration=None)))
+    assert rollup["calls"] == 1
+    assert "calls_with_duration" not in rollup
+    assert "duration_sketch" not in rollup
+
+    rollup = {}
+    apply_rollup_update(rollup, rollup_update(make_call(duration=None), duration="30"))
+    assert rollup["total_duration"] == 30
+
+
+def test_caller_terms_prefers_stored_counts():
+    assert caller_terms(make_call(term_counts={"zebra": 3})) == {"zebra": 3}
@@ -0,0 +1,33 @@
+# tests/test_gbp_refresh.py
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.business.gbp_refresh import FRESHNESS_POLICY, stale_groups
+from app.business.places_fields import cheapest_tier, tier_groups
+
+
+@pytest.mark.parametrize("group", sorted(FRESHNESS_POLICY))
+def test_refresh_tier_only_brings_along_faster_groups(group):
+    # Refreshing a group must not refresh a group whose policy keeps it longer
+    for covered in tier_groups(cheapest_tier([group])):
+        assert FRESHNESS_POLICY[covered] <= FRESHNESS_POLICY[group]
+
+
+def test_weekly_refresh_leaves_photos_alone():
+    now = datetime(2026, 10, 19, 12)
+    week_old = now - timedelta(days=7)
+    doc = {"field_scraped_at": {"hours": week_old, "phone": week_old, "profile": week_old,
+                                "reviews": week_old, "photos": now - timedelta(days=8)}}
+
+    groups = stale_groups(doc, now)
+    assert sorted(groups) == ["hours", "phone", "profile", "reviews"]
+    assert cheapest_tier(groups) == "reviews"
+    assert "photos" not in tier_groups(cheapest_tier(groups))
+
+
+def test_never_fetched_groups_are_due():
+    now = datetime(2026, 10, 19, 12)
+    assert sorted(stale_groups({"field_scraped_at": {"hours": now}}, now)) == ["phone", "photos", "profile", "reviews"]
+    assert cheapest_tier(stale_groups({}, now)) == "full"
@@ -0,0 +1,67 @@
+# tests/test_sketches.py
+
+import random
+
+import pytest
+
+from app.business.sketches import (DURATION_ACCURACY, ZERO_BUCKET, ddsketch_bucket, ddsketch_merge,
+                                   ddsketch_quantile, hll_count, hll_merge, hll_register)
+
+
+def hll_of(values):
+    registers = {}
+    for value in values:
+        register, rank = hll_register(value)
+        registers[str(register)] = max(registers.get(str(register), 0), rank)
+    return registers
+
+
+def ddsketch_of(values):
+    buckets = {}
+    for value in values:
+        bucket = ddsketch_bucket(value)
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+    return buckets
+
+
+@pytest.mark.parametrize("distinct", [1, 10, 100, 1000, 10000, 100000])
+def test_hll_count_within_error_bound(distinct):
+    estimate = hll_count(hll_of(f"+1512{index:07d}" for index in range(distinct)))
+    # Standard error is about 3% with 1024 registers; allow three of them
+    assert abs(estimate - distinct) <= max(1, 0.1 * distinct)
+
+
+def test_hll_ignores_repeats_and_merges_as_union():
+    first = hll_of(f"caller-{index}" for index in range(3000))
+    second = hll_of(f"caller-{index}" for index in range(2000, 5000))
+    assert hll_of(f"caller-{index % 10}" for index in range(1000)) == hll_of(f"caller-{index}" for index in range(10))
+
+    merged = hll_count(hll_merge([first, second, {}, None]))
+    assert abs(merged - 5000) <= 0.1 * 5000
+
+
+def test_hll_count_of_nothing():
+    assert hll_count({}) == 0
+
+
+@pytest.mark.parametrize("quantile", [0.0, 0.25, 0.5, 0.9, 0.99, 1.0])
+def test_ddsketch_quantile_within_relative_accuracy(quantile):
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(4, 1.2) for _ in range(20000))
+    exact = values[int(quantile * (len(values) - 1))]
+
+    estimate = ddsketch_quantile(ddsketch_of(values), quantile)
+    assert abs(estimate - exact) <= DURATION_ACCURACY * exact * 1.0001
+
+
+def test_ddsketch_merge_matches_one_sketch():
+    rng = random.Random(11)
+    values = [rng.uniform(1, 900) for _ in range(5000)]
+    merged = ddsketch_merge([ddsketch_of(values[:1000]), ddsketch_of(values[1000:]), None])
+    assert merged == ddsketch_of(values)
+
+
+def test_ddsketch_zero_and_empty():
+    assert ddsketch_bucket(0) == ZERO_BUCKET
+    assert ddsketch_quantile({ZERO_BUCKET: 3, ddsketch_bucket(10): 1}, 0.5) == 0.0
+    assert ddsketch_quantile({}, 0.5) is None